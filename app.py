@@ -10,6 +10,7 @@ import datetime
 
 from timeseries_generator.external_factors import EUIndustryProductFactor
 from timeseries_generator import (
+    FactorCache,
     Generator,
     LinearTrend,
     RandomFeatureFactor,
@@ -24,6 +25,7 @@ unique_values = reactive.value()
 first_column_header = reactive.value()
 feature_dict = {}
 factor_list = []
+factor_cache = FactorCache()
 options_list_for_selectize_with_factors = ["random_factor", "line_factor"]
 plot = reactive.value(pd.DataFrame())
 update_state_for_data_from_csv = reactive.value(False)
@@ -222,6 +224,7 @@ def server(input, output, session):
         features=feature_dict,
         date_range=pd.date_range(start_date, end_date),
         base_value=base_amount,
+        cache=factor_cache,
         )
         newVal = g.generate()
         plot.set(newVal)
@@ -573,7 +576,7 @@ def server(input, output, session):
             if (len(all_active_features_selectize) >= 1):         
                 group_feat_l = all_active_features_selectize.copy()
                 group_feat_l.insert(0, "date")
-                DF_VIS = DF_SALE.groupby(group_feat_l)["value"].sum().reset_index()
+                DF_VIS = DF_SALE.groupby(group_feat_l, observed=True)["value"].sum().reset_index()
             else:
                 DF_VIS = DF_SALE
                 
@@ -583,7 +586,7 @@ def server(input, output, session):
             if (len(all_active_features_selectize) >= 1): 
                 color_col = "-".join(all_active_features_selectize)
                 DF_PLOT[color_col] = functools.reduce(
-                    lambda x, y: x + "-" + y, (DF_VIS[feat] for feat in all_active_features_selectize)
+                    lambda x, y: x + "-" + y, (DF_VIS[feat].astype(str) for feat in all_active_features_selectize)
                 )
                 base = px.line(DF_PLOT, x="date", y="value", color=color_col)
 
@@ -0,0 +1,19 @@
+from typing import List
+
+from pandas import DatetimeIndex, Timestamp, date_range
+
+START_DATE = Timestamp("01-01-2000")
+
+
+def dates(n_days: int) -> DatetimeIndex:
+    """
+    Daily date range of `n_days` days from `START_DATE`.
+    """
+    return date_range(start=START_DATE, periods=n_days, freq="D")
+
+
+def feature_values(n_values: int, prefix: str = "value") -> List[str]:
+    """
+    `n_values` distinct labels of a feature.
+    """
+    return [f"{prefix}{i}" for i in range(n_values)]
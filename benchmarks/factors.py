@@ -0,0 +1,228 @@
+"""
+Benchmarks of the `generate` method of every factor, with and without features. A feature cardinality of 0 means
+that the factor applies to the full time series.
+"""
+
+import tempfile
+from abc import ABC, abstractmethod
+
+from timeseries_generator import (
+    ARMANoise,
+    CalendarFactor,
+    ColoredNoise,
+    FourierSeasonalityFactor,
+    LinearTrend,
+    RandomFeatureFactor,
+    RandomWalk,
+    SinusoidalFactor,
+    WeekdayFactor,
+    WhiteNoise,
+)
+from timeseries_generator.external_factors import EUIndustryProductFactor
+from timeseries_generator.holiday_factor import HolidayFactor, _get_calendar_instance
+from timeseries_generator.holiday_store import HolidayStore
+
+from benchmarks.common import dates, feature_values
+
+N_DAYS = [30, 365, 3650]
+N_VALUES = [0, 10, 100]
+COUNTRIES = [
+    "Netherlands",
+    "Italy",
+    "Romania",
+    "Germany",
+    "France",
+    "Belgium",
+    "Spain",
+    "Portugal",
+    "Austria",
+    "Poland",
+]
+
+
+class _FactorBenchmark(ABC):
+    params = (N_DAYS, N_VALUES)
+    param_names = ["n_days", "n_values"]
+
+    def setup(self, n_days: int, n_values: int):
+        self.dates = dates(n_days)
+        self.factor = self.make_factor(n_values)
+
+    @abstractmethod
+    def make_factor(self, n_values: int):
+        ...
+
+    def time_generate(self, n_days: int, n_values: int):
+        self.factor.generate(start_date=self.dates[0], end_date=self.dates[-1])
+
+
+class TimeLinearTrend(_FactorBenchmark):
+    def make_factor(self, n_values: int):
+        if not n_values:
+            return LinearTrend(coef=0.05, offset=1.0)
+        return LinearTrend(
+            feature="feature",
+            feature_values={
+                value: {"coef": 0.01 * i, "offset": 1.0}
+                for i, value in enumerate(feature_values(n_values))
+            },
+        )
+
+
+class TimeSinusoidalFactor(_FactorBenchmark):
+    def make_factor(self, n_values: int):
+        if not n_values:
+            return SinusoidalFactor(wavelength=365.0, amplitude=0.2, phase=0, mean=1)
+        return SinusoidalFactor(
+            feature="feature",
+            feature_values={
+                value: {"wavelength": 365.0, "amplitude": 0.2, "phase": i, "mean": 1}
+                for i, value in enumerate(feature_values(n_values))
+            },
+        )
+
+
+class TimeFourierSeasonalityFactor(_FactorBenchmark):
+    def make_factor(self, n_values: int):
+        if not n_values:
+            return FourierSeasonalityFactor(harmonics=[(0.1, 0.2), (0.05, 0.0)] * 2)
+        return FourierSeasonalityFactor(
+            feature="feature",
+            feature_values={
+                value: [(0.01 * i, 0.2), (0.05, 0.0)] * 2
+                for i, value in enumerate(feature_values(n_values))
+            },
+        )
+
+
+class TimeWhiteNoise(_FactorBenchmark):
+    def make_factor(self, n_values: int):
+        if not n_values:
+            return WhiteNoise(stdev_factor=0.05, seed=1)
+        return WhiteNoise(
+            stdev_factor=None,
+            feature_values={
+                "feature": {
+                    value: 0.01 * (1 + i % 10)
+                    for i, value in enumerate(feature_values(n_values))
+                }
+            },
+            seed=1,
+        )
+
+
+class _CorrelatedNoiseBenchmark(_FactorBenchmark):
+    params = (N_DAYS, [0, 100, 1000])
+
+    def setup(self, n_days: int, n_values: int):
+        super().setup(n_days, n_values)
+        if n_values:
+            self.factor.features = {"feature": feature_values(n_values)}
+
+
+class TimeARMANoise(_CorrelatedNoiseBenchmark):
+    def make_factor(self, n_values: int):
+        return ARMANoise(ar=[0.6, 0.3], ma=[0.2], seed=1)
+
+
+class TimeRandomWalk(_CorrelatedNoiseBenchmark):
+    def make_factor(self, n_values: int):
+        return RandomWalk(seed=1)
+
+
+class TimeColoredNoise(_CorrelatedNoiseBenchmark):
+    def make_factor(self, n_values: int):
+        return ColoredNoise(exponent=1.0, seed=1)
+
+
+class TimeRandomFeatureFactor(_FactorBenchmark):
+    params = (N_DAYS, [10, 100, 1000])
+
+    def make_factor(self, n_values: int):
+        return RandomFeatureFactor(
+            feature="feature", feature_values=feature_values(n_values), seed=1
+        )
+
+
+class TimeWeekdayFactor(_FactorBenchmark):
+    params = (N_DAYS, [0])
+
+    def make_factor(self, n_values: int):
+        return WeekdayFactor(factor_values={4: 1.15, 5: 1.3, 6: 1.3})
+
+
+class TimeCalendarFactor(_FactorBenchmark):
+    def make_factor(self, n_values: int):
+        tables = {
+            "weekday": {4: 1.15, 5: 1.3, 6: 1.3},
+            "day": {1: 1.2, 15: 1.1},
+            "month": {12: 1.4},
+            "week": {1: 0.8},
+        }
+        if not n_values:
+            return CalendarFactor(**tables)
+        return CalendarFactor(
+            feature="feature",
+            feature_values={value: tables for value in feature_values(n_values)},
+        )
+
+
+class TimeHolidayFactor(_FactorBenchmark):
+    """
+    Holiday factor with an empty holiday store in a temporary directory: the first call computes the holidays with
+    workalendar, later calls load them from the store in memory.
+    """
+
+    params = (N_DAYS, [1, 3, 10])
+    param_names = ["n_days", "n_countries"]
+
+    def setup(self, n_days: int, n_values: int):
+        self.directory = tempfile.TemporaryDirectory()
+        super().setup(n_days, n_values)
+
+    def teardown(self, n_days: int, n_values: int):
+        self.directory.cleanup()
+
+    def make_factor(self, n_values: int):
+        return HolidayFactor(
+            country_list=COUNTRIES[:n_values],
+            holiday_store=HolidayStore(self.directory.name),
+        )
+
+
+class TimeHolidayFactorColdStore(TimeHolidayFactor):
+    """
+    Holiday factor with a new holiday store in a temporary directory and new workalendar calendars on every call, so
+    that every call computes the holidays with workalendar and writes them to the store.
+    """
+
+    def time_generate(self, n_days: int, n_values: int):
+        # workalendar keeps the holidays of a year in the calendar instance
+        _get_calendar_instance.cache_clear()
+        self.factor.holiday_store = HolidayStore(
+            tempfile.mkdtemp(dir=self.directory.name)
+        )
+        super().time_generate(n_days, n_values)
+
+
+class TimeHolidayFactorWarmStore(TimeHolidayFactor):
+    """
+    Holiday factor with a new holiday store on every call in a directory that was filled in `setup`, so that every
+    call loads the holidays from disk.
+    """
+
+    def setup(self, n_days: int, n_values: int):
+        super().setup(n_days, n_values)
+        self.factor.generate(start_date=self.dates[0], end_date=self.dates[-1])
+
+    def time_generate(self, n_days: int, n_values: int):
+        self.factor.holiday_store = HolidayStore(self.directory.name)
+        super().time_generate(n_days, n_values)
+
+
+class TimeEUIndustryProductFactor(_FactorBenchmark):
+    # the index is available from 2000 to October 2020
+    params = ([30, 365, 3650, 7500], [0])
+
+    def make_factor(self, n_values: int):
+        return EUIndustryProductFactor()
@@ -0,0 +1,75 @@
+"""
+Benchmarks of the `Generator` with a typical set of factors, over date ranges and numbers of feature combinations.
+The feature combinations are split over a "country" feature of up to 10 values and a "product" feature.
+"""
+
+from timeseries_generator import (
+    Generator,
+    LinearTrend,
+    RandomFeatureFactor,
+    SinusoidalFactor,
+    WeekdayFactor,
+    WhiteNoise,
+)
+
+from benchmarks.common import dates, feature_values
+
+
+class TimeGenerator:
+    params = ([365, 3650], [0, 100, 1000], ["broadcast", "merge"])
+    param_names = ["n_days", "n_series", "engine"]
+
+    def setup(self, n_days: int, n_series: int, engine: str):
+        if engine == "merge" and n_days * n_series > 500_000:
+            raise NotImplementedError  # too slow to benchmark
+        features = {}
+        factors = {
+            LinearTrend(coef=0.05, offset=1.0),
+            WeekdayFactor(factor_values={4: 1.15, 5: 1.3, 6: 1.3}),
+            WhiteNoise(stdev_factor=0.05, seed=1),
+        }
+        if n_series:
+            n_countries = min(10, n_series)
+            features = {
+                "country": feature_values(n_countries, "country"),
+                "product": feature_values(n_series // n_countries, "product"),
+            }
+            factors |= {
+                RandomFeatureFactor(
+                    feature="country", feature_values=features["country"], seed=1
+                ),
+                SinusoidalFactor(
+                    feature="product",
+                    feature_values={
+                        product: {
+                            "wavelength": 365.0,
+                            "amplitude": 0.2,
+                            "phase": i,
+                            "mean": 1,
+                        }
+                        for i, product in enumerate(features["product"])
+                    },
+                ),
+            }
+        self.generator = Generator(
+            factors=factors,
+            features=features,
+            date_range=dates(n_days),
+            base_value=10,
+            engine=engine,
+        )
+
+    def time_generate(self, n_days: int, n_series: int, engine: str):
+        self.generator.generate()
+
+
+class TimeIterChunks:
+    params = ([365, 3650], [0, 100, 1000])
+    param_names = ["n_days", "n_series"]
+
+    def setup(self, n_days: int, n_series: int):
+        TimeGenerator.setup(self, n_days, n_series, "broadcast")
+
+    def time_iter_chunks(self, n_days: int, n_series: int):
+        for _ in self.generator.iter_chunks(rows_per_chunk=100_000):
+            pass
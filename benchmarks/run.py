@@ -0,0 +1,210 @@
+"""
+Runs the benchmarks of this directory and saves the timings as JSON, so that commits can be compared on the same
+machine.
+
+The benchmarks follow the conventions of airspeed velocity (asv): a benchmark is a method whose name starts with
+`time_` on a class with optional `params`, `param_names`, `setup` and `teardown`. Raising `NotImplementedError` in
+`setup` skips a parameter combination. This runner only depends on the standard library.
+
+Examples:
+    Run all benchmarks and save the results to benchmarks/results/<commit>.json:
+    $ python -m benchmarks.run
+
+    Run the factor benchmarks once per parameter combination and compare them to an earlier run:
+    $ python -m benchmarks.run --bench factors --quick --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import datetime
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARK_DIR = Path(__file__).parent
+RESULTS_DIR = BENCHMARK_DIR / "results"
+
+
+def discover() -> Iterator[Tuple[str, type, str]]:
+    """
+    Finds all benchmarks, as the qualified benchmark name, the benchmark class and the method name.
+    """
+    for module_info in pkgutil.iter_modules([str(BENCHMARK_DIR)]):
+        if module_info.name in ("common", "run"):
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or class_name.startswith("_"):
+                continue
+            for method_name in sorted(dir(cls)):
+                if method_name.startswith("time_"):
+                    yield f"{module_info.name}.{class_name}.{method_name}", cls, method_name
+
+
+def parameter_combinations(cls: type) -> Tuple[List[str], List[Tuple]]:
+    params = getattr(cls, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    param_names = getattr(cls, "param_names", [f"param{i}" for i in range(len(params))])
+    return list(param_names), list(itertools.product(*params))
+
+
+def time_benchmark(
+    cls: type, method_name: str, params: Tuple, repeat: int, quick: bool
+) -> Dict[str, Any]:
+    """
+    Times one parameter combination of a benchmark. The benchmark is called as often as needed to take at least 0.2
+    seconds per measurement, `repeat` measurements are taken and the minimum and median time per call are reported.
+    """
+    benchmark = cls()
+    try:
+        if hasattr(benchmark, "setup"):
+            benchmark.setup(*params)
+    except NotImplementedError:
+        return {"skipped": True}
+
+    try:
+        timer = timeit.Timer(lambda: getattr(benchmark, method_name)(*params))
+        if quick:
+            number, repeat = 1, 1
+        else:
+            number, _ = timer.autorange()
+        seconds = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        return {
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "number": number,
+            "repeat": repeat,
+        }
+    finally:
+        if hasattr(benchmark, "teardown"):
+            benchmark.teardown(*params)
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit: Optional[str] = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARK_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    packages = {}
+    for package in ("numpy", "pandas", "workalendar"):
+        try:
+            packages[package] = importlib.import_module(package).__version__
+        except (ImportError, AttributeError):
+            packages[package] = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "packages": packages,
+    }
+
+
+def run(bench: Optional[str], repeat: int, quick: bool) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"environment": environment(), "benchmarks": {}}
+    for name, cls, method_name in discover():
+        if bench is not None and not re.search(bench, name):
+            continue
+        param_names, combinations = parameter_combinations(cls)
+        runs = []
+        for params in combinations:
+            label = ", ".join(f"{n}={p}" for n, p in zip(param_names, params))
+            try:
+                result = time_benchmark(cls, method_name, params, repeat, quick)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            runs.append({"params": dict(zip(param_names, params)), **result})
+            print(f"{name}({label}): {format_result(result)}", flush=True)
+        results["benchmarks"][name] = runs
+    return results
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"failed ({result['error']})"
+    if result.get("skipped"):
+        return "skipped"
+    return f"{result['min'] * 1e3:.3f} ms"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]):
+    """
+    Prints the ratio of the minimum times of `results` to those of `baseline`, for all benchmarks that ran in both.
+    """
+    print(f"\n{'benchmark':<80} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, runs in results["benchmarks"].items():
+        baseline_runs = {
+            json.dumps(run["params"], sort_keys=True): run
+            for run in baseline["benchmarks"].get(name, [])
+        }
+        for run in runs:
+            params = json.dumps(run["params"], sort_keys=True)
+            before = baseline_runs.get(params, {})
+            if "min" not in run or "min" not in before:
+                continue
+            label = f"{name}({', '.join(f'{n}={p}' for n, p in run['params'].items())})"
+            print(
+                f"{label:<80} {before['min'] * 1e3:>9.3f} ms {run['min'] * 1e3:>9.3f} ms "
+                f"{run['min'] / before['min']:>7.2f}"
+            )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--bench", help="regular expression that selects the benchmarks to run"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of measurements per benchmark"
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="call every benchmark once, to check that the benchmarks run",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="JSON file of the results, defaults to benchmarks/results/<commit>.json",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="JSON file of earlier results to compare with"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.bench, args.repeat, args.quick)
+    output: Path = args.output
+    if output is None:
+        output = RESULTS_DIR / f"{results['environment']['commit'] or 'results'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
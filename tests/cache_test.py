@@ -0,0 +1,50 @@
+import unittest
+
+from pandas import DataFrame, date_range
+from pandas.testing import assert_frame_equal
+
+from timeseries_generator import FactorCache, Generator, LinearTrend, WeekdayFactor
+
+
+class TestFactorCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = "01-01-2018"
+        self.end_date = "01-01-2020"
+
+    def testHitsAndMisses(self):
+        cache: FactorCache = FactorCache()
+        wf: WeekdayFactor = WeekdayFactor()
+        df: DataFrame = cache.generate(wf, self.start_date, self.end_date)
+        self.assertIs(df, cache.generate(WeekdayFactor(), self.start_date, self.end_date))
+        cache.generate(WeekdayFactor(intensity_scale=2), self.start_date, self.end_date)
+        cache.generate(wf, self.start_date, "01-01-2021")
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(3, cache.misses)
+        self.assertEqual(3, len(cache))
+
+    def testLeastRecentlyUsedEviction(self):
+        lt1, lt2, lt3 = (LinearTrend(coef=coef, offset=0.) for coef in [1., 2., 3.])
+        n_bytes: int = int(lt1.generate(self.start_date, self.end_date).memory_usage(deep=True).sum())
+        cache: FactorCache = FactorCache(max_bytes=2 * n_bytes)
+        cache.generate(lt1, self.start_date, self.end_date)
+        cache.generate(lt2, self.start_date, self.end_date)
+        cache.generate(lt1, self.start_date, self.end_date)
+        cache.generate(lt3, self.start_date, self.end_date)  # evicts lt2
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2 * n_bytes, cache.n_bytes)
+        cache.generate(lt1, self.start_date, self.end_date)
+        self.assertEqual(2, cache.hits)
+        cache.generate(lt2, self.start_date, self.end_date)
+        self.assertEqual(4, cache.misses)
+
+    def testGeneratorWithCache(self):
+        cache: FactorCache = FactorCache()
+        factors = {LinearTrend(coef=1., offset=0.), WeekdayFactor()}
+        dr = date_range(self.start_date, self.end_date)
+        expected: DataFrame = Generator(factors=factors, features={"store": ["a", "b"]}, date_range=dr).generate()
+        for base_value in [1., 1.]:
+            ts: DataFrame = Generator(
+                factors=factors, features={"store": ["a", "b"]}, date_range=dr, base_value=base_value, cache=cache
+            ).generate()
+        assert_frame_equal(expected, ts)
+        self.assertEqual(2, cache.hits)
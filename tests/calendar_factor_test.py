@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+from pandas import DataFrame, date_range
+from pandas._libs.tslibs.timestamps import Timestamp
+
+from timeseries_generator import CalendarFactor, Generator, WeekdayFactor
+
+
+class TestCalendarFactor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = Timestamp("01-01-2018")
+        self.end_date = Timestamp("01-01-2020")
+
+    def testGenerateOnAll(self):
+        """
+        test whether the factor is the product of the factors of all calendar fields
+        """
+        cf: CalendarFactor = CalendarFactor(
+            weekday={6: 0.5}, day={1: 2.}, month={12: 1.5}, week={1: 3.}
+        )
+        df: DataFrame = cf.generate(start_date=self.start_date, end_date=self.end_date)
+        dates = df["date"].dt
+        expected = (
+            np.where(dates.dayofweek == 6, 0.5, 1.) * np.where(dates.day == 1, 2., 1.)
+            * np.where(dates.month == 12, 1.5, 1.) * np.where(dates.isocalendar()["week"] == 1, 3., 1.)
+        )
+        self.assertTrue(np.allclose(expected, df[cf.col_name]))
+
+    def testGenerateHourly(self):
+        """
+        test whether the hour table applies to sub-daily frequencies in a generator
+        """
+        g: Generator = Generator(
+            factors={CalendarFactor(hour={18: 2.}, weekday={5: 1.5})},
+            date_range=date_range(start=self.start_date, periods=24 * 14, freq="h"),
+            base_value=1
+        )
+        df: DataFrame = g.generate()
+        dates = df["date"].dt
+        expected = np.where(dates.hour == 18, 2., 1.) * np.where(dates.dayofweek == 5, 1.5, 1.)
+        self.assertTrue(np.allclose(expected, df["value"]))
+
+    def testGenerateOnFeature(self):
+        """
+        test whether every feature value gets its own tables, independent of the other feature values
+        """
+        cf: CalendarFactor = CalendarFactor(feature="product", feature_values={
+            "jacket": {"month": {1: 2., 12: 2.}},
+            "sunglasses": {"month": {7: 2.}, "weekday": {5: 1.2, 6: 1.2}},
+        })
+        df: DataFrame = cf.generate(start_date=self.start_date, end_date=self.end_date)
+        self.assertListEqual(["date", "product", cf.col_name], list(df.columns))
+        self.assertListEqual(["jacket", "sunglasses"], df["product"].head(2).tolist())
+
+        for value, tables in cf.feature_values.items():
+            single: DataFrame = CalendarFactor(**tables).generate(start_date=self.start_date, end_date=self.end_date)
+            self.assertTrue(np.allclose(
+                single["calendar_factor"], df.loc[df["product"] == value, cf.col_name]
+            ))
+
+    def testWeekdayFactor(self):
+        """
+        test whether a weekday table gives the factors of the WeekdayFactor
+        """
+        factor_values = {4: 1.15, 5: 1.3, 6: 1.3}
+        cf: DataFrame = CalendarFactor(weekday=factor_values).generate(start_date=self.start_date)
+        wf: DataFrame = WeekdayFactor(factor_values=factor_values).generate(start_date=self.start_date)
+        self.assertTrue(np.allclose(wf["weekend_trend_factor"], cf["calendar_factor"]))
+
+    def testParameters(self):
+        with self.assertRaises(ValueError):
+            CalendarFactor(hour={24: 2.})
+        with self.assertRaises(ValueError):
+            CalendarFactor(feature="product", feature_values={"jacket": {"season": {1: 2.}}})
+        with self.assertRaises(AttributeError):
+            CalendarFactor(month={1: 2.}, feature="product", feature_values={"jacket": {"month": {1: 2.}}})
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+from pandas import DataFrame
+from pandas._libs.tslibs.timestamps import Timestamp
+
+from timeseries_generator import ARMANoise, ColoredNoise, RandomWalk
+
+
+class TestCorrelatedNoise(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = Timestamp("01-01-2018")
+        self.end_date = Timestamp("12-31-2027")
+        self.features = {"country": ["Netherlands", "Italy"], "store": ["store1", "store2", "store3"]}
+
+    def _noise(self, factor) -> np.ndarray:
+        """
+        noise of the factor as a (dates x series) matrix, minus 1
+        """
+        factor.features = self.features
+        df: DataFrame = factor.generate(start_date=self.start_date, end_date=self.end_date)
+        self.assertListEqual(["date", "country", "store", factor.col_name], list(df.columns))
+        return df[factor.col_name].to_numpy().reshape(-1, 6) - 1
+
+    def testARMANoise(self):
+        """
+        test whether AR(1) noise has the expected lag-1 autocorrelation and standard deviation
+        """
+        noise: np.ndarray = self._noise(ARMANoise(ar=[0.9], stdev_factor=0.02, seed=1))
+        autocorrelation = np.mean([np.corrcoef(series[:-1], series[1:])[0, 1] for series in noise.T])
+        self.assertAlmostEqual(0.9, autocorrelation, delta=0.03)
+        self.assertAlmostEqual(0.02 / np.sqrt(1 - 0.9 ** 2), noise[100:].std(), delta=0.005)
+
+        with self.assertRaises(ValueError):
+            ARMANoise(ar=[1.])
+
+    def testRandomWalk(self):
+        """
+        test whether the steps of a random walk are independent and have the standard deviation of the walk
+        """
+        steps: np.ndarray = np.diff(self._noise(RandomWalk(stdev_factor=0.01, seed=1)), axis=0)
+        self.assertAlmostEqual(0.01, steps.std(), delta=0.001)
+        autocorrelation = np.mean([np.corrcoef(series[:-1], series[1:])[0, 1] for series in steps.T])
+        self.assertAlmostEqual(0., autocorrelation, delta=0.05)
+
+    def testColoredNoise(self):
+        """
+        test whether colored noise has the expected standard deviation, and whether white noise stays uncorrelated
+        """
+        pink: np.ndarray = self._noise(ColoredNoise(exponent=1., stdev_factor=0.05, seed=1))
+        self.assertAlmostEqual(0.05, pink.std(), delta=0.01)
+        self.assertGreater(np.corrcoef(pink[:-1, 0], pink[1:, 0])[0, 1], 0.3)
+
+        white: np.ndarray = self._noise(ColoredNoise(exponent=0., stdev_factor=0.05, seed=1))
+        self.assertAlmostEqual(0.05, white.std(), delta=0.005)
+        self.assertAlmostEqual(0., np.corrcoef(white[:-1, 0], white[1:, 0])[0, 1], delta=0.1)
+
+    def testRealizations(self):
+        """
+        test whether the first realization equals the generated noise and the realizations differ
+        """
+        walk: RandomWalk = RandomWalk(seed=1)
+        walk.features = self.features
+        df, values = walk.generate_realizations(start_date=self.start_date, end_date=self.end_date, n=3)
+        self.assertEqual((3, len(df)), values.shape)
+        np.testing.assert_array_equal(
+            walk.generate(start_date=self.start_date, end_date=self.end_date)[walk.col_name], values[0]
+        )
+        self.assertFalse(np.allclose(values[0], values[1]))
+
+    def testGenerateWindows(self):
+        """
+        test whether consecutive windows of resumable noise equal the noise of the full date range
+        """
+        for factor in [ARMANoise(ar=[0.6, 0.3], ma=[0.2], seed=1), RandomWalk(seed=1)]:
+            factor.features = self.features
+            full: DataFrame = factor.generate(start_date=self.start_date, end_date=self.end_date)
+            first, state = factor.generate_window(self.start_date, Timestamp("06-30-2020"))
+            second, _ = factor.generate_window(Timestamp("07-01-2020"), self.end_date, state)
+            np.testing.assert_array_equal(
+                full[factor.col_name], np.concatenate([first[factor.col_name], second[factor.col_name]])
+            )
+
+        self.assertFalse(ColoredNoise().resumable)
+        with self.assertRaises(NotImplementedError):
+            ColoredNoise(seed=1).generate_window(self.start_date, self.end_date)
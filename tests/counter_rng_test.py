@@ -0,0 +1,73 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from timeseries_generator.counter_rng import philox4x32, series_keys, stable_hash, standard_normal, uniform
+
+
+class TestCounterRng(unittest.TestCase):
+    def testPhiloxKnownAnswers(self):
+        """
+        test against the known answer tests of the Random123 reference implementation
+        """
+        self.assertListEqual(
+            [0x6627E8D5, 0xE169C58D, 0xBC57AC4C, 0x9B00DBD8],
+            [int(word) for word in philox4x32((0, 0, 0, 0), (0, 0))]
+        )
+        self.assertListEqual(
+            [0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1],
+            [int(word) for word in philox4x32(
+                (0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344), (0xA4093822, 0x299F31D0)
+            )]
+        )
+
+    def testSeriesKeysDoNotDependOnFeatureOrder(self):
+        keys = series_keys(stable_hash(1, "noise"), {"store": ["a", "b"], "product": ["x", "y"]})
+        self.assertListEqual(
+            list(keys), list(series_keys(stable_hash(1, "noise"), {"product": ["x", "y"], "store": ["a", "b"]}))
+        )
+        self.assertNotEqual(keys[0], keys[1])
+
+    def testDistribution(self):
+        counters = np.arange(100000)
+        u = uniform(np.uint64(7), counters)
+        self.assertTrue(0. < u.min() and u.max() < 1.)
+        self.assertAlmostEqual(0.5, u.mean(), places=2)
+        z = standard_normal(np.uint64(7), counters)
+        self.assertAlmostEqual(0., z.mean(), places=1)
+        self.assertAlmostEqual(1., z.std(), places=1)
+
+    def testChunksDoNotChangeNumbers(self):
+        """
+        test whether large batches, that are drawn in chunks, equal the numbers drawn one stream at a time
+        """
+        keys = series_keys(stable_hash(1, "noise"), {"store": [f"store{i}" for i in range(10)]})
+        counters = np.arange(3000)[:, np.newaxis]
+        streams = np.arange(4)[:, np.newaxis, np.newaxis]
+        z = standard_normal(keys, counters, streams)
+        u = uniform(keys, counters, streams)
+        self.assertTupleEqual((4, 3000, 10), z.shape)
+        for stream in range(4):
+            np.testing.assert_array_equal(standard_normal(keys, counters, stream), z[stream])
+            np.testing.assert_array_equal(uniform(keys, counters, stream), u[stream])
+
+    def testOutputBuffer(self):
+        """
+        test whether numbers drawn into a buffer equal the returned numbers, without temporary arrays of the size of
+        the buffer
+        """
+        keys = series_keys(stable_hash(1, "noise"), {"store": [f"store{i}" for i in range(100)]})
+        counters = np.arange(50000)[:, np.newaxis]
+        out = np.empty((50000, 100))
+        tracemalloc.start()
+        try:
+            result = standard_normal(keys, counters, out=out)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertIs(out, result)
+        self.assertLess(peak, out.nbytes / 4)
+        np.testing.assert_array_equal(standard_normal(keys, counters), out)
+        with self.assertRaises(ValueError):
+            uniform(keys, counters, out=np.empty(100))
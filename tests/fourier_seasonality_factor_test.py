@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+from pandas import DataFrame
+from pandas._libs.tslibs.timestamps import Timestamp
+
+from timeseries_generator import FourierSeasonalityFactor
+
+
+class TestFourierSeasonalityFactor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = Timestamp("01-01-2018")
+        self.end_date = Timestamp("01-01-2020")
+
+    def testGenerateOnAll(self):
+        """
+        test whether the factor equals the Fourier series in days since 1970-01-01
+        """
+        fsf: FourierSeasonalityFactor = FourierSeasonalityFactor(period=7., harmonics=[(0.1, 0.2), (0., 0.05)])
+        df: DataFrame = fsf.generate(start_date=self.start_date, end_date=self.end_date)
+        days = (df["date"] - Timestamp("01-01-1970")).dt.days.to_numpy()
+        expected = (
+            1 + 0.1 * np.sin(2 * np.pi * days / 7) + 0.2 * np.cos(2 * np.pi * days / 7)
+            + 0.05 * np.cos(4 * np.pi * days / 7)
+        )
+        self.assertTrue(np.allclose(expected, df[fsf.col_name]))
+
+    def testGenerateOnFeature(self):
+        """
+        test whether every feature value gets its own harmonics, independent of the other feature values
+        """
+        fsf: FourierSeasonalityFactor = FourierSeasonalityFactor(feature="my_feature", feature_values={
+            "foo": [(0.1, 0.2), (0., 0.05)],
+            "bar": [(0., 0.3)]
+        })
+        df: DataFrame = fsf.generate(start_date=self.start_date, end_date=self.end_date)
+        self.assertListEqual(["date", "my_feature", fsf.col_name], list(df.columns))
+        self.assertListEqual(["foo", "bar"], df["my_feature"].head(2).tolist())
+
+        for value, harmonics in fsf.feature_values.items():
+            single: DataFrame = FourierSeasonalityFactor(harmonics=harmonics).generate(
+                start_date=self.start_date, end_date=self.end_date
+            )
+            self.assertTrue(np.allclose(
+                single["fourier_seasonality_factor"], df.loc[df["my_feature"] == value, fsf.col_name]
+            ))
+
+    def testParameters(self):
+        with self.assertRaises(AttributeError):
+            FourierSeasonalityFactor()
+        with self.assertRaises(AttributeError):
+            FourierSeasonalityFactor(harmonics=[(0.1, 0.)], feature_values={"foo": [(0.1, 0.)]}, feature="my_feature")
+        with self.assertRaises(AttributeError):
+            FourierSeasonalityFactor(feature_values={"foo": [(0.1, 0.)]})
+        with self.assertRaises(AttributeError):
+            FourierSeasonalityFactor(feature="my_feature", feature_values={})
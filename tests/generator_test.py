@@ -1,10 +1,21 @@
+import tempfile
+import threading
 import unittest
+import weakref
+from importlib.util import find_spec
+from itertools import product
 from typing import List, Dict
+from unittest.mock import patch
 
-from pandas import date_range
+import numpy as np
+from pandas import DataFrame, Grouper, Timedelta, concat, date_range
 from pandas._libs.tslibs.timestamps import Timestamp
+from pandas.testing import assert_frame_equal, assert_series_equal
 
-from timeseries_generator import SinusoidalFactor, Generator
+from timeseries_generator import (
+    ARMANoise, ColoredNoise, RandomWalk, SinusoidalFactor, Generator, LinearTrend, WeekdayFactor, WhiteNoise, RandomFeatureFactor, DtypePolicy, MemmapPanel,
+    ProfileCollector
+)
 
 
 class TestGenerator(unittest.TestCase):
@@ -48,3 +59,590 @@ class TestGenerator(unittest.TestCase):
             base_value=1
         )
         self.assertEqual(len(self.features_dict), len(g.generate()["product"].unique()))
+
+    def testBroadcastEngineEqualsMergeEngine(self):
+        """
+        test whether the broadcast engine gives the same result as the reference merge engine
+        """
+        factors = {
+            self.product_seasonal_components,
+            LinearTrend(feature="country", feature_values={
+                "Netherlands": {"coef": 0.5, "offset": 1.},
+                "Italy": {"coef": -0.2, "offset": 0.5}
+            }),
+            WeekdayFactor()
+        }
+        generated = {
+            engine: Generator(
+                factors=factors,
+                features=self.features_dict,
+                date_range=date_range(start=self.start_date, end=self.end_date),
+                base_value=10,
+                engine=engine
+            ).generate()
+            for engine in ["broadcast", "merge"]
+        }
+        assert_frame_equal(generated["merge"], generated["broadcast"])
+
+    def testGridEqualsCartesianProduct(self):
+        """
+        test whether the vectorized grid has the same rows as the cartesian product of dates and features
+        """
+        dr = date_range(start=self.start_date, end=self.end_date)
+        ts: DataFrame = Generator(factors=set(), features=self.features_dict, date_range=dr).generate()
+        expected: DataFrame = DataFrame(
+            product(list(dr), *self.features_dict.values()),
+            columns=["date"] + list(self.features_dict.keys()),
+        )
+        for feature in self.features_dict:
+            self.assertEqual("category", ts[feature].dtype.name)
+        assert_frame_equal(expected, ts[expected.columns].astype(expected.dtypes.to_dict()))
+
+    def testChunksEqualGenerate(self):
+        """
+        test whether the concatenated chunks equal the full time series for every way of splitting
+        """
+        g: Generator = Generator(
+            factors={
+                self.product_seasonal_components,
+                LinearTrend(coef=0.5, offset=1.),
+                WeekdayFactor()
+            },
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        keys: List[str] = ["date"] + list(self.features_dict.keys())
+        for split, rows_per_chunk in [("auto", 500), ("dates", 500), ("features", 500), ("features", 5 * 731)]:
+            chunks: List[DataFrame] = list(g.iter_chunks(rows_per_chunk=rows_per_chunk, split=split))
+            # with split="features" a chunk holds all 731 dates
+            self.assertTrue(all(len(chunk) <= max(rows_per_chunk, 731) for chunk in chunks))
+            result: DataFrame = concat(chunks).sort_values(keys).reset_index(drop=True)
+            assert_frame_equal(ts.sort_values(keys).reset_index(drop=True), result)
+
+        chunks = list(g.iter_chunks(rows_per_chunk=100, split="dates"))
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        assert_frame_equal(ts, concat(chunks, ignore_index=True))
+
+    def testParallelGenerateDoesNotDependOnWorkers(self):
+        """
+        test whether parallel generation gives the same result for any number of workers
+        """
+        g: Generator = Generator(
+            factors={
+                self.product_seasonal_components,
+                WeekdayFactor(),
+                WhiteNoise(seed=42),
+                RandomFeatureFactor(feature="store", feature_values=self.features_dict["store"], seed=42)
+            },
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        with patch("timeseries_generator.generator.PARTITION_ROWS", 2000):
+            ts: DataFrame = g.generate(n_jobs=1)
+            assert_frame_equal(ts, g.generate(n_jobs=2))
+        assert_frame_equal(ts, g.generate())
+
+    def testRandomFactorsOnSubsetEqualFullRun(self):
+        """
+        test whether generating a date sub range and a subset of the features returns the values of the full run
+        """
+        factors = {
+            WhiteNoise(seed=3),
+            RandomFeatureFactor(feature="store", feature_values=self.features_dict["store"], seed=5)
+        }
+        ts: DataFrame = Generator(
+            factors=factors,
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date)
+        ).generate()
+        sub_features: Dict[str, List[str]] = dict(self.features_dict, country=["Italy"])
+        sub_ts: DataFrame = Generator(
+            factors=factors,
+            features=sub_features,
+            date_range=date_range(start="06-01-2019", end="07-01-2019")
+        ).generate()
+        expected: DataFrame = ts[
+            (ts["country"] == "Italy") & (ts["date"] >= "06-01-2019") & (ts["date"] <= "07-01-2019")
+        ]
+        for col_name in ["white_noise", "random_feature_factor", "value"]:
+            self.assertListEqual(list(expected[col_name]), list(sub_ts[col_name]))
+
+    def testIncrementalUpdatesEqualGenerate(self):
+        """
+        test whether adding, updating and removing factors after generating gives the same result as generating again
+        """
+        weekday_factor: WeekdayFactor = WeekdayFactor(factor_values={4: 0., 5: 1.3})
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.), weekday_factor},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        g.update_factor(LinearTrend(coef=-0.2, offset=1.))
+        g.add_factor(WhiteNoise(seed=1))
+        g.remove_factor(weekday_factor)
+        g.base_value = 5
+        self.assertIs(ts, g.ts)
+
+        expected: DataFrame = Generator(
+            factors=g.factors,
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=5
+        ).generate()
+        assert_frame_equal(expected, ts[expected.columns])
+
+    def testFailedUpdateKeepsTimeSeries(self):
+        """
+        test whether a factor that fails to generate in an update leaves the time series unchanged and is regenerated
+        """
+        trend: LinearTrend = LinearTrend(coef=0.5, offset=1.)
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, trend},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate().copy()
+        with self.assertRaises(KeyError):
+            g.update_factor(LinearTrend(feature="channel", feature_values={"online": {"coef": 1., "offset": 1.}}))
+        assert_frame_equal(ts, g.ts)
+
+        g.update_factor(trend)
+        g.remove_factor(self.product_seasonal_components)
+        expected: DataFrame = Generator(
+            factors={trend},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        ).generate()
+        assert_frame_equal(expected, g.generate())
+
+    def testCompactDtypePolicy(self):
+        """
+        test whether the compact dtype policy stays within tolerance of the float64 values and takes less memory
+        """
+        factors = {
+            self.product_seasonal_components,
+            LinearTrend(coef=0.5, offset=1.),
+            WhiteNoise(seed=1),
+            RandomFeatureFactor(feature="store", feature_values=self.features_dict["store"], seed=2)
+        }
+        generated: Dict[str, DataFrame] = {}
+        for dtype_policy in ["default", "compact"]:
+            for engine in ["broadcast", "merge"]:
+                generated[dtype_policy, engine] = Generator(
+                    factors=factors,
+                    features=self.features_dict,
+                    date_range=date_range(start=self.start_date, end=self.end_date),
+                    base_value=100,
+                    engine=engine,
+                    dtype_policy=dtype_policy
+                ).generate()
+        assert_frame_equal(generated["compact", "merge"], generated["compact", "broadcast"])
+
+        default, compact = generated["default", "broadcast"], generated["compact", "broadcast"]
+        self.assertNotIn("base_amount", compact.columns)
+        for col_name in ["white_noise", "random_feature_factor", "total_factor", "value"]:
+            self.assertEqual("float32", compact[col_name].dtype.name)
+        assert_frame_equal(
+            default.drop(columns="base_amount"), compact, check_dtype=False, rtol=1e-5
+        )
+        self.assertLess(
+            2 * compact.memory_usage(deep=True).sum(), 1.1 * default.memory_usage(deep=True).sum()
+        )
+
+        legacy: DataFrame = Generator(
+            factors=factors,
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            dtype_policy=DtypePolicy(categorical_features=False)
+        ).generate()
+        self.assertEqual("object", legacy["country"].dtype.name)
+
+    @unittest.skipIf(find_spec("pyarrow") is None, "requires pyarrow")
+    def testWriteParquet(self):
+        """
+        test whether the partitioned Parquet dataset contains the time series
+        """
+        import pyarrow.dataset as ds
+
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        keys: List[str] = ["date"] + list(self.features_dict.keys())
+        with tempfile.TemporaryDirectory() as path:
+            g.write_parquet(path, partition_cols=["country", "store"], row_group_size=500, rows_per_chunk=1000)
+            dataset = ds.dataset(path, format="parquet", partitioning="hive")
+            self.assertEqual(9, len(dataset.files))
+            result: DataFrame = dataset.to_table().to_pandas()
+        ts: DataFrame = g.generate()
+        result = result[ts.columns].astype({feature: object for feature in self.features_dict})
+        assert_frame_equal(
+            ts.astype({feature: object for feature in self.features_dict}).sort_values(keys).reset_index(drop=True),
+            result.sort_values(keys).reset_index(drop=True)
+        )
+
+    @unittest.skipIf(find_spec("pyarrow") is None, "requires pyarrow")
+    def testWriteParquetStopsWriterOnFailedChunk(self):
+        """
+        test whether an error while generating a later chunk is raised and stops the writer thread
+        """
+        class FailingNoise(WhiteNoise):
+            calls: int = 0
+
+            def generate(self, *args, **kwargs) -> DataFrame:
+                FailingNoise.calls += 1
+                if FailingNoise.calls == 3:
+                    raise RuntimeError("boom")
+                return super().generate(*args, **kwargs)
+
+        g: Generator = Generator(
+            factors={FailingNoise(stdev_factor=0.05, col_name="failing_noise")},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        with tempfile.TemporaryDirectory() as path:
+            with self.assertRaisesRegex(RuntimeError, "boom"):
+                g.write_parquet(path, rows_per_chunk=1000, split="dates", max_queued_chunks=1)
+        self.assertGreaterEqual(FailingNoise.calls, 3)
+        self.assertNotIn("write_parquet", [thread.name for thread in threading.enumerate()])
+
+    @unittest.skipIf(find_spec("pyarrow") is None, "requires pyarrow")
+    def testArrowOutput(self):
+        """
+        test whether the Arrow table and the memory-mapped Arrow file contain the time series
+        """
+        import pyarrow as pa
+
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.), WhiteNoise(seed=5)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        table = g.generate(output="arrow")
+        self.assertIs(ts, g.ts)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("country").type))
+        self.assertTrue(pa.types.is_timestamp(table.schema.field("date").type))
+        assert_frame_equal(ts, table.to_pandas())
+
+        with tempfile.TemporaryDirectory() as path:
+            g.write_arrow(f"{path}/ts.arrow", rows_per_chunk=1000)
+            with pa.memory_map(f"{path}/ts.arrow") as source:
+                reader = pa.ipc.open_file(source)
+                self.assertLess(1, reader.num_record_batches)
+                assert_frame_equal(ts, reader.read_all().to_pandas())
+
+        g.engine = "merge"
+        assert_frame_equal(ts, g.generate(output="arrow").to_pandas(), check_like=True)
+
+    def testWriteMemmap(self):
+        """
+        test whether the memory-mapped matrices contain the time series and can be reopened
+        """
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.), WhiteNoise(seed=5)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date, tz="Europe/Amsterdam"),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        n_dates: int = len(g.ts["date"].unique())
+        for split, rows_per_chunk in [("dates", 1000), ("features", 5 * n_dates)]:
+            with tempfile.TemporaryDirectory() as path:
+                g.write_memmap(path, factor_columns=True, rows_per_chunk=rows_per_chunk, split=split)
+                panel: MemmapPanel = MemmapPanel(path)
+                self.assertEqual((n_dates, 27), panel.value.shape)
+                self.assertEqual(list(product(*self.features_dict.values())), list(panel.series))
+                self.assertEqual(ts["value"].tolist(), panel.value.reshape(-1).tolist())
+                assert_frame_equal(ts[panel.to_frame().columns], panel.to_frame())
+                self.assertEqual(
+                    ts["value"].iloc[27 * 10:27 * 20].tolist(),
+                    panel.to_frame(dates=slice(10, 20), columns=["value"])["value"].tolist()
+                )
+
+    def testProfiler(self):
+        """
+        test whether the profiler receives an event per step and does not change the result
+        """
+        profiler: ProfileCollector = ProfileCollector()
+        factors = {self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.), WhiteNoise(seed=5)}
+        g: Generator = Generator(
+            factors=factors,
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            profiler=profiler
+        )
+        ts: DataFrame = g.generate()
+        assert_frame_equal(ts, Generator(factors=factors, features=self.features_dict, date_range=g._date_range).generate())
+
+        summary: DataFrame = profiler.summary()
+        col_names: List[str] = [f.col_name for f in factors]
+        self.assertEqual(
+            {("grid", ""), ("product", ""), ("output", "")}
+            | {(stage, col_name) for stage in ["generate", "block", "broadcast"] for col_name in col_names},
+            set(summary.index)
+        )
+        self.assertEqual(
+            ["grid", "generate", "block", "broadcast", "product", "output"],
+            list(dict.fromkeys(summary.index.get_level_values("stage")))
+        )
+        self.assertTrue((summary["calls"] == 1).all())
+        self.assertEqual(len(ts), summary.loc[("output", ""), "rows_out"])
+        self.assertEqual(ts.memory_usage(index=False).sum(), summary.loc[("output", ""), "n_bytes"])
+        self.assertAlmostEqual(1., summary["share"].sum())
+
+        profiler.clear()
+        g.engine = "merge"
+        g.generate()
+        self.assertEqual(
+            {"grid", "generate", "merge", "product", "output"},
+            set(profiler.summary().index.get_level_values("stage"))
+        )
+
+    def testLazyQueryEqualsFilteredGenerate(self):
+        """
+        test whether the lazy query returns the selected columns and rows of the generated time series
+        """
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.), WhiteNoise(seed=5)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        queries = [
+            (g.lazy(), ts),
+            (
+                g.lazy().select("date", "store", "value").filter(country="Italy", date=slice("06-01-2019", None)),
+                ts.loc[(ts["country"] == "Italy") & (ts["date"] >= "06-01-2019"), ["date", "store", "value"]]
+            ),
+            (
+                g.lazy().filter(product=["Yoga Mat", "winter jacket"]).filter(date=slice(None, "02-01-2018"))
+                .select("white_noise", "date", "product", "country"),
+                ts.loc[ts["product"].isin(["Yoga Mat", "winter jacket"]) & (ts["date"] <= "02-01-2018"),
+                       ["white_noise", "date", "product", "country"]]
+            ),
+            (g.lazy().filter(store="store4").select("date", "value"), ts.loc[ts["store"] == "store4", ["date", "value"]]),
+        ]
+        for query, expected in queries:
+            assert_frame_equal(expected.reset_index(drop=True), query.collect())
+
+        # the noise is only generated for the rows that pass the filters
+        g.profiler = ProfileCollector()
+        result: DataFrame = g.lazy().select("white_noise").filter(country="Italy").collect()
+        self.assertEqual(len(ts) // 3, len(result))
+        self.assertEqual([("generate", "white_noise"), ("block", "white_noise")],
+                         [step for step in g.profiler.summary().index if step[1]])
+        self.assertEqual(len(result), g.profiler.summary().loc[("generate", "white_noise"), "rows_out"])
+
+        with self.assertRaises(ValueError):
+            g.lazy().select("date", "total").collect()
+        with self.assertRaises(ValueError):
+            g.lazy().filter(city="Rome")
+
+    def testAggregateEqualsGroupby(self):
+        """
+        test whether the aggregates equal a groupby on the generated time series
+        """
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.), WhiteNoise(seed=5)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        cases = [
+            (["country"], None, "sum"),
+            (["product", "country"], "W", ["mean", "max", "min"]),
+            ([], "MS", ["count", "sum"]),
+        ]
+        for by, freq, agg in cases:
+            date_key = "date" if freq is None else Grouper(key="date", freq=freq)
+            expected: DataFrame = ts.groupby([date_key] + by, observed=True)["value"].agg(agg).reset_index()
+            for split, rows_per_chunk in [("auto", len(ts)), ("dates", 1000), ("features", 5 * 731)]:
+                result: DataFrame = g.aggregate(by=by, freq=freq, agg=agg, rows_per_chunk=rows_per_chunk, split=split)
+                assert_frame_equal(expected, result, check_dtype=False, check_freq=False)
+
+        with self.assertRaises(ValueError):
+            g.aggregate(by=["city"])
+        with self.assertRaises(ValueError):
+            g.aggregate(agg="median")
+
+    def testHourlyFrequency(self):
+        """
+        test whether factors are generated at the hourly frequency of the date range, with the daily factors
+        broadcast onto the hours of their day
+        """
+        dates = date_range(start="12-28-2019", end="01-03-2020 23:00", freq="h")
+        g: Generator = Generator(
+            factors={
+                LinearTrend(coef=0.5, offset=1.),
+                SinusoidalFactor(wavelength=1., amplitude=0.2, col_name="daily_cycle"),
+                WeekdayFactor(factor_values={5: 1.5, 6: 1.5}),
+                WhiteNoise(seed=5),
+            },
+            features={"country": ["Netherlands", "Italy"]},
+            date_range=dates
+        )
+        ts: DataFrame = g.generate()
+        self.assertEqual(len(dates) * 2, len(ts))
+
+        hours = (ts["date"] - dates[0]) / Timedelta(days=1)
+        self.assertTrue(np.allclose(0.5 / 7 * hours + 2, ts["lin_trend"]))
+        self.assertTrue(np.allclose(0.2 * np.sin(2 * np.pi * hours) + 1, ts["daily_cycle"]))
+        self.assertTrue(np.allclose(np.where(ts["date"].dt.dayofweek >= 5, 1.5, 1.), ts["weekend_trend_factor"]))
+        self.assertEqual(len(ts), ts["white_noise"].nunique())
+
+        g.engine = "merge"
+        assert_frame_equal(ts, g.generate())
+
+    def testRealizations(self):
+        """
+        test whether the first realization equals generate and the other realizations only differ in the random
+        factors
+        """
+        g: Generator = Generator(
+            factors={
+                self.product_seasonal_components,
+                LinearTrend(coef=0.5, offset=1.),
+                WhiteNoise(seed=5),
+                RandomFeatureFactor(feature="store", feature_values=["store1", "store2"], seed=3)
+            },
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        values: np.ndarray = g.generate_realizations(4)
+        self.assertTupleEqual((4, len(g.date_range), 27), values.shape)
+        self.assertTrue(np.allclose(ts["value"], values[0].reshape(-1)))
+        for realization in range(1, 4):
+            self.assertFalse(np.allclose(ts["value"], values[realization].reshape(-1)))
+
+        g.factors = {self.product_seasonal_components, LinearTrend(coef=0.5, offset=1.)}
+        self.assertTrue(np.allclose(g.generate()["value"], g.generate_realizations(2).reshape(2, -1)))
+
+        df: DataFrame = g.generate_realizations(2, output="pandas")
+        self.assertListEqual(["realization", "date", "country", "store", "product", "value"], list(df.columns))
+        assert_frame_equal(
+            concat([g.ts[["date", "country", "store", "product", "value"]]] * 2, ignore_index=True),
+            df.drop(columns="realization"),
+            check_exact=False
+        )
+        with self.assertRaises(ValueError):
+            g.generate_realizations(2, output="xarray")
+
+    def testSweepEqualsGenerate(self):
+        """
+        test whether every point of a parameter sweep equals a generation with those parameters
+        """
+        lin_trend: LinearTrend = LinearTrend(coef=0.5, offset=1.)
+        weekday_factor: WeekdayFactor = WeekdayFactor()
+        g: Generator = Generator(
+            factors={self.product_seasonal_components, lin_trend, weekday_factor, WhiteNoise(seed=5)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        coefs: List[float] = [0., 1.]
+        scales: List[float] = [1., 1.5, 2.]
+        values: np.ndarray = g.sweep(
+            {"lin_trend": {"coef": coefs}, "weekend_trend_factor": {"intensity_scale": scales}}
+        )
+        self.assertTupleEqual((2, 3, len(g.date_range), 27), values.shape)
+        for (i, coef), (j, scale) in product(enumerate(coefs), enumerate(scales)):
+            lin_trend.coef, weekday_factor.intensity_scale = coef, scale
+            self.assertTrue(np.allclose(g.generate()["value"], values[i, j].reshape(-1)))
+
+        df: DataFrame = g.sweep({"lin_trend": {"coef": coefs, "offset": [0.]}}, output="pandas")
+        self.assertListEqual(
+            ["lin_trend_coef", "lin_trend_offset", "date", "country", "store", "product", "value"], list(df.columns)
+        )
+        self.assertEqual(2 * len(g.ts), len(df))
+
+        with self.assertRaises(ValueError):
+            g.sweep({"lin_trend": {"slope": coefs}})
+        with self.assertRaises(ValueError):
+            g.sweep({"product_seasonal_trend_factor": {"amplitude": coefs}})
+        with self.assertRaises(ValueError):
+            g.sweep({"white_noise": {"stdev_factor": coefs}})
+
+    def testCorrelatedNoiseDoesNotDependOnSplits(self):
+        """
+        test whether correlated noise is generated over the full date range in chunks, lazy queries and partitions
+        """
+        g: Generator = Generator(
+            factors={ARMANoise(ar=[0.8], seed=1), RandomWalk(seed=2), ColoredNoise(exponent=2., seed=3)},
+            features=self.features_dict,
+            date_range=date_range(start=self.start_date, end=self.end_date),
+            base_value=10
+        )
+        ts: DataFrame = g.generate()
+        keys: List[str] = ["date"] + list(self.features_dict.keys())
+        for split, rows_per_chunk in [("dates", 500), ("features", 5 * 731), ("auto", 2000)]:
+            result: DataFrame = concat(g.iter_chunks(rows_per_chunk=rows_per_chunk, split=split))
+            assert_frame_equal(
+                ts.sort_values(keys).reset_index(drop=True), result.sort_values(keys).reset_index(drop=True)
+            )
+
+        selected: DataFrame = g.lazy().filter(country="Italy", date=slice("06-01-2019", None)).collect()
+        expected: DataFrame = ts[(ts["country"] == "Italy") & (ts["date"] >= Timestamp("06-01-2019"))]
+        assert_frame_equal(expected.reset_index(drop=True), selected, check_categorical=False)
+
+        with patch("timeseries_generator.generator.PARTITION_ROWS", 731 * 4):
+            assert_frame_equal(ts, g.generate(n_jobs=1))
+
+    def testCorrelatedNoiseChunksHoldOnePartition(self):
+        """
+        test whether chunks of correlated noise only hold the noise of one window, or of one partition for noise that
+        cannot be generated in windows
+        """
+        profiler: ProfileCollector = ProfileCollector()
+        g: Generator = Generator(
+            factors={ARMANoise(ar=[0.8], seed=1), RandomWalk(seed=2), ColoredNoise(seed=3)},
+            features={"country": ["Netherlands", "Italy", "Romania"], "store": ["store1", "store2", "store3"]},
+            date_range=date_range(start=self.start_date, periods=20),
+            profiler=profiler
+        )
+        from timeseries_generator import generator
+        factor_block = generator._factor_block
+        full_blocks: List[weakref.ref] = []
+
+        def tracked_factor_block(f, grid, *args, **kwargs):
+            block = factor_block(f, grid, *args, **kwargs)
+            if f.sequential:
+                full_blocks.append(weakref.ref(block))
+            return block
+
+        chunks: List[DataFrame] = []
+        with patch("timeseries_generator.generator._factor_block", tracked_factor_block):
+            for chunk in g.iter_chunks(rows_per_chunk=6, split="auto"):
+                self.assertLessEqual(sum(ref() is not None for ref in full_blocks), 1)
+                chunks.append(chunk)
+        # partitions of six and three series, with windows of one date
+        self.assertEqual(2, len(full_blocks))
+        self.assertEqual(2 * 20, len(chunks))
+
+        events = [event for event in profiler.events if event.stage == "generate"]
+        self.assertTrue(all(event.rows_out <= 6 for event in events if event.name in ["arma_noise", "random_walk"]))
+        self.assertListEqual(
+            [6 * 20, 3 * 20], [event.rows_out for event in events if event.name == "colored_noise"]
+        )
+
+        keys: List[str] = ["date", "country", "store"]
+        assert_frame_equal(
+            g.generate().sort_values(keys).reset_index(drop=True),
+            concat(chunks).sort_values(keys).reset_index(drop=True),
+            check_exact=True
+        )
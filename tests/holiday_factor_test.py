@@ -0,0 +1,117 @@
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from pandas import DataFrame
+from pandas._libs.tslibs.timestamps import Timestamp
+from pandas.testing import assert_series_equal
+
+from timeseries_generator.holiday_factor import HolidayFactor, get_calendar
+from timeseries_generator.holiday_store import HolidayStore
+
+
+class TestHolidayFactor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = Timestamp("01-01-2019")
+        self.end_date = Timestamp("01-01-2021")
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = HolidayStore(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def testGetCalendar(self):
+        """
+        test whether calendars are found by ISO code, class name and calendar name, and are created once
+        """
+        self.assertIs(get_calendar("NL"), get_calendar("Netherlands"))
+        self.assertIs(get_calendar("gb"), get_calendar("UnitedKingdom"))
+        self.assertIs(get_calendar("United Kingdom"), get_calendar("UnitedKingdom"))
+        self.assertEqual("Netherlands", type(get_calendar("Netherlands")).__name__)
+        with self.assertRaises(ValueError):
+            get_calendar("Atlantis")
+
+    def testGenerateByIsoCode(self):
+        """
+        test whether a country gives the same factors by name and by ISO code
+        """
+        by_name: DataFrame = HolidayFactor(country_list=["Netherlands", "Italy"], holiday_store=self.store).generate(
+            start_date=self.start_date, end_date=self.end_date
+        )
+        by_code: DataFrame = HolidayFactor(country_list=["NL", "IT"], holiday_store=self.store).generate(
+            start_date=self.start_date, end_date=self.end_date
+        )
+        self.assertListEqual(["NL", "IT"], by_code["country"].unique().tolist())
+        assert_series_equal(by_name["holiday_trend_factor"], by_code["holiday_trend_factor"])
+
+    def testStore(self):
+        """
+        test whether the store holds the holidays of workalendar, extends its years and is loaded from disk
+        """
+        calendar = get_calendar("Netherlands")
+        ids, names = self.store.get_holidays(calendar, 2019, 2020)
+        self.assertEqual(366 + 365, len(ids))
+        self.assertEqual("New year", names[ids[0] - 1])
+        self.assertEqual(0, ids[1])
+        holidays = {day: name for day, name in calendar.holidays(2020)}
+        for position in np.flatnonzero(ids[365:]):
+            day = (Timestamp("01-01-2020") + np.timedelta64(position, "D")).date()
+            self.assertEqual(holidays[day], names[ids[365 + position] - 1])
+
+        # earlier years are added without changing the stored years
+        extended, names = self.store.get_holidays(calendar, 2015, 2019)
+        np.testing.assert_array_equal(ids[:365], extended[-365:])
+
+        # a new store loads the holidays from the directory instead of asking workalendar
+        store: HolidayStore = pickle.loads(pickle.dumps(HolidayStore(self.directory.name)))
+        with patch.object(type(calendar), "holidays", side_effect=AssertionError):
+            loaded, loaded_names = store.get_holidays(calendar, 2015, 2020)
+        self.assertListEqual(names, loaded_names)
+        np.testing.assert_array_equal(ids, loaded[-len(ids):])
+
+    def testGenerateEqualsYearLoop(self):
+        """
+        test whether the factors equal those of the former implementation, which concatenated a DataFrame per year
+        before smoothing, over a range across year boundaries and with special holiday factors
+        """
+        hf: HolidayFactor = HolidayFactor(
+            holiday_factor=2.,
+            special_holiday_factors={"Christmas Day": 5., "New year": 10.},
+            country_list=["Netherlands", "Italy"],
+            holiday_store=self.store
+        )
+        df: DataFrame = hf.generate(start_date="12-20-2019", end_date="01-10-2021")
+        self.assertListEqual(["date", "country", "holiday_trend_factor"], list(df.columns))
+        self.assertEqual(2 * 387, len(df))
+        self.assertListEqual(["Netherlands", "Italy"], df["country"].unique().tolist())
+        self.assertAlmostEqual(846.0154226762861, df["holiday_trend_factor"].sum(), places=10)
+
+        expected = [
+            ("2019-12-20", "Netherlands", 1.0),
+            ("2019-12-25", "Netherlands", 1.0642196531996144),
+            ("2019-12-26", "Netherlands", 1.190622029622357),
+            ("2019-12-31", "Netherlands", 1.804887989376191),
+            ("2020-01-01", "Netherlands", 1.6663775841189177),
+            ("2020-01-02", "Netherlands", 1.659732775086639),
+            ("2020-01-06", "Netherlands", 2.76029995884124),
+            ("2020-04-13", "Netherlands", 1.2120214686456412),
+            ("2020-12-25", "Netherlands", 1.0642196531996144),
+            ("2021-01-01", "Netherlands", 1.6663775841189177),
+            ("2021-01-09", "Netherlands", 1.3927760117255203),
+            ("2019-12-20", "Italy", 1.0),
+            ("2019-12-25", "Italy", 1.0642196531996144),
+            ("2019-12-26", "Italy", 1.190622029622357),
+            ("2019-12-31", "Italy", 1.804887989376191),
+            ("2020-01-01", "Italy", 1.6663775841189177),
+            ("2020-01-02", "Italy", 1.659732775086639),
+            ("2020-01-06", "Italy", 2.7763548721411433),
+            ("2020-04-13", "Italy", 1.0160549132999037),
+            ("2020-12-25", "Italy", 1.0642196531996144),
+            ("2021-01-01", "Italy", 1.6663775841189177),
+            ("2021-01-09", "Italy", 1.5451007879906447),
+        ]
+        factors = df.set_index(["date", "country"])["holiday_trend_factor"]
+        for day, country, factor in expected:
+            self.assertEqual(factor, factors[(Timestamp(day), country)], f"{day} {country}")
@@ -0,0 +1,39 @@
+import unittest
+
+from pandas import DataFrame
+from pandas._libs.tslibs.timestamps import Timestamp
+
+from timeseries_generator import LinearTrend
+
+
+class TestLinearTrend(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = Timestamp("01-01-2018")
+        self.end_date = Timestamp("01-01-2020")
+
+    def testGenerateOnAll(self):
+        lt: LinearTrend = LinearTrend(coef=1., offset=0.)
+        df: DataFrame = lt.generate(start_date=self.start_date, end_date=self.end_date)
+        self.assertAlmostEqual(1., df[lt.col_name].values[0])
+        self.assertAlmostEqual(2., df[lt.col_name].values[-1], places=2)
+
+    def testGenerateOnFeature(self):
+        """
+        test whether the factor of every row equals the linear trend of its feature value
+        """
+        feature_values = {
+            "foo": {"coef": 0.5, "offset": 1.},
+            "bar": {"coef": -0.2, "offset": 0.},
+            "baz": {"coef": 0.1, "offset": 0.3},
+        }
+        lt: LinearTrend = LinearTrend(feature="my_feature", feature_values=feature_values)
+        df: DataFrame = lt.generate(start_date=self.start_date, end_date=self.end_date)
+
+        n_days: int = (self.end_date - self.start_date).days + 1
+        self.assertListEqual(["date", "my_feature", lt.col_name], list(df.columns))
+        self.assertEqual(3 * n_days, len(df))
+        self.assertListEqual(["foo", "bar", "baz"], df["my_feature"].head(3).tolist())
+        for _, row in df.iterrows():
+            values = feature_values[row["my_feature"]]
+            days = (row["date"] - self.start_date).days
+            self.assertEqual(values["coef"] / n_days * days + 1 + values["offset"], row[lt.col_name])
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+from pandas import DataFrame
+from pandas._libs.tslibs.timestamps import Timestamp
+
+from timeseries_generator import WhiteNoise
+
+
+class TestWhiteNoise(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = Timestamp("01-01-2018")
+        self.end_date = Timestamp("01-01-2020")
+
+    def _unit_noise(self, features) -> DataFrame:
+        """
+        noise with a standard deviation of 1 on all features, with the same keys as the noise of the tests
+        """
+        wn: WhiteNoise = WhiteNoise(stdev_factor=1., seed=1)
+        wn.features = features
+        return wn.generate(start_date=self.start_date, end_date=self.end_date)
+
+    def testGenerateOnFeature(self):
+        """
+        test whether the noise of every row is scaled by the standard deviation of its feature value
+        """
+        stdevs = {"foo": 0.1, "bar": 0.2}
+        wn: WhiteNoise = WhiteNoise(stdev_factor=None, feature_values={"my_feature": stdevs}, seed=1)
+        df: DataFrame = wn.generate(start_date=self.start_date, end_date=self.end_date)
+        self.assertListEqual(["date", "my_feature", wn.col_name], list(df.columns))
+        self.assertListEqual(["foo", "bar"], df["my_feature"].head(2).tolist())
+
+        unit: DataFrame = self._unit_noise({"my_feature": ["foo", "bar"]})
+        expected = 1 + df["my_feature"].map(stdevs) * (unit["white_noise"] - 1)
+        self.assertTrue(np.allclose(expected, df[wn.col_name]))
+
+    def testGenerateOnMultipleFeatures(self):
+        """
+        test whether the standard deviations of several noise features add up in quadrature
+        """
+        wn: WhiteNoise = WhiteNoise(stdev_factor=None, seed=1, feature_values={
+            "country": {"Netherlands": 0.3, "Italy": 0.4},
+            "store": {"store1": 0.0, "store2": 1.2},
+        })
+        df: DataFrame = wn.generate(start_date=self.start_date, end_date=self.end_date)
+        self.assertListEqual(["date", "country", "store", wn.col_name], list(df.columns))
+
+        unit: DataFrame = self._unit_noise({"country": ["Netherlands", "Italy"], "store": ["store1", "store2"]})
+        stdev = np.sqrt(
+            df["country"].map({"Netherlands": 0.09, "Italy": 0.16}) + df["store"].map({"store1": 0., "store2": 1.44})
+        )
+        self.assertTrue(np.allclose(1 + stdev * (unit["white_noise"] - 1), df[wn.col_name]))
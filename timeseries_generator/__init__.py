@@ -1,7 +1,15 @@
 from .base_factor import BaseFactor
+from .cache import FactorCache
+from .calendar_factor import CalendarFactor
+from .correlated_noise import ARMANoise, ColoredNoise, RandomWalk
+from .dtype_policy import DtypePolicy
 from .errors import *
+from .fourier_seasonality_factor import FourierSeasonalityFactor
 from .generator import Generator
+from .lazy import LazyGenerator
 from .linear_trend import LinearTrend
+from .memmap_panel import MemmapPanel
+from .profiling import ProfileCollector, ProfileEvent
 from .random_feature_factor import RandomFeatureFactor
 from .sinusoidal_factor import SinusoidalFactor
 from .weekday_factor import WeekdayFactor
@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Union, Tuple
+from typing import Any, List, Dict, Optional, Sequence, Union, Tuple
 
 from matplotlib.figure import Figure
 from matplotlib.axes import *
 from matplotlib.pyplot import subplots
+from numpy import append, asarray, ndarray, newaxis
 from pandas import DataFrame, date_range, DatetimeIndex
 from pandas._libs.tslibs.timestamps import Timestamp
 
+NS_PER_DAY = 86_400_000_000_000
+
 
 class BaseFactor(ABC):
     def __init__(
@@ -15,6 +18,7 @@ class BaseFactor(ABC):
         features: Optional[Dict[str, List[str]]] = None,
         date_col_name: str = "date",
         apply_to_all: bool = False,
+        freq: str = "D",
     ):
         """
         BaseFactor which has to be implemented by all factors.
@@ -25,6 +29,8 @@ class BaseFactor(ABC):
             date_col_name: Name of the date_column of the generated date.
             apply_to_all: Whether this factor applies to all features in the generator. Use this if you want to access
                 all features in the generator
+            freq: pandas frequency of the generated dates, e.g. "D", "h" or "15min". The `Generator` sets the frequency
+                of its date range on all factors.
         """
         if features is None:
             features = {}
@@ -36,6 +42,7 @@ class BaseFactor(ABC):
         self._col_name = col_name
         self._date_col_name = date_col_name
         self._apply_to_all = apply_to_all
+        self._freq = freq
 
     @property
     def col_name(self):
@@ -65,10 +72,19 @@ class BaseFactor(ABC):
     def apply_to_all(self):
         return self._apply_to_all
 
+    @property
+    def freq(self):
+        return self._freq
+
+    @freq.setter
+    def freq(self, freq: str):
+        self._freq = freq
+
     @staticmethod
     def get_datetime_index(
         start_date: Union[Timestamp, str, int, float],
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
+        freq: str = "D",
     ) -> DatetimeIndex:
         """
         Utility function to return datetime function from start_date and optional end_date. Takes in multiple types.
@@ -77,6 +93,7 @@ class BaseFactor(ABC):
         Args:
             start_date: start date of the DateTimeIndex.
             end_date: optional end date.
+            freq: pandas frequency of the DateTimeIndex.
 
         Returns:
             :obj:`DateTimeIndex` compatable with this module.
@@ -88,7 +105,51 @@ class BaseFactor(ABC):
             end_date = Timestamp(end_date)
         elif end_date is None:
             periods = 50
-        return date_range(start=start_date, end=end_date, periods=periods)
+        return date_range(start=start_date, end=end_date, periods=periods, freq=freq)
+
+    @staticmethod
+    def get_elapsed_days(dates: DatetimeIndex) -> ndarray:
+        """
+        Time since the first date in (fractional) days, computed from the int64 nanosecond timestamps. Time zone aware
+        dates are measured in wall time, so that every day counts as one day.
+        """
+        ns: ndarray = _wall_time(dates).asi8
+        if len(ns) == 0:
+            return ns.astype(float)
+        return (ns - ns[0]) / NS_PER_DAY
+
+    @staticmethod
+    def get_period_days(dates: DatetimeIndex) -> float:
+        """
+        Length in days of the period covered by `dates`, counting one step of the frequency for the last date. For a
+        daily range this is the number of dates.
+        """
+        ns: ndarray = _wall_time(dates).asi8
+        if len(ns) < 2:
+            return float(len(ns))
+        return (ns[-1] - ns[0]) / NS_PER_DAY * len(ns) / (len(ns) - 1)
+
+    @staticmethod
+    def lookup_daily(
+        dates: DatetimeIndex, days: DatetimeIndex, values: ndarray, fill_value=1.0
+    ) -> ndarray:
+        """
+        Broadcasts daily values onto `dates` of any frequency by looking up the day of every date.
+
+        Args:
+            dates: dates to look up, e.g. an hourly range.
+            days: unique days of `values`, at midnight.
+            values: one value per day.
+            fill_value: value of the dates of which the day is not in `days`.
+
+        Returns:
+            array with the value of the day of every date.
+        """
+        positions: ndarray = DatetimeIndex(days).get_indexer(
+            _wall_time(dates).normalize()
+        )
+        values = append(asarray(values, dtype=float), fill_value)
+        return values[positions]  # position -1 takes the fill value
 
     @abstractmethod
     def generate(
@@ -107,6 +168,129 @@ class BaseFactor(ABC):
         """
         ...
 
+    @property
+    def stochastic(self) -> bool:
+        """
+        Whether the factor draws random values, that differ per realization of `Generator.generate_realizations`.
+        """
+        return False
+
+    @property
+    def sequential(self) -> bool:
+        """
+        Whether the value of a date depends on the values of the earlier dates, as for autocorrelated noise. The
+        `Generator` generates such factors over its full date range, also when it generates part of the dates.
+        """
+        return False
+
+    @property
+    def resumable(self) -> bool:
+        """
+        Whether a sequential factor can be generated in consecutive windows of dates with `generate_window`, so that
+        the `Generator` only holds one window of it at a time.
+        """
+        return False
+
+    def generate_window(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Union[Timestamp, str, int, float],
+        state: Optional[Any] = None,
+    ) -> Tuple[DataFrame, Any]:
+        """
+        Generates a window of dates of a resumable factor, continuing from the window before it. Consecutive windows
+        together equal `generate` over their full date range. Resumable factors override this method.
+
+        Args:
+            start_date: first date of the window, the date after the last date of the previous window.
+            end_date: last date of the window.
+            state: state returned for the previous window, or None for the first window.
+
+        Returns:
+            DataFrame of the window, as returned by `generate`, and the state at the last date of the window.
+
+        Raises:
+            NotImplementedError: when the factor is not resumable.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} cannot be generated in windows of dates"
+        )
+
+    def generate_realizations(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+        n: int = 1,
+    ) -> Tuple[DataFrame, ndarray]:
+        """
+        Generates `n` realizations of the factor in one batch. Stochastic factors override this method; a factor that
+        is not stochastic returns its values once, as a single realization that broadcasts against the others.
+
+        Args:
+            start_date: start date of the DateTimeIndex.
+            end_date: optional end date.
+            n: number of realizations.
+
+        Returns:
+            the output of `generate`, of which the factor column holds the first realization, and an array of shape
+            (n, rows) with the factor values of every realization, or of shape (1, rows) for a factor that is not
+            stochastic.
+        """
+        df: DataFrame = self.generate(start_date=start_date, end_date=end_date)
+        return df, df[self._col_name].to_numpy(dtype=float)[newaxis]
+
+    def generate_sweep(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+        **parameters: Sequence[float],
+    ) -> Tuple[DataFrame, ndarray]:
+        """
+        Generates the factor for every combination of the values of the swept parameters, in one broadcast
+        computation. Factors of which parameters can be swept override this method.
+
+        Args:
+            start_date: start date of the DateTimeIndex.
+            end_date: optional end date.
+            parameters: parameter names and the values to sweep them over.
+
+        Returns:
+            DataFrame with the date and feature columns of the factor rows, and an array of shape
+            (values of the first parameter, ..., values of the last parameter, rows) with the factor values.
+
+        Raises:
+            ValueError: when a parameter cannot be swept.
+        """
+        raise ValueError(
+            f"{self.__class__.__name__}: parameters {list(parameters)} cannot be swept"
+        )
+
+    def get_sweep_axes(
+        self, parameters: Dict[str, Sequence[float]], defaults: Dict[str, float]
+    ) -> Dict[str, Union[float, ndarray]]:
+        """
+        Values of the parameters of a sweep, as arrays that broadcast against each other and against a trailing axis of
+        rows: the i-th swept parameter varies along axis i. Parameters that are not swept keep their default.
+
+        Args:
+            parameters: swept parameter names and their values.
+            defaults: names and current values of all parameters that can be swept.
+
+        Raises:
+            ValueError: when a parameter cannot be swept.
+        """
+        unknown: List[str] = [name for name in parameters if name not in defaults]
+        if unknown:
+            raise ValueError(
+                f"{self.__class__.__name__}: parameters {unknown} should be in {list(defaults)}"
+            )
+        axes: Dict[str, Union[float, ndarray]] = dict(defaults)
+        for axis, (name, values) in enumerate(parameters.items()):
+            shape: List[int] = [1] * (len(parameters) + 1)
+            shape[axis] = len(values)
+            axes[name] = asarray(values, dtype=float).reshape(shape)
+        return axes
+
     def plot(
         self,
         start_date: Union[Timestamp, str, int, float],
@@ -130,3 +314,10 @@ class BaseFactor(ABC):
             df.plot(x=self.date_col_name, y=self.col_name, ax=ax)
 
         return fig, ax
+
+
+def _wall_time(dates: DatetimeIndex) -> DatetimeIndex:
+    dates = DatetimeIndex(dates)
+    if dates.tz is not None:
+        return dates.tz_localize(None)
+    return dates
@@ -0,0 +1,124 @@
+import pickle
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional, Union
+
+from pandas import DataFrame, Timestamp
+
+from timeseries_generator.base_factor import BaseFactor
+
+
+class FactorCache:
+    def __init__(self, max_bytes: int = 512 * 2**20):
+        """
+        Memoizes the output of factors, so that factors are not regenerated when a generator is rebuilt with the same
+        factors, e.g. when only the base value changed. Outputs are stored under a hash of the factor class, all its
+        parameters (including its features and seed) and the requested date range, and evicted least recently used
+        first once the cached outputs take more than `max_bytes`.
+
+        Only use the cache for factors whose output is a function of their parameters. The cached DataFrames are
+        returned as is and must not be modified.
+
+        Args:
+            max_bytes: memory limit of the cached outputs in bytes. Outputs larger than the limit are not cached.
+
+        Examples:
+            Share a cache between generators:
+            >>> cache = FactorCache(max_bytes=2**30)
+            ... Generator(factors={WeekdayFactor()}, date_range=date_range("01-01-2020", "12-31-2020"), cache=cache)
+        """
+        if max_bytes < 0:
+            raise ValueError(f'max_bytes: "{max_bytes}" should not be negative')
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, DataFrame]" = OrderedDict()
+        self._entry_bytes = {}
+        self._n_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    @property
+    def n_bytes(self) -> int:
+        return self._n_bytes
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(
+        factor: BaseFactor,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+    ) -> str:
+        """
+        Stable hash of the factor class, the factor parameters and the date range.
+        """
+        parameters = sorted(vars(factor).items())
+        return blake2b(
+            pickle.dumps(
+                (
+                    type(factor).__module__,
+                    type(factor).__qualname__,
+                    parameters,
+                    Timestamp(start_date),
+                    None if end_date is None else Timestamp(end_date),
+                )
+            ),
+            digest_size=16,
+        ).hexdigest()
+
+    def generate(
+        self,
+        factor: BaseFactor,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+    ) -> DataFrame:
+        """
+        Returns the cached output of `factor.generate(start_date, end_date)`, or generates and caches it.
+        """
+        key = self.key(factor, start_date, end_date)
+        if key in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self._misses += 1
+        df: DataFrame = factor.generate(start_date=start_date, end_date=end_date)
+        n_bytes = int(df.memory_usage(deep=True).sum())
+        if n_bytes <= self._max_bytes:
+            self._entries[key] = df
+            self._entry_bytes[key] = n_bytes
+            self._n_bytes += n_bytes
+            self._evict()
+        return df
+
+    def clear(self):
+        """
+        Removes all cached outputs and resets the counters.
+        """
+        self._entries.clear()
+        self._entry_bytes.clear()
+        self._n_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _evict(self):
+        while self._n_bytes > self._max_bytes:
+            key, _ = self._entries.popitem(last=False)
+            self._n_bytes -= self._entry_bytes.pop(key)
@@ -0,0 +1,211 @@
+from typing import Dict, List, Mapping, Optional, Union
+
+from numpy import intp, ndarray, ones
+from pandas import DataFrame, DatetimeIndex
+from pandas._libs.tslibs.timestamps import Timestamp
+
+from timeseries_generator.base_factor import BaseFactor
+from timeseries_generator.utils import get_cartesian_product
+
+# calendar fields and the range of their values
+CALENDAR_FIELDS: Dict[str, range] = {
+    "hour": range(0, 24),
+    "weekday": range(0, 7),  # monday is 0
+    "day": range(1, 32),
+    "month": range(1, 13),
+    "week": range(1, 54),  # ISO week
+}
+
+Tables = Mapping[str, Mapping[int, float]]
+
+
+def get_calendar_codes(dates: DatetimeIndex, field: str) -> ndarray:
+    """
+    Value of a calendar field of every date, as integers that index a table of `get_calendar_table`. Dates with a
+    time zone use their local time.
+    """
+    if field == "week":
+        return dates.isocalendar()["week"].to_numpy(dtype=intp)
+    return getattr(dates, "dayofweek" if field == "weekday" else field).to_numpy(
+        dtype=intp
+    )
+
+
+def get_calendar_table(field: str, factors: Mapping[int, float]) -> ndarray:
+    """
+    Lookup table of a calendar field, indexed by the value of the field. Values without a factor get a factor of 1.
+
+    Raises:
+        ValueError: when the field is unknown or a value is out of the range of the field.
+    """
+    if field not in CALENDAR_FIELDS:
+        raise ValueError(f"{field} should be one of {list(CALENDAR_FIELDS)}")
+    values: range = CALENDAR_FIELDS[field]
+    table: ndarray = ones(values.stop)
+    for value, factor in factors.items():
+        if value not in values:
+            raise ValueError(
+                f"{field}: {value} should be between {values.start} and {values.stop - 1}"
+            )
+        table[value] = factor
+    return table
+
+
+class CalendarFactor(BaseFactor):
+    def __init__(
+        self,
+        hour: Optional[Mapping[int, float]] = None,
+        weekday: Optional[Mapping[int, float]] = None,
+        day: Optional[Mapping[int, float]] = None,
+        month: Optional[Mapping[int, float]] = None,
+        week: Optional[Mapping[int, float]] = None,
+        col_name: str = "calendar_factor",
+        date_col_name: str = "date",
+        feature: Optional[str] = None,
+        feature_values: Optional[Dict[str, Tables]] = None,
+    ):
+        """
+        Factor from lookup tables of calendar fields: the hour of the day, the day of the week, the day of the month,
+        the month and the ISO week. The factor of a date is the product of the factors of its fields; values of a field
+        that are not in its table have a factor of 1. The tables are arrays indexed by the integer value of the field,
+        so a date takes one lookup per table. Either supply the tables to apply the factor to the entire time series,
+        or specify tables per feature value.
+
+        Args:
+            hour: factor per hour of the day, 0 to 23. Only has an effect for sub-daily frequencies.
+            weekday: factor per day of the week, monday is 0 and sunday is 6, as in :obj:`WeekdayFactor`.
+            day: factor per day of the month, 1 to 31.
+            month: factor per month, 1 to 12.
+            week: factor per ISO week, 1 to 53.
+            col_name: name of the factor column.
+            date_col_name: name of the resulting date column.
+            feature: feature with a calendar factor.
+            feature_values: tables per feature label, as a dictionary of field names and tables.
+
+        Raises:
+            AttributeError: when tables are set both for all features and per feature value, or when `feature` and
+                `feature_values` are not set together.
+            ValueError: when a field is unknown or a value is out of the range of its field.
+
+        Examples:
+            Busy evenings, quiet sundays and a peak in december:
+            >>> CalendarFactor(hour={18: 1.5, 19: 1.6, 20: 1.3}, weekday={6: 0.7}, month={12: 1.4})
+
+            Different months per product:
+            >>> CalendarFactor(feature="product", feature_values={
+            ...     "winter jacket": {"month": {11: 1.5, 12: 2., 1: 1.5}},
+            ...     "sunglasses": {"month": {6: 1.5, 7: 2., 8: 1.5}, "weekday": {5: 1.2, 6: 1.2}},
+            ... })
+        """
+        if (feature is None) ^ (feature_values is None):
+            raise AttributeError(
+                "Either set `feature` and `feature_values` or set neither."
+            )
+        tables: Dict[str, Mapping[int, float]] = {
+            field: factors
+            for field, factors in zip(
+                CALENDAR_FIELDS, (hour, weekday, day, month, week)
+            )
+            if factors is not None
+        }
+        if tables and feature_values is not None:
+            raise AttributeError("Either set tables or `feature_values`")
+        if feature:
+            features = {feature: list(feature_values.keys())}
+        else:
+            features = None
+
+        self._tables = tables
+        self._feature = feature
+        self._feature_values = feature_values
+        # check the fields and values before generating
+        self.get_tables()
+        super().__init__(
+            col_name=col_name, date_col_name=date_col_name, features=features
+        )
+
+    @property
+    def tables(self) -> Dict[str, Mapping[int, float]]:
+        return self._tables
+
+    @property
+    def feature(self) -> Optional[str]:
+        return self._feature
+
+    @property
+    def feature_values(self) -> Optional[Dict[str, Tables]]:
+        return self._feature_values
+
+    @feature_values.setter
+    def feature_values(self, feature_values: Dict[str, Tables]):
+        if self._tables:
+            raise ValueError("Cannot set feature_values when tables are set.")
+        self._feature_values = feature_values
+        self._features = {self._feature: list(feature_values.keys())}
+
+    def get_tables(self) -> Dict[str, ndarray]:
+        """
+        Lookup table of every field that has factors, one column per feature value, or a single column without
+        feature values.
+
+        Returns:
+            dictionary of field names and arrays of shape (values of the field, feature values).
+        """
+        all_tables: List[Tables] = (
+            list(self._feature_values.values())
+            if self._feature_values is not None
+            else [self._tables]
+        )
+        fields: List[str] = [
+            field
+            for field in CALENDAR_FIELDS
+            if any(field in tables for tables in all_tables)
+        ]
+        unknown = {field for tables in all_tables for field in tables} - set(fields)
+        if unknown:
+            raise ValueError(f"{sorted(unknown)} should be in {list(CALENDAR_FIELDS)}")
+
+        lookup: Dict[str, ndarray] = {}
+        for field in fields:
+            lookup[field] = ones((CALENDAR_FIELDS[field].stop, len(all_tables)))
+            for column, tables in enumerate(all_tables):
+                lookup[field][:, column] = get_calendar_table(
+                    field, tables.get(field, {})
+                )
+        return lookup
+
+    def get_factors(self, dates: DatetimeIndex) -> ndarray:
+        """
+        Product of the table lookups of all fields of the dates.
+
+        Returns:
+            array of shape (dates, feature values), with a single column without feature values.
+        """
+        tables: Dict[str, ndarray] = self.get_tables()
+        factors: ndarray = ones(
+            (len(dates), len(self._feature_values) if self._feature_values else 1)
+        )
+        for field, table in tables.items():
+            factors *= table[get_calendar_codes(dates, field)]
+        return factors
+
+    def generate(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+    ) -> DataFrame:
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        dr: DataFrame = dates.to_frame(index=False, name=self._date_col_name)
+        factors: ndarray = self.get_factors(dates)
+
+        if self._feature_values:
+            df: DataFrame = DataFrame(
+                {self._feature: list(self._feature_values.keys())}
+            )
+            factor_df: DataFrame = get_cartesian_product(dr, df)
+        else:
+            factor_df: DataFrame = dr
+        factor_df[self._col_name] = factors.reshape(-1)
+        return factor_df
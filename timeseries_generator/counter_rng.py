@@ -0,0 +1,206 @@
+"""
+Counter-based random numbers. Every random number is a pure function of a 64-bit key and a 128-bit counter, computed
+with the Philox4x32-10 bijection (Salmon et al., "Parallel random numbers: as easy as 1, 2, 3", SC 2011). Random
+factors derive the key from their seed, their name and the feature values of a row, and use the timestamp of the row as
+counter. Any slice of a time series can therefore be regenerated on its own and gets exactly the values of the full
+run.
+"""
+
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from pandas import DatetimeIndex, factorize
+
+PHILOX_M0 = np.uint64(0xD2511F53)
+PHILOX_M1 = np.uint64(0xCD9E8D57)
+PHILOX_W0 = np.uint64(0x9E3779B9)
+PHILOX_W1 = np.uint64(0xBB67AE85)
+PHILOX_ROUNDS = 10
+CHUNK_SIZE = 16_384  # random numbers per chunk, so that the Philox rounds run on arrays that fit in the CPU cache
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def stable_hash(*parts: Any) -> int:
+    """
+    64-bit hash of `parts` that, unlike `hash`, is the same in every process.
+    """
+    text = "\x1f".join(map(str, parts))
+    return int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def _split(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.asarray(values, dtype=np.uint64)
+    return values & _MASK32, values >> np.uint64(32)
+
+
+def philox4x32(
+    counter: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    key: Tuple[np.ndarray, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Philox4x32-10 applied elementwise to arrays of counters and keys. The 32-bit words are held in 64-bit lanes, so
+    that the 32 x 32 bit multiplications do not overflow, and the rounds are computed in place.
+
+    Args:
+        counter: four broadcastable arrays of 32-bit counter words.
+        key: two broadcastable arrays of 32-bit key words.
+
+    Returns:
+        four arrays of random 32-bit words, as uint64.
+    """
+    counter = [np.asarray(word, dtype=np.uint64) for word in counter]
+    k0, k1 = (np.asarray(word, dtype=np.uint64) for word in key)
+    shape = np.broadcast_shapes(*(word.shape for word in counter + [k0, k1]))
+    c0, c1, c2, c3 = (np.array(np.broadcast_to(word, shape)) for word in counter)
+    product0 = np.empty(shape, dtype=np.uint64)
+    product1 = np.empty(shape, dtype=np.uint64)
+    shift = np.uint64(32)
+    for _ in range(PHILOX_ROUNDS):
+        np.multiply(c0, PHILOX_M0, out=product0)
+        np.multiply(c2, PHILOX_M1, out=product1)
+        # c0, c1, c2, c3 = hi1 ^ c1 ^ k0, lo1, hi0 ^ c3 ^ k1, lo0
+        np.right_shift(product1, shift, out=c0)
+        c0 ^= c1
+        c0 ^= k0
+        np.bitwise_and(product1, _MASK32, out=c1)
+        np.right_shift(product0, shift, out=c2)
+        c2 ^= c3
+        c2 ^= k1
+        np.bitwise_and(product0, _MASK32, out=c3)
+        k0 = (k0 + PHILOX_W0) & _MASK32
+        k1 = (k1 + PHILOX_W1) & _MASK32
+    return c0, c1, c2, c3
+
+
+def _random_words(
+    key: np.ndarray, counter: np.ndarray, stream: np.ndarray = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return philox4x32(_split(counter) + _split(stream), _split(key))
+
+
+def _chunked(
+    transform: Callable[..., np.ndarray],
+    key: np.ndarray,
+    counter: np.ndarray,
+    stream: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Applies `transform` to the random words of the broadcast arguments, in chunks of about `CHUNK_SIZE` numbers along
+    the first axis, into `out` when given. The result does not depend on the chunks; large batches, e.g. many
+    realizations, are several times faster than in one pass, and only the random words of one chunk are held in
+    memory at a time.
+    """
+    arrays = [np.asarray(values, dtype=np.uint64) for values in (key, counter, stream)]
+    shape = np.broadcast_shapes(*(values.shape for values in arrays))
+    if out is not None and out.shape != shape:
+        raise ValueError(f"out: shape {out.shape} should be {shape}")
+    if len(shape) == 0 or int(np.prod(shape)) <= CHUNK_SIZE:
+        if out is None:
+            return transform(*_random_words(*arrays))
+        out[...] = transform(*_random_words(*arrays))
+        return out
+    arrays = [np.broadcast_to(values, shape) for values in arrays]
+    result = np.empty(shape) if out is None else out
+    step = max(1, CHUNK_SIZE // max(1, int(np.prod(shape[1:]))))
+    for start in range(0, shape[0], step):
+        chunk = slice(start, start + step)
+        result[chunk] = transform(*_random_words(*(values[chunk] for values in arrays)))
+    return result
+
+
+def _to_unit(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    # 53 random bits, centered in their interval so that 0 and 1 are never returned
+    bits = (high >> np.uint64(5)) * 67108864.0 + (low >> np.uint64(6))
+    return (bits + 0.5) / 9007199254740992.0
+
+
+def uniform(
+    key: np.ndarray,
+    counter: np.ndarray,
+    stream: np.ndarray = 0,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Uniform random numbers in the open interval (0, 1).
+
+    Args:
+        key: 64-bit keys, e.g. from `series_keys`.
+        counter: 64-bit counters, e.g. timestamps in nanoseconds.
+        stream: optional second 64-bit counter, to draw independent realizations for the same key and counter.
+        out: optional float64 array with the broadcast shape of the arguments, that the numbers are written into.
+
+    Returns:
+        array with the broadcast shape of the arguments, `out` when given.
+
+    Raises:
+        ValueError: when `out` does not have the broadcast shape of the arguments.
+    """
+    return _chunked(_uniform, key, counter, stream, out)
+
+
+def _uniform(c0: np.ndarray, c1: np.ndarray, *_: np.ndarray) -> np.ndarray:
+    return _to_unit(c0, c1)
+
+
+def standard_normal(
+    key: np.ndarray,
+    counter: np.ndarray,
+    stream: np.ndarray = 0,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Standard normal random numbers, from one Philox block per number with the Box-Muller transform. Arguments as in
+    `uniform`.
+    """
+    return _chunked(_box_muller, key, counter, stream, out)
+
+
+def _box_muller(
+    c0: np.ndarray, c1: np.ndarray, c2: np.ndarray, c3: np.ndarray
+) -> np.ndarray:
+    radius = np.sqrt(-2.0 * np.log(_to_unit(c0, c1)))
+    return radius * np.cos(2.0 * np.pi * _to_unit(c2, c3))
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    # SplitMix64 finalizer
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def series_keys(stream_key: int, features: Dict[str, Any]) -> np.ndarray:
+    """
+    Keys of the rows of a random factor, derived from the key of the factor and the feature values of the rows. The
+    key of a row only depends on the feature names and values, not on the order of the features or on the other rows.
+
+    Args:
+        stream_key: key of the random factor, e.g. `stable_hash(seed, col_name)`.
+        features: feature name and the feature value of every row, e.g. the feature columns of a DataFrame.
+
+    Returns:
+        array of 64-bit keys, one per row, or a single key when there are no features.
+    """
+    with np.errstate(over="ignore"):
+        combined = np.uint64(0)
+        for name, values in features.items():
+            if not hasattr(values, "dtype"):
+                values = np.asarray(values, dtype=object)
+            codes, uniques = factorize(values)
+            hashes = np.array(
+                [stable_hash(name, value) for value in uniques], dtype=np.uint64
+            )
+            combined = combined + hashes[codes]
+        return _mix64(combined ^ np.uint64(stream_key))
+
+
+def date_counters(dates: Any) -> np.ndarray:
+    """
+    Counters of a sequence of dates: their timestamps in nanoseconds since the epoch, as uint64.
+    """
+    return DatetimeIndex(dates).asi8.view(np.uint64)
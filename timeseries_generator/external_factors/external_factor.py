@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, List, Union
 
-from pandas import DataFrame
+from pandas import DataFrame, DatetimeIndex
+from pandas.tseries.frequencies import to_offset
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator.base_factor import BaseFactor
@@ -52,8 +53,41 @@ class ExternalFactor(BaseFactor, ABC):
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
     ) -> DataFrame:
         data: DataFrame = self.load_data()
+        if to_offset(self._freq) != to_offset("D"):
+            data = self._to_freq(data, start_date, end_date)
         if end_date is None:
             df_sel = data[(data["date"] >= start_date)]
         else:
             df_sel = data[(data["date"] >= start_date) & (data["date"] < end_date)]
         return df_sel
+
+    def _to_freq(
+        self,
+        data: DataFrame,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+    ) -> DataFrame:
+        """
+        Broadcasts the daily data onto the dates of the frequency of the factor. Without features the factor of every
+        date is looked up by its day; with features every row of a day is repeated for the dates of that day.
+        """
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        if not self._features:
+            return DataFrame(
+                {
+                    self._date_col_name: dates,
+                    self._col_name: self.lookup_daily(
+                        dates,
+                        data[self._date_col_name],
+                        data[self._col_name].to_numpy(),
+                    ),
+                }
+            )
+        days: DataFrame = DataFrame(
+            {self._date_col_name: dates, "day": dates.normalize()}
+        )
+        return days.merge(
+            data.rename(columns={self._date_col_name: "day"}), on="day"
+        ).drop(columns="day")
@@ -0,0 +1,193 @@
+from math import pi
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from numpy import arange, cos, empty, ndarray, newaxis, sin, zeros
+from pandas import DataFrame, DatetimeIndex, Timestamp
+
+from timeseries_generator.base_factor import NS_PER_DAY, BaseFactor
+from timeseries_generator.utils import get_cartesian_product
+
+Harmonics = Sequence[Tuple[float, float]]
+
+
+class FourierSeasonalityFactor(BaseFactor):
+    def __init__(
+        self,
+        period: float = 365.25,
+        harmonics: Optional[Harmonics] = None,
+        mean: float = 1,
+        col_name: str = "fourier_seasonality_factor",
+        date_col_name: str = "date",
+        feature: Optional[str] = None,
+        feature_values: Optional[Dict[str, Harmonics]] = None,
+    ):
+        """
+        Seasonality as a Fourier series of K harmonics of a period:
+        y(t) = mean + sum_k (a_k * sin(2 * pi * k * t / period) + b_k * cos(2 * pi * k * t / period)).
+        The time t is measured in days since 1970-01-01, so the seasonality is tied to the calendar and does not
+        depend on the start date. Either supply the harmonics to apply the factor to the entire time series, or
+        specify harmonics per feature value. The (dates x 2K) basis of sines and cosines is computed once and
+        multiplied with the (2K x feature values) matrix of coefficients, which keeps thousands of feature values
+        cheap.
+
+        Args:
+            period: period of the seasonality in days, e.g. 365.25 for yearly or 7 for weekly seasonality.
+            harmonics: coefficients (a_k, b_k) of the sine and the cosine of the harmonics k = 1, ..., K. Do not supply
+                when specifying feature_values.
+            mean: mean of the factor.
+            col_name: name of the factor column.
+            date_col_name: name of the resulting date column.
+            feature: feature with a seasonality factor.
+            feature_values: harmonics per feature label. Labels may have a different number of harmonics, missing
+                harmonics have coefficients 0.
+
+        Raises:
+            AttributeError: when both or neither of `harmonics` and `feature_values` are set, when `feature` and
+                `feature_values` are not set together, or when `feature_values` is empty.
+
+        Examples:
+            Yearly seasonality with a peak in winter and a smaller second harmonic:
+            >>> FourierSeasonalityFactor(period=365.25, harmonics=[(0., 0.3), (0.05, 0.)])
+
+            Different yearly seasonality per product:
+            >>> FourierSeasonalityFactor(feature="product", feature_values={
+            ...     "winter jacket": [(0., 0.4)],
+            ...     "sunglasses": [(0., -0.3), (0.1, 0.)],
+            ... })
+        """
+        if (feature is None) ^ (feature_values is None):
+            raise AttributeError(
+                "Either set `feature` and `feature_values` or set neither."
+            )
+        if (harmonics is None) == (feature_values is None):
+            raise AttributeError("Either set `harmonics` or `feature_values`")
+        if feature_values is not None and not feature_values:
+            raise AttributeError("`feature_values` should have at least one label")
+        if feature:
+            features = {feature: list(feature_values.keys())}
+        else:
+            features = None
+
+        self._period = period
+        self._harmonics = harmonics
+        self._mean = mean
+        self._feature = feature
+        self._feature_values = feature_values
+        super().__init__(
+            col_name=col_name, date_col_name=date_col_name, features=features
+        )
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    @period.setter
+    def period(self, period: float):
+        self._period = period
+
+    @property
+    def harmonics(self) -> Optional[Harmonics]:
+        return self._harmonics
+
+    @harmonics.setter
+    def harmonics(self, harmonics: Harmonics):
+        if self._feature_values is not None:
+            raise ValueError("Cannot set harmonics when feature_values is set.")
+        self._harmonics = harmonics
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @mean.setter
+    def mean(self, mean: float):
+        self._mean = mean
+
+    @property
+    def feature(self) -> Optional[str]:
+        return self._feature
+
+    @property
+    def feature_values(self) -> Optional[Dict[str, Harmonics]]:
+        return self._feature_values
+
+    @feature_values.setter
+    def feature_values(self, feature_values: Dict[str, Harmonics]):
+        if self._harmonics is not None:
+            raise ValueError("Cannot set feature_values when harmonics is set.")
+        self._feature_values = feature_values
+        self._features = {self._feature: list(feature_values.keys())}
+
+    def get_basis(self, dates: DatetimeIndex, n_harmonics: int) -> ndarray:
+        """
+        Fourier basis of the dates: the sine and the cosine of every harmonic, as columns
+        [sin_1, cos_1, ..., sin_K, cos_K].
+
+        Returns:
+            array of shape (dates, 2 * n_harmonics).
+        """
+        days: ndarray = self.get_elapsed_days(dates) + _epoch_days(dates)
+        angles: ndarray = (
+            2 * pi * days[:, newaxis] * arange(1, n_harmonics + 1) / self._period
+        )
+        basis: ndarray = empty((len(dates), 2 * n_harmonics))
+        basis[:, 0::2] = sin(angles)
+        basis[:, 1::2] = cos(angles)
+        return basis
+
+    def get_coefficients(self) -> ndarray:
+        """
+        Coefficients of the basis, one column per feature value, or a single column without feature values.
+
+        Returns:
+            array of shape (2K, feature values), with K the largest number of harmonics.
+        """
+        harmonics: List[Harmonics] = (
+            list(self._feature_values.values())
+            if self._feature_values is not None
+            else [self._harmonics]
+        )
+        coefficients: ndarray = zeros((2 * max(map(len, harmonics)), len(harmonics)))
+        for column, pairs in enumerate(harmonics):
+            for k, (sin_coefficient, cos_coefficient) in enumerate(pairs):
+                coefficients[2 * k, column] = sin_coefficient
+                coefficients[2 * k + 1, column] = cos_coefficient
+        return coefficients
+
+    def generate(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+    ) -> DataFrame:
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        dr: DataFrame = dates.to_frame(index=False, name=self._date_col_name)
+
+        coefficients: ndarray = self.get_coefficients()
+        # (dates x 2K) @ (2K x feature values)
+        factors: ndarray = (
+            self.get_basis(dates, len(coefficients) // 2) @ coefficients + self._mean
+        )
+
+        if self._feature_values is not None:
+            df: DataFrame = DataFrame(
+                {self._feature: list(self._feature_values.keys())}
+            )
+            factor_df: DataFrame = get_cartesian_product(dr, df)
+        else:
+            factor_df: DataFrame = dr
+        factor_df[self._col_name] = factors.reshape(-1)
+        return factor_df
+
+
+def _epoch_days(dates: DatetimeIndex) -> float:
+    """
+    Days from 1970-01-01 to the first date, in wall time.
+    """
+    if len(dates) == 0:
+        return 0.0
+    first: Timestamp = dates[0]
+    if first.tz is not None:
+        first = first.tz_localize(None)
+    return first.value / NS_PER_DAY
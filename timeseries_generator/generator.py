@@ -1,10 +1,30 @@
-from itertools import product
-from typing import List, Dict, Set, Optional
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import List, Dict, Set, Optional, Iterator, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 from timeseries_generator.base_factor import BaseFactor
+from timeseries_generator.cache import FactorCache
+from timeseries_generator.dtype_policy import DtypePolicy, get_dtype_policy
 from timeseries_generator.errors import FactorAlreadyExistsError, DuplicateNameError
+from timeseries_generator.grid import FeatureGrid
+from timeseries_generator.lazy import LazyGenerator
+from timeseries_generator.memmap_panel import MemmapPanel
+from timeseries_generator.profiling import Profiler, measure
+
+ENGINES = ["broadcast", "merge"]
+SPLITS = ["auto", "dates", "features"]
+OUTPUTS = ["pandas", "arrow"]
+REALIZATION_OUTPUTS = ["array", "pandas"]
+AGGREGATIONS = ["sum", "mean", "min", "max", "count"]
+PARTITION_ROWS = 250_000  # rows per partition of the parallel generation
 
 
 class Generator:
@@ -14,6 +34,10 @@ class Generator:
         features: Optional[Dict[str, List[str]]] = None,
         date_range: pd.DatetimeIndex = None,
         base_value: float = 1.0,
+        engine: str = "broadcast",
+        cache: Optional[FactorCache] = None,
+        dtype_policy: Union[str, DtypePolicy] = "default",
+        profiler: Optional[Profiler] = None,
     ):
         """
         Collects relevant features and creates a resulting DataFrame based on the selected features.
@@ -24,7 +48,21 @@ class Generator:
             date_range: daterange of the resulting dataframe.
             base_value: base value of the resulting value of the time series. Mainly useful to give a correct order of
                 magnitude to your resulting data.
+            engine: how factors are combined. "broadcast" places every factor on an integer coded date x feature grid
+                by position and only materializes the final DataFrame. "merge" left merges every factor onto the
+                DataFrame and is kept as the reference implementation.
+            cache: optional cache of factor outputs, that can be shared between generators. Factors are then only
+                generated again when their parameters or the date range changed.
+            dtype_policy: data types of the resulting DataFrame, a :obj:`DtypePolicy` or the name of one in
+                `DTYPE_POLICIES`. "compact" stores float32 factor columns and drops the `base_amount` column, which
+                takes about half the memory of "default".
+            profiler: optional callable that receives a :obj:`ProfileEvent` with the wall time, rows and bytes of every
+                step of a generation: grid construction, the `generate` of every factor, placing every factor on the
+                grid (or merging it), broadcasting it, the product of the factors and the assembly of the output. Use
+                a :obj:`ProfileCollector` to print a summary table. Nothing is measured without a profiler.
         """
+        if engine not in ENGINES:
+            raise ValueError(f'engine: "{engine}" should be one of {ENGINES}')
         if features is None:
             features = {}
         if date_range is None:
@@ -33,7 +71,14 @@ class Generator:
         self._features = features
         self._base_value = base_value
         self._date_range = date_range
+        self._engine = engine
+        self._cache = cache
+        self._dtype_policy = get_dtype_policy(dtype_policy)
+        self._profiler = profiler
         self._ts = None
+        # grid and factor blocks of the last broadcast generation, to update `ts` incrementally
+        self._grid: Optional[FeatureGrid] = None
+        self._blocks: Optional[Dict[str, np.ndarray]] = None
 
     @property
     def factors(self):
@@ -42,6 +87,7 @@ class Generator:
     @factors.setter
     def factors(self, factors: Set[BaseFactor]):
         self._factors = factors
+        self._blocks = None
 
     @property
     def features(self):
@@ -50,6 +96,16 @@ class Generator:
     @features.setter
     def features(self, features: Dict[str, List[str]]):
         self._features = features
+        self._blocks = None
+
+    @property
+    def date_range(self):
+        return self._date_range
+
+    @date_range.setter
+    def date_range(self, date_range: pd.DatetimeIndex):
+        self._date_range = date_range
+        self._blocks = None
 
     @property
     def base_value(self):
@@ -58,6 +114,45 @@ class Generator:
     @base_value.setter
     def base_value(self, value: float):
         self._base_value = value
+        if self._blocks is not None:
+            if self._dtype_policy.base_amount_column:
+                self._ts["base_amount"] = value
+            self._set_value(self._ts)
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine: str):
+        if engine not in ENGINES:
+            raise ValueError(f'engine: "{engine}" should be one of {ENGINES}')
+        self._engine = engine
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: Optional[FactorCache]):
+        self._cache = cache
+
+    @property
+    def dtype_policy(self):
+        return self._dtype_policy
+
+    @dtype_policy.setter
+    def dtype_policy(self, dtype_policy: Union[str, DtypePolicy]):
+        self._dtype_policy = get_dtype_policy(dtype_policy)
+        self._blocks = None
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: Optional[Profiler]):
+        self._profiler = profiler
 
     @property
     def ts(self):
@@ -66,56 +161,981 @@ class Generator:
     @ts.setter
     def ts(self, ts: pd.DataFrame):
         self._ts = ts
+        self._blocks = None
 
-    def generate(self) -> pd.DataFrame:
+    def generate(
+        self, n_jobs: Optional[int] = None, output: str = "pandas"
+    ) -> Union[pd.DataFrame, "pyarrow.Table"]:
         """
         generates synthetic time series data based on the input factors. Uses the generate method in the factors to
         obtain mergeable dataframes.
 
+        Args:
+            n_jobs: number of worker processes. When set, the feature combinations are split into partitions of about
+                `PARTITION_ROWS` rows that are generated independently with the broadcast engine and put back together
+                in the row order of the grid. Random factors use counter-based random numbers keyed by their seed and
+                the feature values, so the result is the same for any number of workers. -1 uses all CPUs, 1
+                generates the partitions in this process.
+            output: "pandas" returns a DataFrame and stores it in `ts`. "arrow" returns a :obj:`pyarrow.Table` with a
+                timestamp date column, dictionary encoded feature columns and float factor columns, and does not
+                store it in `ts`. With the broadcast engine the table is built from the grid directly: the numeric
+                columns and the feature codes are wrapped without copying and no DataFrame is created. Requires
+                pyarrow.
+
         Returns:
-            DataFrame containing the feature labels and values.
+            DataFrame or Arrow table containing the feature labels and values.
 
         Raises:
             DuplicateNameError: when factors have overlapping names.
         """
-        # generate a combination of date and features data
-        ts: pd.DataFrame = pd.DataFrame(
-            product(list(self._date_range), *self._features.values()),
-            columns=["date"] + list(self._features.keys()),
+        if output not in OUTPUTS:
+            raise ValueError(f'output: "{output}" should be one of {OUTPUTS}')
+        self._blocks = None
+        if output == "arrow":
+            import pyarrow as pa
+
+            if n_jobs is None and self._engine == "broadcast":
+                self._check_factor_names()
+                grid: FeatureGrid = self._new_grid()
+                blocks: Dict[str, np.ndarray] = {
+                    f.col_name: _factor_block(f, grid, self._cache, self._profiler)
+                    for f in self._factors
+                }
+                return pa.Table.from_batches([self._record_batch(grid, blocks)])
+            if n_jobs is not None:
+                ts: pd.DataFrame = self._generate_parallel(n_jobs)
+            else:
+                ts: pd.DataFrame = self._generate_merge()
+            return pa.Table.from_pandas(ts, preserve_index=False)
+
+        if n_jobs is not None:
+            ts: pd.DataFrame = self._generate_parallel(n_jobs)
+        elif self._engine == "merge":
+            ts: pd.DataFrame = self._generate_merge()
+        else:
+            ts: pd.DataFrame = self._generate_broadcast()
+        self._ts = ts
+
+        return ts
+
+    def lazy(self) -> LazyGenerator:
+        """
+        Starts a lazy query on the time series. Columns are selected with `select` and rows with `filter`; nothing is
+        generated until `collect` is called, which only computes the requested columns for the rows that pass the
+        filters.
+
+        Returns:
+            :obj:`LazyGenerator` that selects all columns and rows.
+
+        Examples:
+            Value of the Italian series since 2020:
+            >>> generator.lazy().select("date", "store", "value").filter(
+            ...     country="Italy", date=slice("01-01-2020", None)
+            ... ).collect()
+        """
+        return LazyGenerator(self)
+
+    def generate_realizations(
+        self, n: int, output: str = "array"
+    ) -> Union[np.ndarray, pd.DataFrame]:
+        """
+        Generates `n` realizations of the time series in one batch, e.g. for Monte Carlo scenarios. The grid and the
+        factors that are not stochastic are generated once; stochastic factors (`WhiteNoise`, `RandomFeatureFactor`)
+        draw all realizations at once, realization `i` from stream `i` of their counter-based random numbers.
+        Realization 0 therefore equals the value of `generate`. The result is not stored in `ts`.
+
+        Args:
+            n: number of realizations.
+            output: "array" returns the values as an array of shape (n, dates, feature combinations), with the
+                feature combinations in the row order of `generate`. "pandas" returns a long DataFrame with a
+                `realization` column, the date and feature columns and the value, with the rows of every realization
+                in the order of `generate`.
+
+        Returns:
+            array or DataFrame with the value of every realization.
+
+        Raises:
+            DuplicateNameError: when factors have overlapping names.
+        """
+        if output not in REALIZATION_OUTPUTS:
+            raise ValueError(
+                f'output: "{output}" should be one of {REALIZATION_OUTPUTS}'
+            )
+        if n < 1:
+            raise ValueError(f'n: "{n}" should be a positive number')
+        self._check_factor_names()
+        grid: FeatureGrid = self._new_grid()
+        float_dtype: np.dtype = self._dtype_policy.float_dtype
+        total_factor: np.ndarray = np.ones((1,) + grid.shape)
+        for f in self._factors:
+            if f.stochastic:
+                block = _realization_blocks(f, grid, n, self._profiler)
+            else:
+                block = _factor_block(f, grid, self._cache, self._profiler)
+            with measure(self._profiler, "product", f.col_name, block.size) as step:
+                total_factor = step.output = total_factor * block
+
+        with measure(self._profiler, "output", rows_in=n * grid.size) as step:
+            values: np.ndarray = np.broadcast_to(
+                total_factor * self._base_value, (n,) + grid.shape
+            ).astype(float_dtype)
+            if output == "array":
+                step.output = values.reshape(n, len(grid.dates), -1)
+            else:
+                frame: pd.DataFrame = grid.to_frame(
+                    categorical=self._dtype_policy.categorical_features
+                )
+                ts: pd.DataFrame = frame.take(np.tile(np.arange(grid.size), n))
+                ts.insert(0, "realization", np.arange(n).repeat(grid.size))
+                ts["value"] = values.reshape(-1)
+                step.output = ts.reset_index(drop=True)
+        return step.output
+
+    def sweep(
+        self, parameters: Dict[str, Dict[str, Sequence[float]]], output: str = "array"
+    ) -> Union[np.ndarray, pd.DataFrame]:
+        """
+        Generates the time series for every combination of the swept factor parameters in one broadcast computation.
+        Swept factors are generated once for all their parameter values; the grid and the other factors are generated
+        once for the whole sweep. The result is not stored in `ts`.
+
+        Args:
+            parameters: column name of every swept factor and the names and values of its swept parameters, e.g.
+                `{"lin_trend": {"coef": [0., 0.5, 1.]}, "sinusoidal_factor": {"amplitude": [.1, .2]}}`. Parameters
+                that can be swept are `coef` and `offset` of a `LinearTrend`, `wavelength`, `amplitude`, `phase` and
+                `mean` of a `SinusoidalFactor` and `intensity_scale` of a `WeekdayFactor`.
+            output: "array" returns the values as an array with one axis per swept parameter, in the order of
+                `parameters`, followed by the dates and the feature combinations in the row order of `generate`.
+                "pandas" returns a long DataFrame with one column per swept parameter, named
+                `<col_name>_<parameter>`, the date and feature columns and the value.
+
+        Returns:
+            array or DataFrame with the value for every combination of the swept parameters.
+
+        Raises:
+            DuplicateNameError: when factors have overlapping names.
+            ValueError: when a swept factor is not part of the generator or a parameter cannot be swept.
+        """
+        if output not in REALIZATION_OUTPUTS:
+            raise ValueError(
+                f'output: "{output}" should be one of {REALIZATION_OUTPUTS}'
+            )
+        factor_names: List[str] = self._check_factor_names()
+        unknown: List[str] = [name for name in parameters if name not in factor_names]
+        if unknown:
+            raise ValueError(f"sweep: factors {unknown} are not part of the generator")
+
+        # the swept parameters of all factors, each on its own axis
+        axes: List[Tuple[str, str, np.ndarray]] = [
+            (col_name, name, np.asarray(values))
+            for col_name, factor_parameters in parameters.items()
+            for name, values in factor_parameters.items()
+        ]
+        sweep_shape: Tuple[int, ...] = tuple(
+            len(parameter_values) for _, _, parameter_values in axes
         )
 
+        grid: FeatureGrid = self._new_grid()
+        total_factor: np.ndarray = np.ones((1,) * len(sweep_shape) + grid.shape)
+        for f in self._factors:
+            if f.col_name in parameters:
+                block = _sweep_block(f, grid, parameters[f.col_name], self._profiler)
+                # move the axes of the parameters of the factor to their place in the sweep
+                block = block.reshape(
+                    tuple(
+                        length if col_name == f.col_name else 1
+                        for (col_name, _, _), length in zip(axes, sweep_shape)
+                    )
+                    + block.shape[block.ndim - len(grid.shape) :]
+                )
+            else:
+                block = _factor_block(f, grid, self._cache, self._profiler)
+            with measure(self._profiler, "product", f.col_name, block.size) as step:
+                total_factor = step.output = total_factor * block
+
+        n: int = int(np.prod(sweep_shape))
+        with measure(self._profiler, "output", rows_in=n * grid.size) as step:
+            values: np.ndarray = np.broadcast_to(
+                total_factor * self._base_value, sweep_shape + grid.shape
+            ).astype(self._dtype_policy.float_dtype)
+            if output == "array":
+                step.output = values.reshape(sweep_shape + (len(grid.dates), -1))
+            else:
+                frame: pd.DataFrame = grid.to_frame(
+                    categorical=self._dtype_policy.categorical_features
+                )
+                ts: pd.DataFrame = frame.take(np.tile(np.arange(grid.size), n))
+                points = np.meshgrid(
+                    *(parameter_values for _, _, parameter_values in axes),
+                    indexing="ij",
+                )
+                for position, ((col_name, name, _), point) in enumerate(
+                    zip(axes, points)
+                ):
+                    ts.insert(
+                        position,
+                        f"{col_name}_{name}",
+                        point.reshape(-1).repeat(grid.size),
+                    )
+                ts["value"] = values.reshape(-1)
+                step.output = ts.reset_index(drop=True)
+        return step.output
+
+    def _generate_subgrid(
+        self,
+        dates: np.ndarray,
+        features: List[np.ndarray],
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Generates the rows of `subgrid(dates, features)` of the grid, with only the columns in `columns`. Factors
+        that apply to all features are generated for the rows of the sub grid only. The other factors are generated
+        over the full date range, so that their values do not depend on the selection, and only their factor blocks
+        are sliced; factor columns that are not selected are never broadcast to rows.
+
+        Args:
+            dates: increasing positions of the selected dates.
+            features: increasing positions of the selected values of every feature.
+            columns: columns of the result, defaults to the columns of `generate`.
+
+        Returns:
+            DataFrame with the selected columns, in the row order of `generate`.
+
+        Raises:
+            ValueError: when a column does not exist.
+            DuplicateNameError: when factors have overlapping names.
+        """
+        factor_names: List[str] = self._check_factor_names()
+        grid: FeatureGrid = self._new_grid()
+        sub: FeatureGrid = grid.subgrid(dates, features)
+
+        all_columns: List[str] = ["date"] + list(grid.features)
+        if self._dtype_policy.base_amount_column:
+            all_columns.append("base_amount")
+        all_columns += factor_names + ["total_factor", "value"]
+        if columns is None:
+            columns = all_columns
+        unknown: List[str] = [col for col in columns if col not in all_columns]
+        if unknown:
+            raise ValueError(f"columns: {unknown} should be one of {all_columns}")
+
+        if "total_factor" in columns or "value" in columns:
+            factors: List[BaseFactor] = list(self._factors)
+        else:
+            factors = [f for f in self._factors if f.col_name in columns]
+        float_dtype: np.dtype = self._dtype_policy.float_dtype
+        blocks: Dict[str, np.ndarray] = {}
+        for f in factors:
+            if sub.size == 0:
+                block: np.ndarray = np.ones(sub.shape)
+            elif f.apply_to_all and f.sequential:
+                # depends on the earlier dates: generated for the selected features over all dates
+                block = _factor_block(
+                    f, grid.subgrid(slice(None), features), profiler=self._profiler
+                )[dates]
+            elif f.apply_to_all:
+                block = _factor_block(f, sub, profiler=self._profiler)
+            else:
+                block = grid.take(
+                    _factor_block(f, grid, self._cache, self._profiler),
+                    dates,
+                    features,
+                )
+            blocks[f.col_name] = block.astype(float_dtype, copy=False)
+
+        with measure(self._profiler, "output", rows_in=sub.size) as step:
+            ts: pd.DataFrame = self._base_frame(sub)
+            for col_name in factor_names:
+                if col_name in columns:
+                    ts[col_name] = sub.broadcast(blocks[col_name])
+            if "total_factor" in columns or "value" in columns:
+                total_factor: np.ndarray = np.ones(sub.shape, dtype=float_dtype)
+                for block in blocks.values():
+                    total_factor *= block
+                ts["total_factor"] = total_factor.reshape(-1)
+                self._set_value(ts)
+            ts = ts[columns]
+            step.output = ts
+        return ts
+
+    def _check_factor_names(self) -> List[str]:
+        factor_names = list(map(lambda factor: factor.col_name, self._factors))
+        if len(factor_names) != len(set(factor_names)):
+            raise DuplicateNameError(
+                factor_names,
+                f'duplicate factor names in factor names: "{factor_names}"',
+            )
+        return factor_names
+
+    def _new_grid(self) -> FeatureGrid:
+        with measure(self._profiler, "grid", rows_in=len(self._date_range)) as step:
+            step.output = FeatureGrid(self._date_range, self._features)
+        return step.output
+
+    def _frame(self, grid: FeatureGrid, blocks: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """
+        Materializes the time series of `grid` from one factor block per factor column.
+        """
+        columns: Dict[str, np.ndarray] = self._factor_columns(grid, blocks)
+        with measure(self._profiler, "output", rows_in=grid.size) as step:
+            ts: pd.DataFrame = self._base_frame(grid)
+            for col_name, values in columns.items():
+                ts[col_name] = values
+            self._set_value(ts)
+            step.output = ts
+        return ts
+
+    def _record_batch(
+        self, grid: FeatureGrid, blocks: Dict[str, np.ndarray]
+    ) -> "pyarrow.RecordBatch":
+        """
+        Materializes the time series of `grid` as an Arrow record batch, with the same columns as `_frame`.
+        """
+        float_dtype: np.dtype = self._dtype_policy.float_dtype
+        factor_columns: Dict[str, np.ndarray] = self._factor_columns(grid, blocks)
+        with measure(self._profiler, "output", rows_in=grid.size) as step:
+            columns: Dict[str, np.ndarray] = {}
+            if self._dtype_policy.base_amount_column:
+                columns["base_amount"] = np.full(grid.size, self._base_value)
+                if float_dtype != np.float64:
+                    columns["base_amount"] = columns["base_amount"].astype(float_dtype)
+            columns.update(factor_columns)
+            columns["value"] = columns["total_factor"] * self._base_value
+            step.output = grid.to_arrow(columns)
+        return step.output
+
+    def _factor_columns(
+        self, grid: FeatureGrid, blocks: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Flat factor columns and `total_factor` of `grid`, in the float dtype of the dtype policy.
+        """
+        float_dtype: np.dtype = self._dtype_policy.float_dtype
+        blocks = {
+            col_name: block.astype(float_dtype, copy=False)
+            for col_name, block in blocks.items()
+        }
+        columns: Dict[str, np.ndarray] = {}
+        for col_name, block in blocks.items():
+            with measure(self._profiler, "broadcast", col_name, block.size) as step:
+                columns[col_name] = step.output = grid.broadcast(block)
+
+        with measure(self._profiler, "product", rows_in=grid.size) as step:
+            total_factor: np.ndarray = np.ones(grid.shape, dtype=float_dtype)
+            for block in blocks.values():
+                total_factor *= block
+            columns["total_factor"] = step.output = total_factor.reshape(-1)
+        return columns
+
+    def _base_frame(self, grid: FeatureGrid) -> pd.DataFrame:
+        """
+        DataFrame with the date, feature and base amount columns of `grid`, according to the dtype policy.
+        """
+        ts: pd.DataFrame = grid.to_frame(
+            categorical=self._dtype_policy.categorical_features
+        )
+        if self._dtype_policy.base_amount_column:
+            ts["base_amount"] = self._base_value
+            if self._dtype_policy.float_dtype != np.float64:
+                ts["base_amount"] = ts["base_amount"].astype(
+                    self._dtype_policy.float_dtype
+                )
+        return ts
+
+    def _set_value(self, ts: pd.DataFrame):
+        if self._dtype_policy.base_amount_column:
+            ts["value"] = ts["total_factor"] * ts["base_amount"]
+        else:
+            ts["value"] = ts["total_factor"] * self._base_value
+
+    def _generate_broadcast(self) -> pd.DataFrame:
+        """
+        Places every factor on an integer coded date x feature grid by position, without any joins. Only the resulting
+        DataFrame is materialized.
+        """
+        self._check_factor_names()
+        grid: FeatureGrid = self._new_grid()
+        blocks: Dict[str, np.ndarray] = {
+            f.col_name: _factor_block(f, grid, self._cache, self._profiler)
+            for f in self._factors
+        }
+        ts: pd.DataFrame = self._frame(grid, blocks)
+        self._grid, self._blocks = grid, blocks
+        return ts
+
+    def _generate_parallel(self, n_jobs: int) -> pd.DataFrame:
+        """
+        Generates partitions of the feature combinations in worker processes.
+        """
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+        if n_jobs < 1:
+            raise ValueError(f'n_jobs: "{n_jobs}" should be -1 or a positive number')
+        self._check_factor_names()
+        grid: FeatureGrid = self._new_grid()
+        n_dates: int = grid.shape[0]
+        partitions: List[List[slice]] = list(
+            grid.partitions(max(1, PARTITION_ROWS // max(1, n_dates)))
+        )
+        col_names: List[str] = [f.col_name for f in self._factors]
+
+        # factors that apply to specific features are generated once, the others per partition
+        blocks: Dict[str, np.ndarray] = {
+            f.col_name: _factor_block(f, grid, self._cache, self._profiler)
+            for f in self._factors
+            if not f.apply_to_all
+        }
+        tasks = [
+            (
+                grid.subgrid(slice(None), features),
+                col_names,
+                {
+                    col_name: grid.take(block, slice(None), features)
+                    for col_name, block in blocks.items()
+                },
+                [f for f in self._factors if f.apply_to_all],
+            )
+            for features in partitions
+        ]
+        # partitions are not profiled step by step, they may run in other processes
+        with measure(self._profiler, "partitions", rows_in=len(tasks)) as step:
+            if n_jobs == 1:
+                results = [_generate_partition(*task) for task in tasks]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    results = list(executor.map(_generate_partition, *zip(*tasks)))
+            step.output = grid
+
+        with measure(self._profiler, "output", rows_in=grid.size) as step:
+            ts: pd.DataFrame = self._base_frame(grid)
+            for col_name in col_names + ["total_factor"]:
+                ts[col_name] = np.concatenate(
+                    [result[col_name] for result in results],
+                    axis=1,
+                    dtype=self._dtype_policy.float_dtype,
+                ).reshape(-1)
+            self._set_value(ts)
+            step.output = ts
+        return ts
+
+    def iter_chunks(
+        self, rows_per_chunk: int = 1_000_000, split: str = "auto"
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Generates the time series as a sequence of DataFrames of bounded size, so that panels larger than memory can
+        be written out chunk by chunk. The result is not stored in `ts`.
+
+        Every chunk is a rectangular part of the date x feature grid: a window of dates times a partition of the
+        feature combinations, where leading features are fixed to a single value until the remaining combinations fit
+        the row budget. Factors that apply to specific features are generated once over the full date range and
+        sliced for every chunk; factors that apply to all features (e.g. `WhiteNoise`) are generated per chunk, for
+        the dates and feature values of that chunk only. Sequential factors continue from the previous window of
+        dates (`ARMANoise`, `RandomWalk`), or are generated over all dates for one partition at a time
+        (`ColoredNoise`).
+
+        Args:
+            rows_per_chunk: maximum number of rows per chunk. A chunk holds at least one date and one feature
+                combination, and with `split="features"` all dates of the date range.
+            split: "dates" splits the date range into windows and keeps all feature combinations in every chunk,
+                "features" splits the feature combinations and keeps all dates in every chunk, "auto" only splits the
+                feature combinations when a single date does not fit the row budget.
+
+        Returns:
+            iterator over DataFrames with the same columns as `generate`. With a single partition of the feature
+            combinations (always the case for `split="dates"`), the concatenated chunks are in the row order of
+            `generate`, otherwise the rows are ordered by date window first and partition second, or by partition
+            first when a sequential factor cannot be generated in windows of dates.
+
+        Raises:
+            DuplicateNameError: when factors have overlapping names.
+        """
+        for _, _, chunk_grid, blocks in self._iter_chunk_blocks(rows_per_chunk, split):
+            yield self._frame(chunk_grid, blocks)
+
+    def iter_batches(
+        self, rows_per_chunk: int = 1_000_000, split: str = "auto"
+    ) -> Iterator["pyarrow.RecordBatch"]:
+        """
+        Generates the time series as a sequence of Arrow record batches, built from the grid without creating
+        DataFrames. Chunks as in `iter_chunks`, columns as in `generate(output="arrow")`. Requires pyarrow.
+
+        Returns:
+            iterator over record batches with the same schema.
+
+        Raises:
+            DuplicateNameError: when factors have overlapping names.
+        """
+        for _, _, chunk_grid, blocks in self._iter_chunk_blocks(rows_per_chunk, split):
+            yield self._record_batch(chunk_grid, blocks)
+
+    def _iter_chunk_blocks(
+        self, rows_per_chunk: int, split: str
+    ) -> Iterator[Tuple[slice, List[slice], FeatureGrid, Dict[str, np.ndarray]]]:
+        """
+        Splits the grid into chunks and yields the date and feature positions of every chunk, its grid and its factor
+        blocks.
+        """
+        if split not in SPLITS:
+            raise ValueError(f'split: "{split}" should be one of {SPLITS}')
+        self._check_factor_names()
+        grid: FeatureGrid = self._new_grid()
+        n_dates: int = grid.shape[0]
+        n_series: int = int(np.prod(grid.shape[1:]))
+        rows_per_chunk = max(1, rows_per_chunk)
+
+        if split == "dates":
+            max_series = n_series
+        elif split == "features":
+            max_series = rows_per_chunk // max(1, n_dates)
+        else:
+            max_series = min(n_series, rows_per_chunk)
+        partitions: List[List[slice]] = list(grid.partitions(max(1, max_series)))
+
+        if split == "features":
+            dates_per_chunk = max(1, n_dates)
+        else:
+            # the first partition is the largest one
+            series_per_chunk = int(
+                np.prod(grid.subgrid(slice(None), partitions[0]).shape[1:])
+            )
+            dates_per_chunk = max(1, rows_per_chunk // max(1, series_per_chunk))
+
+        blocks: Dict[str, np.ndarray] = {
+            f.col_name: _factor_block(f, grid, self._cache, self._profiler)
+            for f in self._factors
+            if not f.apply_to_all
+        }
+        windows: List[slice] = [
+            slice(start, start + dates_per_chunk)
+            for start in range(0, n_dates, dates_per_chunk)
+        ]
+        # sequential factors that cannot be generated in windows are generated over all dates, one partition at a
+        # time, so the chunks are ordered by partition first
+        full_factors: List[BaseFactor] = [
+            f
+            for f in self._factors
+            if f.apply_to_all and f.sequential and not f.resumable
+        ]
+        if full_factors:
+            chunks = [(dates, p) for p in range(len(partitions)) for dates in windows]
+        else:
+            chunks = [(dates, p) for dates in windows for p in range(len(partitions))]
+
+        full_blocks: Dict[str, np.ndarray] = {}
+        # next date and filter state of the resumable factors per partition
+        states: Dict[Tuple[str, int], Tuple[pd.Timestamp, object]] = {}
+        for dates, partition in chunks:
+            features: List[slice] = partitions[partition]
+            chunk_grid: FeatureGrid = grid.subgrid(dates, features)
+            if full_factors and dates.start == 0:
+                full_blocks = {}  # release the blocks of the previous partition first
+                full_grid: FeatureGrid = grid.subgrid(slice(None), features)
+                full_blocks = {
+                    f.col_name: _factor_block(f, full_grid, profiler=self._profiler)
+                    for f in full_factors
+                }
+            chunk_blocks: Dict[str, np.ndarray] = {}
+            for f in self._factors:
+                if not f.apply_to_all:
+                    block = grid.take(blocks[f.col_name], dates, features)
+                elif f.sequential and f.resumable:
+                    key: Tuple[str, int] = (f.col_name, partition)
+                    start_date, state = states.pop(key, (chunk_grid.dates[0], None))
+                    block, state = _window_block(
+                        f, chunk_grid, start_date, state, profiler=self._profiler
+                    )
+                    if dates.stop < n_dates:
+                        states[key] = (
+                            chunk_grid.dates[-1] + to_offset(grid.freq),
+                            state,
+                        )
+                elif f.sequential:
+                    block = full_blocks[f.col_name][dates]
+                else:
+                    block = _factor_block(f, chunk_grid, profiler=self._profiler)
+                chunk_blocks[f.col_name] = block
+            yield dates, features, chunk_grid, chunk_blocks
+
+    def aggregate(
+        self,
+        by: Optional[List[str]] = None,
+        freq: Optional[str] = None,
+        agg: Union[str, List[str]] = "sum",
+        rows_per_chunk: int = 1_000_000,
+        split: str = "auto",
+    ) -> pd.DataFrame:
+        """
+        Aggregates `value` per date, or per period of `freq`, and per combination of the features in `by`, without
+        materializing the time series. The chunks of `iter_chunks` are reduced over the other features and over the
+        dates of every period with array reductions and combined into accumulators of the size of the result, so
+        memory use is bounded by the chunk size plus the size of the result. The result is not stored in `ts`.
+
+        Args:
+            by: features to group by, defaults to aggregating over all features.
+            freq: pandas frequency to resample the dates to, e.g. "W" or "MS", with the bins and labels of
+                `pandas.Grouper(key="date", freq=freq)`. Defaults to one group per date.
+            agg: one or more of `AGGREGATIONS`.
+            rows_per_chunk: maximum number of rows per generated chunk, see `iter_chunks`.
+            split: how to split the time series into chunks, see `iter_chunks`.
+
+        Returns:
+            DataFrame with a `date` column, a column per feature in `by` and a `value` column, or a column per
+            aggregation when `agg` is a list. Rows are ordered like
+            `generate().groupby(["date", *by], observed=True)["value"].agg(agg)`.
+
+        Raises:
+            ValueError: when a feature or an aggregation is not known.
+            DuplicateNameError: when factors have overlapping names.
+
+        Examples:
+            Monthly sales per country:
+            >>> generator.aggregate(by=["country"], freq="MS", agg="sum")
+        """
+        if by is None:
+            by = []
+        aggs: List[str] = [agg] if isinstance(agg, str) else list(agg)
+        unknown: List[str] = [a for a in aggs if a not in AGGREGATIONS]
+        if unknown:
+            raise ValueError(f"agg: {unknown} should be in {AGGREGATIONS}")
+        feature_names: List[str] = list(self._features)
+        unknown = [feature for feature in by if feature not in feature_names]
+        if unknown:
+            raise ValueError(f"by: {unknown} are not features")
+
+        # periods of consecutive dates
+        dates: pd.DatetimeIndex = pd.DatetimeIndex(self._date_range)
+        if freq is None:
+            labels: pd.DatetimeIndex = dates
+            codes: np.ndarray = np.arange(len(dates))
+        else:
+            bins: pd.DataFrame = (
+                pd.DataFrame({"date": dates, "position": np.arange(len(dates))})
+                .groupby(pd.Grouper(key="date", freq=freq))["position"]
+                .agg(["min", "max"])
+                .dropna()
+            )
+            labels = pd.DatetimeIndex(bins.index)
+            codes = np.repeat(
+                np.arange(len(bins)), (bins["max"] - bins["min"] + 1).astype(int)
+            )
+
+        by_axes: List[int] = [1 + feature_names.index(feature) for feature in by]
+        other_axes: tuple = tuple(
+            axis for axis in range(1, len(feature_names) + 1) if axis not in by_axes
+        )
+        # axes of a reduced chunk are the date and the `by` features in grid order
+        order: List[int] = [0] + [1 + sorted(by_axes).index(axis) for axis in by_axes]
+        shape = (len(labels),) + tuple(len(self._features[feature]) for feature in by)
+        sums: np.ndarray = np.zeros(shape)
+        counts: np.ndarray = np.zeros(shape, dtype=np.int64)
+        mins: np.ndarray = np.full(shape, np.inf)
+        maxs: np.ndarray = np.full(shape, -np.inf)
+
+        for dates_, features, chunk_grid, blocks in self._iter_chunk_blocks(
+            rows_per_chunk, split
+        ):
+            with measure(self._profiler, "product", rows_in=chunk_grid.size) as step:
+                value: np.ndarray = np.full(chunk_grid.shape, float(self._base_value))
+                for block in blocks.values():
+                    value *= block
+                step.output = value
+
+            with measure(self._profiler, "output", rows_in=chunk_grid.size) as step:
+                chunk_codes: np.ndarray = codes[dates_]
+                starts: np.ndarray = np.flatnonzero(
+                    np.diff(chunk_codes, prepend=-1) != 0
+                )
+                index = np.ix_(
+                    chunk_codes[starts],
+                    *(
+                        np.arange(len(self._features[feature]))[features[axis - 1]]
+                        for feature, axis in zip(by, by_axes)
+                    ),
+                )
+
+                def reduce(ufunc: np.ufunc) -> np.ndarray:
+                    reduced = ufunc.reduce(value, axis=other_axes)
+                    return ufunc.reduceat(reduced, starts, axis=0).transpose(order)
+
+                if "sum" in aggs or "mean" in aggs:
+                    sums[index] += reduce(np.add)
+                if "min" in aggs:
+                    mins[index] = np.minimum(mins[index], reduce(np.minimum))
+                if "max" in aggs:
+                    maxs[index] = np.maximum(maxs[index], reduce(np.maximum))
+                n_values = int(np.prod([value.shape[axis] for axis in other_axes]))
+                counts[index] += (
+                    np.diff(np.append(starts, len(chunk_codes))).reshape(
+                        (-1,) + (1,) * len(by)
+                    )
+                    * n_values
+                )
+                step.output = sums
+
+        results: Dict[str, np.ndarray] = {
+            "sum": sums,
+            "mean": sums / np.maximum(counts, 1),
+            "min": mins,
+            "max": maxs,
+        }
+        df: pd.DataFrame = FeatureGrid(
+            labels, {feature: self._features[feature] for feature in by}
+        ).to_frame(categorical=self._dtype_policy.categorical_features)
+        for a in aggs:
+            col_name = "value" if isinstance(agg, str) else a
+            if a == "count":
+                df[col_name] = counts.reshape(-1)
+            else:
+                df[col_name] = (
+                    results[a].reshape(-1).astype(self._dtype_policy.float_dtype)
+                )
+        return df
+
+    def write_parquet(
+        self,
+        path: Union[str, Path],
+        partition_cols: Optional[List[str]] = None,
+        row_group_size: int = 1_000_000,
+        rows_per_chunk: int = 1_000_000,
+        split: str = "auto",
+        max_queued_chunks: int = 2,
+    ):
+        """
+        Writes the time series to a Parquet dataset without holding the full panel in memory. Record batches from
+        `iter_batches` are generated on the calling thread and encoded and written by a background thread, so that
+        encoding overlaps with generation. Requires pyarrow.
+
+        Args:
+            path: directory of the dataset. Existing files with the same names are overwritten.
+            partition_cols: features to partition the dataset by, as Hive-style `feature=value` directories.
+            row_group_size: number of rows per row group. Rows of a partition are buffered until a row group is full.
+            rows_per_chunk: maximum number of rows per generated chunk, see `iter_chunks`.
+            split: how to split the time series into chunks, see `iter_chunks`. Splitting by "features" keeps the
+                number of partitions that a chunk writes to small when partitioning by the leading features.
+            max_queued_chunks: maximum number of converted chunks waiting for the writer.
+
+        Raises:
+            ValueError: when a partition column is not a feature.
+            DuplicateNameError: when factors have overlapping names.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if partition_cols is None:
+            partition_cols = []
+        unknown: List[str] = [
+            col for col in partition_cols if col not in self._features
+        ]
+        if unknown:
+            raise ValueError(f"partition_cols: {unknown} are not features")
+
+        chunks = iter(self.iter_batches(rows_per_chunk=rows_per_chunk, split=split))
+        first: Optional[pa.RecordBatch] = next(chunks, None)
+        if first is None:
+            return
+        schema: pa.Schema = first.schema
+
+        tables: queue.Queue = queue.Queue(maxsize=max(1, max_queued_chunks))
+        done = object()
+        errors: List[BaseException] = []
+
+        def batches():
+            while True:
+                batch = tables.get()
+                if batch is done:
+                    return
+                yield batch
+
+        def write():
+            try:
+                ds.write_dataset(
+                    batches(),
+                    base_dir=str(path),
+                    schema=schema,
+                    format="parquet",
+                    partitioning=partition_cols or None,
+                    partitioning_flavor="hive" if partition_cols else None,
+                    min_rows_per_group=row_group_size,
+                    max_rows_per_group=row_group_size,
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+            except BaseException as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=write, name="write_parquet", daemon=True)
+        writer.start()
+
+        def put(item):
+            # stop waiting for the writer when it failed
+            while writer.is_alive():
+                try:
+                    tables.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        try:
+            for chunk in chain([first], chunks):
+                if errors:
+                    break
+                put(chunk)
+        except BaseException:
+            # drop the queued chunks of the failed generation, so that the writer stops early
+            while True:
+                try:
+                    tables.get_nowait()
+                except queue.Empty:
+                    break
+            raise
+        finally:
+            put(done)
+            writer.join()
+        if errors:
+            # release the Arrow thread that may still wait for batches of the failed writer
+            while not tables.empty():
+                tables.get_nowait()
+            tables.put_nowait(done)
+            raise errors[0]
+
+    def write_arrow(
+        self,
+        path: Union[str, Path],
+        rows_per_chunk: int = 1_000_000,
+        split: str = "auto",
+    ):
+        """
+        Writes the time series to an uncompressed Arrow IPC file (Feather version 2) without holding the full panel in
+        memory, one record batch per chunk of `iter_batches`. Readers can memory-map the file and read the columns
+        without copying them, e.g. with `pyarrow.ipc.open_file(pyarrow.memory_map(path))` or
+        `pyarrow.feather.read_table(path, memory_map=True)`. Requires pyarrow.
+
+        Args:
+            path: path of the file. An existing file is overwritten.
+            rows_per_chunk: maximum number of rows per record batch, see `iter_chunks`.
+            split: how to split the time series into record batches, see `iter_chunks`.
+
+        Raises:
+            DuplicateNameError: when factors have overlapping names.
+        """
+        import pyarrow as pa
+
+        batches = iter(self.iter_batches(rows_per_chunk=rows_per_chunk, split=split))
+        first: Optional[pa.RecordBatch] = next(batches, None)
+        if first is None:
+            return
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, first.schema) as writer:
+                for batch in chain([first], batches):
+                    writer.write_batch(batch)
+
+    def write_memmap(
+        self,
+        path: Union[str, Path],
+        factor_columns: bool = False,
+        rows_per_chunk: int = 1_000_000,
+        split: str = "auto",
+    ) -> MemmapPanel:
+        """
+        Writes the time series to a directory of memory-mapped date x series matrices, without holding the full panel
+        in memory. The matrices are allocated as `.npy` files on disk and every chunk of `iter_chunks` is written
+        straight into its rows and columns and flushed. The files are only mapped while a chunk is written, so memory use
+        is bounded by the chunk size and not by the size of the matrices. Series are the
+        feature combinations in the row order of `generate`. A sidecar file with the dates and feature values is
+        written when all chunks are done; the dataset can then be reopened with :obj:`MemmapPanel`.
+
+        Args:
+            path: directory of the dataset, created when it does not exist. Existing files are overwritten.
+            factor_columns: whether to also write the factor columns and `total_factor`, besides `value`.
+            rows_per_chunk: maximum number of rows per generated chunk, see `iter_chunks`.
+            split: how to split the time series into chunks, see `iter_chunks`.
+
+        Returns:
+            :obj:`MemmapPanel` of the written dataset.
+
+        Raises:
+            DuplicateNameError: when factors have overlapping names.
+        """
+        factor_names: List[str] = self._check_factor_names()
+        grid: FeatureGrid = self._new_grid()
+        columns: List[str] = ["value"]
+        if factor_columns:
+            columns = factor_names + ["total_factor"] + columns
+        MemmapPanel.allocate(path, grid, columns, self._dtype_policy.float_dtype)
+
+        for dates, features, chunk_grid, blocks in self._iter_chunk_blocks(
+            rows_per_chunk, split
+        ):
+            series: slice = grid.series(features)
+            values: Dict[str, np.ndarray] = self._factor_columns(chunk_grid, blocks)
+            values["value"] = values["total_factor"] * self._base_value
+            for col_name in columns:
+                MemmapPanel.write(
+                    path,
+                    col_name,
+                    dates,
+                    series,
+                    values[col_name].reshape(len(chunk_grid.dates), -1),
+                )
+
+        MemmapPanel.write_axes(path, grid, columns, self._base_value)
+        return MemmapPanel(path)
+
+    def _generate_merge(self) -> pd.DataFrame:
+        """
+        Left merges every factor onto the time series. Reference implementation of the broadcast engine.
+        """
+        # generate a combination of date and features data
+        with measure(self._profiler, "grid", rows_in=len(self._date_range)) as step:
+            grid: FeatureGrid = FeatureGrid(self._date_range, self._features)
+            ts: pd.DataFrame = grid.to_frame(
+                categorical=self._dtype_policy.categorical_features
+            )
+            step.output = ts
+
         # Add base amount
         ts["base_amount"] = self._base_value
 
         # Merge the factors on the base_df
         for f in self._factors:
-            if f.apply_to_all:
-                f.features = self._features  # apply all features to the factor
-            df: pd.DataFrame = f.generate(
-                start_date=self._date_range[0], end_date=self._date_range[-1]
-            )
+            with measure(
+                self._profiler, "generate", f.col_name, len(grid.dates)
+            ) as step:
+                df: pd.DataFrame = _generate_factor(f, grid, self._cache)
+                step.output = df
             if f.date_col_name != "date":
                 df.rename(
                     columns={f.date_col_name: "date"}
                 )  # rename date column to standard "date" name
 
-            ts = ts.merge(
-                df,
-                how="left",
-                on=list(f.features.keys()) + ["date"],  # Add date to merge columns
-            ).fillna(
-                1
-            )  # Factor 1 means no effect
+            with measure(self._profiler, "merge", f.col_name, len(ts)) as step:
+                ts = ts.merge(
+                    df,
+                    how="left",
+                    on=list(f.features.keys()) + ["date"],  # Add date to merge columns
+                )
+                ts[f.col_name] = ts[f.col_name].fillna(1)  # Factor 1 means no effect
+                step.output = ts
 
-        factor_names = list(map(lambda factor: factor.col_name, self._factors))
-        if len(factor_names) != len(set(factor_names)):
-            raise DuplicateNameError(
-                f'duplicate factor names in factor names: "{factor_names}"'
-            )
+        factor_names = self._check_factor_names()
 
-        ts["total_factor"] = ts[factor_names].prod(axis=1)
-        ts["value"] = ts["total_factor"] * ts["base_amount"]
-        self._ts = ts
+        with measure(self._profiler, "product", rows_in=len(ts)) as step:
+            ts["total_factor"] = step.output = ts[factor_names].prod(axis=1)
+
+        with measure(self._profiler, "output", rows_in=len(ts)) as step:
+            # merging turns the categorical feature columns into object columns
+            if self._dtype_policy.categorical_features:
+                for name, values in grid.features.items():
+                    ts[name] = pd.Categorical(ts[name], categories=values)
+
+            ts["value"] = ts["total_factor"] * ts["base_amount"]
+
+            float_dtype: np.dtype = self._dtype_policy.float_dtype
+            if float_dtype != np.float64:
+                float_cols = ["base_amount"] + factor_names + ["total_factor", "value"]
+                ts[float_cols] = ts[float_cols].astype(float_dtype)
+            if not self._dtype_policy.base_amount_column:
+                del ts["base_amount"]
+            step.output = ts
 
         return ts
 
@@ -127,7 +1147,8 @@ class Generator:
 
     def add_factor(self, factor: BaseFactor):
         """
-        Add factor to time series.
+        Add factor to time series. When the time series was generated with the broadcast engine, only the column of
+        the new factor is generated and `total_factor` and `value` of `ts` are updated.
 
         Args:
             factor: factor to add to the generator.
@@ -137,31 +1158,231 @@ class Generator:
         """
         if factor.col_name in map(lambda f: f.col_name, self._factors):
             raise FactorAlreadyExistsError(
+                factor,
                 f'factor "{factor}" already exists in generator '
-                f"{self.__class__.__name__}."
+                f"{self.__class__.__name__}.",
             )
         self._factors.add(factor)
+        self._update_ts(added=factor)
 
     def update_factor(self, factor: BaseFactor):
         """
-        add or update factor to the time series.
+        add or update factor to the time series. When the time series was generated with the broadcast engine, only
+        the column of the factor is generated again and `total_factor` and `value` of `ts` are updated.
 
         Args:
             factor: factor to add to the generator, or factor to update the definition of.
         """
         factors: Set[BaseFactor] = self._factors
+        removed: Optional[str] = None
         if factor.col_name in map(lambda f: f.col_name, self._factors):
             factors = set(
                 filter(lambda f: f.col_name != factor.col_name, self._factors)
             )
+            removed = factor.col_name
         factors.add(factor)
         self._factors = factors
+        self._update_ts(removed=removed, added=factor)
         return factors
 
     def remove_factor(self, factor: BaseFactor):
         """
-        remove factor from time series.
+        remove factor from time series. When the time series was generated with the broadcast engine, the factor
+        column is dropped from `ts` and divided out of `total_factor` and `value`.
         Args:
             factor: factor to remove from the generator.
         """
         self._factors.remove(factor)
+        self._update_ts(removed=factor.col_name)
+
+    def _update_ts(
+        self, removed: Optional[str] = None, added: Optional[BaseFactor] = None
+    ):
+        """
+        Updates the last generated time series for a removed and/or added factor column, in time proportional to a
+        single factor. A removed factor is divided out of the total factor, unless it has zeros, in which case the
+        total factor is the product of the remaining factor blocks. Does nothing when the time series was not
+        generated with the broadcast engine. When the added factor fails to generate, the time series is left as it
+        was and the next `generate` builds it again from all factors.
+        """
+        if self._blocks is None:
+            return
+        grid: FeatureGrid = self._grid
+        ts: pd.DataFrame = self._ts  # updated in place
+
+        # generate the added factor before changing any state
+        added_block: Optional[np.ndarray] = None
+        if added is not None:
+            try:
+                added_block = _factor_block(added, grid, self._cache, self._profiler)
+            except BaseException:
+                self._blocks = None
+                raise
+
+        total_factor: np.ndarray = (
+            ts["total_factor"].to_numpy(dtype=float, copy=True).reshape(grid.shape)
+        )
+        if removed is not None:
+            block: np.ndarray = self._blocks.pop(removed)
+            if np.all(block != 0):
+                total_factor /= block
+            else:
+                total_factor = np.ones(grid.shape)
+                for other in self._blocks.values():
+                    total_factor *= other
+            if added is None or added.col_name != removed:
+                del ts[removed]
+
+        if added is not None:
+            self._blocks[added.col_name] = added_block
+            total_factor *= added_block
+            column: np.ndarray = grid.broadcast(added_block).astype(
+                self._dtype_policy.float_dtype, copy=False
+            )
+            if added.col_name in ts.columns:
+                ts[added.col_name] = column
+            else:
+                ts.insert(ts.columns.get_loc("total_factor"), added.col_name, column)
+
+        ts["total_factor"] = total_factor.reshape(-1).astype(
+            self._dtype_policy.float_dtype, copy=False
+        )
+        self._set_value(ts)
+
+
+def _prepare_factor(f: BaseFactor, grid: FeatureGrid):
+    """
+    Sets the features and the frequency of `grid` on a factor before it is generated.
+    """
+    if f.apply_to_all:
+        f.features = grid.features  # apply all features to the factor
+    f.freq = grid.freq
+
+
+def _generate_factor(
+    f: BaseFactor, grid: FeatureGrid, cache: Optional[FactorCache] = None
+) -> pd.DataFrame:
+    """
+    Generates a factor over the dates of `grid`, through `cache` when given.
+    """
+    _prepare_factor(f, grid)
+    if cache is not None:
+        return cache.generate(f, start_date=grid.dates[0], end_date=grid.dates[-1])
+    return f.generate(start_date=grid.dates[0], end_date=grid.dates[-1])
+
+
+def _factor_block(
+    f: BaseFactor,
+    grid: FeatureGrid,
+    cache: Optional[FactorCache] = None,
+    profiler: Optional[Profiler] = None,
+) -> np.ndarray:
+    with measure(profiler, "generate", f.col_name, len(grid.dates)) as step:
+        df: pd.DataFrame = _generate_factor(f, grid, cache)
+        step.output = df
+    with measure(profiler, "block", f.col_name, len(df)) as step:
+        step.output = grid.block(
+            df,
+            col_name=f.col_name,
+            date_col_name=f.date_col_name,
+            feature_names=list(f.features.keys()),
+        )
+    return step.output
+
+
+def _window_block(
+    f: BaseFactor,
+    grid: FeatureGrid,
+    start_date: pd.Timestamp,
+    state: Optional[object] = None,
+    profiler: Optional[Profiler] = None,
+) -> Tuple[np.ndarray, object]:
+    """
+    Generates a window of a resumable factor, from `start_date` to the last date of `grid` and continuing from
+    `state`, and places it on `grid`. Returns the block and the state at the last date of the window.
+    """
+    with measure(profiler, "generate", f.col_name, len(grid.dates)) as step:
+        _prepare_factor(f, grid)
+        df, state = f.generate_window(start_date, grid.dates[-1], state)
+        step.output = df
+    with measure(profiler, "block", f.col_name, len(df)) as step:
+        step.output = grid.block(
+            df,
+            col_name=f.col_name,
+            date_col_name=f.date_col_name,
+            feature_names=list(f.features.keys()),
+        )
+    return step.output, state
+
+
+def _realization_blocks(
+    f: BaseFactor, grid: FeatureGrid, n: int, profiler: Optional[Profiler] = None
+) -> np.ndarray:
+    """
+    Generates `n` realizations of a factor and places them on `grid`, as an array of shape `(n,) + block shape`.
+    """
+    with measure(profiler, "generate", f.col_name, len(grid.dates)) as step:
+        _prepare_factor(f, grid)
+        df, values = f.generate_realizations(
+            start_date=grid.dates[0], end_date=grid.dates[-1], n=n
+        )
+        step.output = values
+    with measure(profiler, "block", f.col_name, values.size) as step:
+        step.output = grid.blocks(
+            df,
+            values,
+            date_col_name=f.date_col_name,
+            feature_names=list(f.features.keys()),
+        )
+    return step.output
+
+
+def _sweep_block(
+    f: BaseFactor,
+    grid: FeatureGrid,
+    parameters: Dict[str, Sequence[float]],
+    profiler: Optional[Profiler] = None,
+) -> np.ndarray:
+    """
+    Generates a factor for every combination of its swept parameters and places it on `grid`, as an array with one
+    axis per swept parameter followed by the axes of the block.
+    """
+    with measure(profiler, "generate", f.col_name, len(grid.dates)) as step:
+        _prepare_factor(f, grid)
+        df, values = f.generate_sweep(
+            start_date=grid.dates[0], end_date=grid.dates[-1], **parameters
+        )
+        step.output = values
+    feature_names: List[str] = list(f.features.keys())
+    with measure(profiler, "block", f.col_name, values.size) as step:
+        step.output = grid.blocks(
+            df,
+            values.reshape(-1, values.shape[-1]),
+            date_col_name=f.date_col_name,
+            feature_names=feature_names,
+        ).reshape(values.shape[:-1] + grid.block_shape(feature_names))
+    return step.output
+
+
+def _generate_partition(
+    grid: FeatureGrid,
+    col_names: List[str],
+    blocks: Dict[str, np.ndarray],
+    factors: List[BaseFactor],
+) -> Dict[str, np.ndarray]:
+    """
+    Generates one partition of the parallel generation. Factors in `factors` are generated for the partition, the
+    other factor columns are broadcast from `blocks`.
+
+    Returns:
+        a (dates x feature combinations) matrix per factor column and for the total factor.
+    """
+    blocks = dict(blocks, **{f.col_name: _factor_block(f, grid) for f in factors})
+    n_dates: int = grid.shape[0]
+    columns: Dict[str, np.ndarray] = {}
+    total_factor: np.ndarray = np.ones(grid.shape)
+    for col_name in col_names:
+        columns[col_name] = grid.broadcast(blocks[col_name]).reshape(n_dates, -1)
+        total_factor *= blocks[col_name]
+    columns["total_factor"] = total_factor.reshape(n_dates, -1)
+    return columns
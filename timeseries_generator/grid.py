@@ -0,0 +1,365 @@
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pandas import Categorical, DataFrame, DatetimeIndex, Index, Timedelta, infer_freq
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+
+class FeatureGrid:
+    def __init__(
+        self,
+        dates: DatetimeIndex,
+        features: Dict[str, List],
+        categories: Optional[Dict[str, List]] = None,
+        freq: Optional[str] = None,
+    ):
+        """
+        Date x feature grid of a generated time series, with every axis held as an integer coded index. Rows of the
+        time series are laid out in C-order over the axes: dates vary slowest, the last feature varies fastest. This is
+        the same order as `itertools.product(dates, *features.values())`.
+
+        Args:
+            dates: dates of the time series.
+            features: feature names and their values.
+            categories: categories of the feature columns, defaults to the feature values. A sub grid keeps the
+                categories of the grid it was taken from, so that its DataFrames can be concatenated.
+            freq: frequency at which the factors are generated, defaults to the frequency of the dates when it is
+                shorter than a day and to "D" otherwise. A sub grid keeps the frequency of the grid it was taken from.
+        """
+        if categories is None:
+            categories = features
+        self._dates = DatetimeIndex(dates)
+        self._features = {name: list(values) for name, values in features.items()}
+        self._feature_index = {
+            name: Index(values) for name, values in self._features.items()
+        }
+        self._categories = {name: Index(categories[name]) for name in self._features}
+        self._freq = _factor_freq(self._dates) if freq is None else freq
+
+    @property
+    def dates(self) -> DatetimeIndex:
+        return self._dates
+
+    @property
+    def features(self) -> Dict[str, List]:
+        return self._features
+
+    @property
+    def freq(self) -> str:
+        return self._freq
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (len(self._dates),) + tuple(
+            len(values) for values in self._features.values()
+        )
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def to_frame(
+        self, date_col_name: str = "date", categorical: bool = True
+    ) -> DataFrame:
+        """
+        Materializes the grid as a DataFrame with a date column and one categorical column per feature. The columns are
+        built with array operations on the integer codes of the axes, no Python object is created per row.
+
+        Args:
+            date_col_name: name of the date column.
+            categorical: whether the feature columns are categorical, or object columns with the feature values.
+
+        Returns:
+            DataFrame with one row per grid cell.
+        """
+        columns = {date_col_name: self._dates.repeat(int(np.prod(self.shape[1:])))}
+        for name, codes in self._codes().items():
+            categories = self._categories[name]
+            if categorical:
+                columns[name] = Categorical.from_codes(codes, categories=categories)
+            else:
+                columns[name] = categories.to_numpy(dtype=object)[codes]
+        return DataFrame(columns)
+
+    def to_arrow(
+        self, columns: Dict[str, np.ndarray], date_col_name: str = "date"
+    ) -> "pyarrow.RecordBatch":
+        """
+        Materializes the grid as an Arrow record batch with a timestamp column, one dictionary encoded column per
+        feature and the given value columns. The value columns and the integer codes are wrapped without copying, the
+        dictionaries hold the categories of the grid. Requires pyarrow.
+
+        Args:
+            columns: names and flat arrays of the value columns, one value per grid cell.
+            date_col_name: name of the date column.
+
+        Returns:
+            :obj:`pyarrow.RecordBatch` with one row per grid cell.
+        """
+        import pyarrow as pa
+
+        dates = self._dates.asi8.repeat(int(np.prod(self.shape[1:])))
+        arrays = {
+            date_col_name: pa.array(
+                dates.view("datetime64[ns]"),
+                type=pa.timestamp(
+                    "ns", tz=None if self._dates.tz is None else str(self._dates.tz)
+                ),
+            )
+        }
+        for name, codes in self._codes().items():
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pa.array(codes), pa.array(self._categories[name].to_list())
+            )
+        for name, values in columns.items():
+            arrays[name] = pa.array(values)
+        return pa.RecordBatch.from_arrays(
+            list(arrays.values()), names=list(arrays.keys())
+        )
+
+    def _codes(self) -> Dict[str, np.ndarray]:
+        """
+        Category codes of every feature column, built with array operations on the integer codes of the axes.
+        """
+        shape = self.shape
+        columns = {}
+        for axis, (name, index) in enumerate(self._feature_index.items(), start=1):
+            inner = int(np.prod(shape[axis + 1 :]))
+            outer = int(np.prod(shape[:axis]))
+            categories = self._categories[name]
+            codes = categories.get_indexer(index).astype(_code_dtype(len(categories)))
+            columns[name] = np.tile(np.repeat(codes, inner), outer)
+        return columns
+
+    def subgrid(
+        self,
+        dates: Union[slice, np.ndarray],
+        features: Sequence[Union[slice, np.ndarray]],
+    ) -> "FeatureGrid":
+        """
+        Takes a rectangular part of the grid.
+
+        Args:
+            dates: positions of the dates to take, as a slice or an array of increasing positions.
+            features: positions of the values to take, one slice or array of increasing positions per feature.
+
+        Returns:
+            :obj:`FeatureGrid` that keeps the categories of this grid.
+        """
+        return FeatureGrid(
+            self._dates[dates],
+            {
+                name: (
+                    values[positions]
+                    if isinstance(positions, slice)
+                    else [values[position] for position in positions]
+                )
+                for (name, values), positions in zip(self._features.items(), features)
+            },
+            categories=self._categories,
+            freq=self._freq,
+        )
+
+    def partitions(self, max_series: int) -> Iterator[List[slice]]:
+        """
+        Splits the feature combinations into rectangular partitions of at most `max_series` combinations. Leading
+        features are fixed to a single value until the remaining features fit in the budget, so every partition is a
+        contiguous range of series in the row order of the grid. A partition holds at least one series.
+
+        Args:
+            max_series: maximum number of feature combinations per partition.
+
+        Returns:
+            iterator over the partitions, one slice per feature.
+        """
+        sizes = [len(values) for values in self._features.values()]
+        if int(np.prod(sizes)) <= max_series:
+            yield [slice(None)] * len(sizes)
+            return
+
+        # first feature of which a range of values fits in the budget
+        level = next(
+            level
+            for level in range(len(sizes))
+            if int(np.prod(sizes[level + 1 :])) <= max_series
+        )
+        step = max(1, max_series // int(np.prod(sizes[level + 1 :])))
+        for prefix in product(*(range(size) for size in sizes[:level])):
+            for start in range(0, sizes[level], step):
+                yield (
+                    [slice(position, position + 1) for position in prefix]
+                    + [slice(start, min(start + step, sizes[level]))]
+                    + [slice(None)] * (len(sizes) - level - 1)
+                )
+
+    def series(self, features: Sequence[slice]) -> slice:
+        """
+        Positions of the feature combinations of `subgrid(dates, features)` among the feature combinations of this
+        grid. The combinations of a partition as returned by `partitions` form a contiguous range.
+
+        Raises:
+            ValueError: when the combinations are not contiguous.
+        """
+        sizes = [len(values) for values in self._features.values()]
+        ranges = [range(size)[positions] for positions, size in zip(features, sizes)]
+        for level, positions in enumerate(ranges):
+            if positions.step != 1 or (
+                len(positions) < sizes[level]
+                and any(len(r) > 1 for r in ranges[:level])
+            ):
+                raise ValueError(f"features: {features} are not contiguous series")
+        lengths = [len(positions) for positions in ranges]
+        if 0 in lengths:
+            return slice(0, 0)
+        start = (
+            int(np.ravel_multi_index([r.start for r in ranges], sizes)) if sizes else 0
+        )
+        return slice(start, start + int(np.prod(lengths)))
+
+    def take(
+        self,
+        block: np.ndarray,
+        dates: Union[slice, np.ndarray],
+        features: Sequence[Union[slice, np.ndarray]],
+    ) -> np.ndarray:
+        """
+        Takes the part of a factor block that belongs to `subgrid(dates, features)`.
+        """
+        index = [dates] + [
+            positions if length > 1 else slice(None)
+            for positions, length in zip(features, block.shape[1:])
+        ]
+        if all(isinstance(positions, slice) for positions in index):
+            return block[tuple(index)]
+        # positions along several axes select their outer product
+        return block[
+            np.ix_(
+                *(
+                    (
+                        np.arange(length)[positions]
+                        if isinstance(positions, slice)
+                        else positions
+                    )
+                    for positions, length in zip(index, block.shape)
+                )
+            )
+        ]
+
+    def block_shape(self, feature_names: Sequence[str]) -> Tuple[int, ...]:
+        """
+        Shape of a factor block that only depends on the date and on `feature_names`. Axes of the other features have
+        length one, so that the block broadcasts against the full grid.
+        """
+        return (len(self._dates),) + tuple(
+            len(values) if name in feature_names else 1
+            for name, values in self._features.items()
+        )
+
+    def block(
+        self,
+        df: DataFrame,
+        col_name: str,
+        date_col_name: str = "date",
+        feature_names: Sequence[str] = (),
+    ) -> np.ndarray:
+        """
+        Places the output of a factor onto the grid by position. Dates and feature labels are translated to integer
+        positions on the grid axes; rows that do not match the grid are dropped and grid cells that are not covered by
+        the factor get a factor of 1, just like a left merge followed by `fillna(1)`.
+
+        Args:
+            df: DataFrame generated by a factor.
+            col_name: column name of the factor values.
+            date_col_name: column name of the dates.
+            feature_names: features the factor depends on.
+
+        Returns:
+            array of shape `block_shape(feature_names)` containing the factor values.
+
+        Raises:
+            KeyError: when the factor depends on a feature that is not part of the grid.
+        """
+        values: np.ndarray = df[col_name].to_numpy(dtype=float)
+        return self.blocks(df, values[np.newaxis], date_col_name, feature_names)[0]
+
+    def blocks(
+        self,
+        df: DataFrame,
+        values: np.ndarray,
+        date_col_name: str = "date",
+        feature_names: Sequence[str] = (),
+    ) -> np.ndarray:
+        """
+        Places several realizations of a factor onto the grid at once, as `block` does for a single one. The rows of
+        `df` are translated to grid positions once for all realizations.
+
+        Args:
+            df: DataFrame generated by a factor, of which the date and feature columns are used.
+            values: array of shape (realizations, rows of `df`) with the factor values.
+            date_col_name: column name of the dates.
+            feature_names: features the factor depends on.
+
+        Returns:
+            array of shape `(realizations,) + block_shape(feature_names)`.
+
+        Raises:
+            KeyError: when the factor depends on a feature that is not part of the grid.
+        """
+        unknown = set(feature_names) - set(self._features)
+        if unknown:
+            raise KeyError(f"features {sorted(unknown)} are not part of the grid")
+
+        blocks = np.ones((len(values),) + self.block_shape(feature_names))
+        positions = [self._dates.get_indexer(df[date_col_name])]
+        for name, index in self._feature_index.items():
+            if name in feature_names:
+                positions.append(index.get_indexer(df[name]))
+            else:
+                positions.append(np.zeros(len(df), dtype=np.intp))
+
+        found = np.logical_and.reduce([pos >= 0 for pos in positions])
+        blocks[(slice(None),) + tuple(pos[found] for pos in positions)] = values[
+            :, found
+        ]
+        blocks[np.isnan(blocks)] = 1  # Factor 1 means no effect
+        return blocks
+
+    def broadcast(self, block: np.ndarray) -> np.ndarray:
+        """
+        Broadcasts a factor block onto the full grid.
+
+        Args:
+            block: block as returned by `block`.
+
+        Returns:
+            flat array with one value per row of the time series.
+        """
+        return np.broadcast_to(block, self.shape).reshape(-1)
+
+
+def _factor_freq(dates: DatetimeIndex) -> str:
+    """
+    Frequency of `dates` when it is shorter than a day, otherwise "D". Coarser frequencies are generated daily, so that
+    factors also cover dates that are not aligned to the frequency.
+    """
+    freq: Optional[str] = dates.freqstr
+    if freq is None and len(dates) >= 3:
+        freq = infer_freq(dates)
+    if freq is None:
+        return "D"
+    offset = to_offset(freq)
+    if isinstance(offset, Tick) and Timedelta(offset) < Timedelta(days=1):
+        return freq
+    return "D"
+
+
+def _code_dtype(n_values: int) -> np.dtype:
+    """
+    Smallest signed integer dtype that holds the codes of a categorical with `n_values` categories.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
@@ -1,16 +1,105 @@
+import importlib
 import pkgutil
-from datetime import date, datetime
+from datetime import date
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple, Union
 
 import workalendar
-from pandas import DataFrame, Series, date_range, concat, isnull
+from workalendar.core import Calendar
+from numpy import array, column_stack, empty, ndarray, repeat, tile
+from pandas import DataFrame, DatetimeIndex, date_range
+from pandas.tseries.frequencies import to_offset
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator.external_factors.external_factor import BaseFactor
+from timeseries_generator.holiday_store import HolidayStore, get_default_store
 
 WORKALENDAR_CONTINENTS = ["africa", "america", "asia", "europe", "oceania", "usa"]
 
 
+@lru_cache(maxsize=None)
+def get_country_calendars() -> Dict[str, type]:
+    """
+    Calendar classes of the countries in the registry of workalendar, by lower case ISO code, class name and calendar
+    name, e.g. "nl", "unitedkingdom" and "united kingdom". Built once per process, on first use.
+    """
+    try:
+        from workalendar.registry import registry
+    except ImportError:  # workalendar versions without a registry
+        return {}
+
+    calendars: Dict[str, type] = {}
+    for code, calendar_class in registry.get_calendars().items():
+        names = (code, calendar_class.__name__, getattr(calendar_class, "name", None))
+        for name in names:
+            if name:
+                calendars.setdefault(name.lower(), calendar_class)
+    return calendars
+
+
+@lru_cache(maxsize=None)
+def _get_workalendar_modules() -> Tuple[str, ...]:
+    """
+    Names of the country modules of workalendar, found by walking the package once per process.
+    """
+    return tuple(
+        modname
+        for importer, modname, ispkg in pkgutil.walk_packages(
+            workalendar.__path__, prefix=f"{workalendar.__name__}."
+        )
+        if not ispkg and modname.count(".") == 2
+    )
+
+
+@lru_cache(maxsize=None)
+def get_calendar_class(country_name: str) -> type:
+    """
+    Workalendar calendar class of a country, by ISO code, class name or calendar name, case insensitive. Calendars that
+    are not in the registry are looked up by class name in the country module that contains the lower case name.
+
+    Raises:
+        ValueError: when the country is not recognized.
+    """
+    calendar_class: Optional[type] = get_country_calendars().get(country_name.lower())
+    if calendar_class is not None:
+        return calendar_class
+
+    workalendar_country_modules: Tuple[str, ...] = _get_workalendar_modules()
+    workalendar_country_module: List[str] = [
+        modname
+        for modname in workalendar_country_modules
+        if country_name.lower() in modname  # module names are lowercase
+    ]
+    if len(workalendar_country_module) != 1:
+        raise ValueError(
+            f'country_name: "{country_name}" not recognized in workalendar modules:'
+            f"{list(workalendar_country_modules)}"
+        )
+    # Dynamically import the right class
+    module = importlib.import_module(workalendar_country_module[0])
+    if not hasattr(module, country_name):
+        raise ValueError(
+            f'country_name: "{country_name}" not recognized in {module.__name__}'
+        )
+    return getattr(module, country_name)
+
+
+@lru_cache(maxsize=None)
+def _get_calendar_instance(calendar_class: type) -> Calendar:
+    return calendar_class()
+
+
+def get_calendar(country_name: str) -> Calendar:
+    """
+    Workalendar calendar of a country, see `get_calendar_class`. Every calendar class is instantiated once per process
+    and shared by all factors, so that the holidays a calendar computed per year are reused.
+
+    Raises:
+        ValueError: when the country is not recognized.
+    """
+    return _get_calendar_instance(get_calendar_class(country_name))
+
+
 class HolidayFactor(BaseFactor):
     def __init__(
         self,
@@ -19,6 +108,7 @@ class HolidayFactor(BaseFactor):
         special_holiday_factors: Optional[Dict[str, float]] = None,
         country_feature_name: Optional[str] = None,
         country_list: Optional[List[str]] = None,
+        holiday_store: Optional[HolidayStore] = None,
     ):
 
         """
@@ -42,7 +132,9 @@ class HolidayFactor(BaseFactor):
             special_holiday_factors: a dictionary countaining the holidays (keys) and altered factors from the
                 `holiday_factor` (values).
             country_feature_name: name of the country feature introduced here.
-            country_list: list of countries included in the feature.
+            country_list: list of countries included in the feature, by name or ISO code.
+            holiday_store: store of the holidays per country and day, defaults to the store in the default cache
+                directory. The holidays of a year are computed with workalendar once and loaded from the store after.
         """
         if special_holiday_factors is None:
             special_holiday_factors = {}
@@ -55,6 +147,7 @@ class HolidayFactor(BaseFactor):
 
         self._holiday_factor = holiday_factor
         self._special_holiday_factors = special_holiday_factors
+        self._holiday_store = holiday_store
 
         super().__init__(
             features={country_feature_name: country_list}, col_name=col_name
@@ -76,128 +169,75 @@ class HolidayFactor(BaseFactor):
     def special_holiday_factors(self, factors: Dict[str, float]):
         self._special_holiday_factors = factors
 
+    @property
+    def holiday_store(self) -> HolidayStore:
+        if self._holiday_store is None:
+            return get_default_store()
+        return self._holiday_store
+
+    @holiday_store.setter
+    def holiday_store(self, holiday_store: HolidayStore):
+        self._holiday_store = holiday_store
+
     def generate(
         self,
         start_date: Union[Timestamp, str, int, float],
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
     ) -> DataFrame:
-        def clean_holiday_tuples(input_tuples: Tuple[datetime, str]):
-            """
-            The return value of holidays may have overlapping date, for example:
-            2016-05-05    Ascension Thursday
-            2016-05-05        Liberation Day
-
-            Then, we only keep the first holiday
-            """
-            visited = set()
-            output = []
-
-            for a, b in input_tuples:
-                if not a in visited:
-                    visited.add(a)
-                    output.append((a, b))
-
-            return output
-
-        def get_holiday_factor(holiday: Optional[str]):
-            """
-            get factor from holidays.
-            """
-            if isnull(holiday):
-                return 1
-
-            if holiday in self._special_holiday_factors:
-                return self._special_holiday_factors[holiday]
-
-            return self._holiday_factor
-
-        def get_country_holiday_df(country_name: str):
-            """
-            Get all holiday days by give country in MAX_HISTORY_YEARS
-            """
-            # get all workalendar modules
-            workalendar_country_modules: List[str] = [
-                modname
-                for importer, modname, ispkg in pkgutil.walk_packages(
-                    workalendar.__path__, prefix=f"{workalendar.__name__}."
-                )
-                if not ispkg and modname.count(".") == 2
-            ]
-            workalendar_country_module = list(
-                filter(
-                    lambda work_cal: country_name.lower()
-                    in work_cal,  # module names are lowercase
-                    workalendar_country_modules,
-                )
+        start_date = Timestamp(start_date)
+        if end_date is not None:
+            end_date = Timestamp(end_date)
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+
+        first_year: int = dates[0].year
+        last_year: int = dates[-1].year
+        days: DatetimeIndex = date_range(
+            start=date(first_year, 1, 1), end=date(last_year, 12, 31), freq="D"
+        )
+        countries: List = self._features[iter(self._features).__next__()]
+
+        # look up the factor of the holiday id of every day, id 0 is no holiday
+        factors: ndarray = empty((len(days), len(countries)))
+        for column, country_name in enumerate(countries):
+            ids, names = self.holiday_store.get_holidays(
+                get_calendar(country_name), first_year, last_year
             )
-            if len(workalendar_country_module) != 1:
-                raise ValueError(
-                    f'country_name: "{country_name}" not recognized in workalendar modules:'
-                    f"{workalendar_country_modules}"
-                )
-            # Dynamically import the right class
-            module_parts = workalendar_country_module[0].split(".")
-            cal = getattr(
-                getattr(getattr(workalendar, module_parts[1]), module_parts[2]),
-                country_name,
-            )()
-
-            df = DataFrame()
-            for year in range(
-                start_date.year, end_date.year + 1
-            ):  # plus one to include the end_date year itself
-                holidays_tuples = clean_holiday_tuples(cal.holidays(int(year)))
-
-                # TODO: make this more efficient, loop over tuple once
-                datetime_l = [elem[0] for elem in holidays_tuples]
-                holiday_l = [elem[1] for elem in holidays_tuples]
-
-                # create series and fill NA for non-holiday date
-                holiday_series = Series(holiday_l, index=datetime_l)
-
-                # set full year index datetime
-                ix = date_range(
-                    start=date(int(year), 1, 1), end=date(int(year), 12, 31), freq="D"
-                )
-                holiday_series = holiday_series.reindex(ix)
-
-                country_holiday_df = holiday_series.to_frame()
-
-                # add country column
-                country_holiday_df["country"] = country_name
-
-                country_holiday_df = country_holiday_df.reset_index()
-                country_holiday_df.columns = [self._date_col_name, "holiday", "country"]
-
-                # get factor
-                country_holiday_df[self._col_name] = country_holiday_df[
-                    "holiday"
-                ].apply(get_holiday_factor)
-
-                df = concat([df, country_holiday_df], ignore_index=True)
-
-
-            # Apply smoothing to the curve using a gaussian moving window
-            df[self._col_name] = (
-                df[self._col_name]
-                .rolling(10, win_type="gaussian", min_periods=1)
-                .mean(std=2)
+            holiday_factors: ndarray = array(
+                [1.0]
+                + [
+                    self._special_holiday_factors.get(name, self._holiday_factor)
+                    for name in names
+                ]
             )
+            factors[:, column] = holiday_factors[ids]
+
+        # Apply smoothing to the curve of every country using a gaussian moving window
+        factors = (
+            DataFrame(factors)
+            .rolling(10, win_type="gaussian", min_periods=1)
+            .mean(std=2)
+            .to_numpy()
+        )
 
-            return df
-
-        holiday_df = concat(
-            map(get_country_holiday_df, self._features[iter(self._features).__next__()])
+        if to_offset(self._freq) != to_offset("D"):
+            # broadcast the daily factors onto the dates of the frequency
+            factors = column_stack(
+                [
+                    self.lookup_daily(dates, days, factors[:, i])
+                    for i in range(len(countries))
+                ]
+            )
+            days = dates
+
+        # select the dates from the start date up to, but not including, the end date
+        start: int = days.searchsorted(start_date)
+        stop: int = len(days) if end_date is None else days.searchsorted(end_date)
+        return DataFrame(
+            {
+                self._date_col_name: tile(days[start:stop], len(countries)),
+                "country": repeat(array(countries, dtype=object), stop - start),
+                self._col_name: factors[start:stop].T.reshape(-1),
+            }
         )
-        holiday_df = holiday_df.drop(axis=1, columns="holiday")
-
-        if end_date is None:
-            df_sel = holiday_df[(holiday_df[self._date_col_name] >= start_date)]
-        else:
-            df_sel = holiday_df[
-                (holiday_df[self._date_col_name] >= start_date)
-                & (holiday_df[self._date_col_name] < end_date)
-            ]
-
-            # reindex to rangelist
-        return df_sel.reset_index().drop(axis=1, columns="index")
@@ -0,0 +1,189 @@
+import os
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import workalendar
+from workalendar.core import Calendar
+
+CACHE_DIR_ENV = "TIMESERIES_GENERATOR_CACHE_DIR"
+HOLIDAYS_FILE = "holidays.npz"
+
+# day numbers are counted from 1970-01-01, like datetime64[D]
+_EPOCH: date = date(1970, 1, 1)
+
+# first year, holiday id per day and holiday names of a calendar
+Entry = Tuple[int, np.ndarray, List[str]]
+
+
+class HolidayStore:
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Holidays of workalendar calendars, stored per calendar as an array with the holiday id of every day and the
+        list of holiday names. Id 0 means no holiday, id i the i-th name. The years of a calendar are computed once,
+        on first use, and saved to a cache directory, so that later processes load them instead of asking workalendar
+        again. A calendar covers a contiguous range of years that grows when earlier or later years are requested.
+
+        The stored holidays only depend on workalendar, not on the factors of a :obj:`HolidayFactor`: the files are
+        kept per workalendar version and calendar class.
+
+        Args:
+            path: cache directory. Defaults to `holidays` in the directory of the `TIMESERIES_GENERATOR_CACHE_DIR`
+                environment variable, or to `timeseries_generator/holidays` in the user cache directory
+                (`XDG_CACHE_HOME` or `~/.cache`).
+
+        Examples:
+            Holiday ids of the Netherlands in the 2010s:
+            >>> ids, names = HolidayStore().get_holidays(get_calendar("NL"), 2010, 2019)
+        """
+        if path is None:
+            path = _default_path()
+        self._path = Path(path)
+        self._entries: Dict[str, Entry] = {}
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __reduce__(self):
+        # only the directory is pickled, which keeps cache keys of factors stable and pickles to workers small
+        return HolidayStore, (self._path,)
+
+    def get_holidays(
+        self, calendar: Calendar, first_year: int, last_year: int
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Holiday ids of every day from January 1st of `first_year` to December 31st of `last_year`, and the names of
+        the ids. When several holidays fall on the same day, the first one is kept.
+
+        Args:
+            calendar: workalendar calendar.
+            first_year: first year of the days.
+            last_year: last year of the days, inclusive.
+
+        Returns:
+            array of int16 holiday ids, one per day, and the list of holiday names, id i being the name at position
+            i - 1. The array is a view on the store and must not be modified.
+        """
+        key: str = _calendar_key(calendar)
+        entry: Optional[Entry] = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+        if entry is None or entry[0] > first_year or _last_year(entry) < last_year:
+            entry = self._fill(key, calendar, entry, first_year, last_year)
+
+        start_year, ids, names = entry
+        offset: int = _year_start(start_year)
+        return (
+            ids[_year_start(first_year) - offset : _year_start(last_year + 1) - offset],
+            names,
+        )
+
+    def _load(self, key: str) -> Optional[Entry]:
+        try:
+            with np.load(self._path / key / HOLIDAYS_FILE) as f:
+                entry: Entry = (int(f["first_year"]), f["ids"], f["names"].tolist())
+        except (OSError, ValueError, KeyError):
+            return None
+        self._entries[key] = entry
+        return entry
+
+    def _fill(
+        self,
+        key: str,
+        calendar: Calendar,
+        entry: Optional[Entry],
+        first_year: int,
+        last_year: int,
+    ) -> Entry:
+        """
+        Extends the years of a calendar to `first_year` up to `last_year`, and saves them.
+        """
+        names: List[str] = []
+        if entry is not None:
+            first_year = min(first_year, entry[0])
+            last_year = max(last_year, _last_year(entry))
+            names = entry[2]
+        name_ids: Dict[str, int] = {name: i + 1 for i, name in enumerate(names)}
+
+        first_day: int = _year_start(first_year)
+        ids: np.ndarray = np.zeros(
+            _year_start(last_year + 1) - first_day, dtype=np.int16
+        )
+        if entry is not None:
+            start: int = _year_start(entry[0]) - first_day
+            ids[start : start + len(entry[1])] = entry[1]
+
+        for year in range(first_year, last_year + 1):
+            if entry is not None and entry[0] <= year <= _last_year(entry):
+                continue
+            year_start: int = _year_start(year) - first_day
+            year_stop: int = _year_start(year + 1) - first_day
+            for day, name in calendar.holidays(year):
+                position: int = day.toordinal() - _EPOCH.toordinal() - first_day
+                # keep the first holiday of a day, and only the days of the year
+                if year_start <= position < year_stop and ids[position] == 0:
+                    ids[position] = name_ids.setdefault(name, len(name_ids) + 1)
+
+        entry = (first_year, ids, list(name_ids))
+        self._entries[key] = entry
+        self._save(key, entry)
+        return entry
+
+    def _save(self, key: str, entry: Entry):
+        """
+        Writes the holidays of a calendar to the cache directory. The file is written under a temporary name and
+        renamed, so that concurrent processes read either the old or the new holidays. Without a writable cache
+        directory the holidays are only kept in memory.
+        """
+        directory: Path = self._path / key
+        temporary: Path = directory / f"{HOLIDAYS_FILE}.{os.getpid()}.tmp"
+        first_year, ids, names = entry
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(temporary, "wb") as f:
+                np.savez(
+                    f, first_year=first_year, ids=ids, names=np.array(names, dtype=str)
+                )
+            os.replace(temporary, directory / HOLIDAYS_FILE)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_default_store() -> HolidayStore:
+    """
+    Holiday store in the default cache directory, shared by all holiday factors of the process.
+    """
+    return HolidayStore()
+
+
+def _default_path() -> Path:
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV]) / "holidays"
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "timeseries_generator" / "holidays"
+
+
+def _calendar_key(calendar: Calendar) -> str:
+    calendar_class = type(calendar)
+    return os.path.join(
+        f"workalendar-{getattr(workalendar, '__version__', 'unknown')}",
+        f"{calendar_class.__module__}.{calendar_class.__qualname__}",
+    )
+
+
+def _year_start(year: int) -> int:
+    """
+    Day number of January 1st of a year.
+    """
+    return (date(year, 1, 1) - _EPOCH).days
+
+
+def _last_year(entry: Entry) -> int:
+    first_year, ids, _ = entry
+    return date.fromordinal(
+        _EPOCH.toordinal() + _year_start(first_year) + len(ids) - 1
+    ).year
@@ -0,0 +1,131 @@
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, Index, Timestamp
+
+
+class LazyGenerator:
+    def __init__(
+        self,
+        generator: "Generator",
+        columns: Optional[List[str]] = None,
+        filters: Tuple[Tuple[str, Any], ...] = (),
+    ):
+        """
+        Query plan on the time series of a generator, created with `Generator.lazy`. `select` and `filter` return a new
+        plan; the time series is generated by `collect`, for the selected columns and the rows that pass all filters
+        only. Filters on the date and the features are pushed down into the generation: factors that apply to all
+        features are only generated for the remaining rows, the other factors are sliced before they are broadcast,
+        and factor columns that are not selected are never materialized.
+
+        Args:
+            generator: generator of the time series.
+            columns: selected columns, defaults to the columns of `Generator.generate`.
+            filters: column names and conditions that the rows must meet.
+        """
+        self._generator = generator
+        self._columns = columns
+        self._filters = filters
+
+    @property
+    def columns(self) -> Optional[List[str]]:
+        return self._columns
+
+    @property
+    def filters(self) -> Tuple[Tuple[str, Any], ...]:
+        return self._filters
+
+    def select(self, *columns: str) -> "LazyGenerator":
+        """
+        Selects the columns of the result, in the given order.
+
+        Examples:
+            >>> generator.lazy().select("date", "country", "value")
+        """
+        return LazyGenerator(self._generator, list(columns), self._filters)
+
+    def filter(self, **conditions: Any) -> "LazyGenerator":
+        """
+        Keeps the rows that meet all conditions, and the conditions of earlier filters.
+
+        Args:
+            conditions: condition per column, on `date` or on a feature. A condition is a single value, a list of
+                values or, for the date, a slice of dates with inclusive bounds; `slice(start, None)` keeps all dates
+                from `start`.
+
+        Examples:
+            Italian and Dutch series from March 2020:
+            >>> generator.lazy().filter(country=["Italy", "Netherlands"], date=slice("03-01-2020", None))
+
+        Raises:
+            ValueError: when a condition is not on the date or on a feature.
+        """
+        allowed: List[str] = ["date"] + list(self._generator.features)
+        unknown: List[str] = [name for name in conditions if name not in allowed]
+        if unknown:
+            raise ValueError(f"filter: {unknown} should be one of {allowed}")
+        return LazyGenerator(
+            self._generator,
+            self._columns,
+            self._filters + tuple(conditions.items()),
+        )
+
+    def collect(self) -> DataFrame:
+        """
+        Generates the selected columns for the rows that pass the filters. The result is not stored in the `ts` of
+        the generator.
+
+        Returns:
+            DataFrame with the selected columns, in the row order of `Generator.generate`.
+        """
+        dates = DatetimeIndex(self._generator.date_range)
+        date_mask: np.ndarray = np.ones(len(dates), dtype=bool)
+        feature_masks = {
+            name: np.ones(len(values), dtype=bool)
+            for name, values in self._generator.features.items()
+        }
+        for name, condition in self._filters:
+            if name == "date":
+                date_mask &= _date_mask(dates, condition)
+            else:
+                values = Index(self._generator.features[name])
+                feature_masks[name] &= values.isin(_as_list(condition))
+
+        return self._generator._generate_subgrid(
+            np.flatnonzero(date_mask),
+            [np.flatnonzero(mask) for mask in feature_masks.values()],
+            self._columns,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(columns={self._columns!r}, "
+            f"filters={list(self._filters)!r})"
+        )
+
+
+def _as_list(condition: Any) -> List[Any]:
+    if isinstance(condition, (list, tuple, set, np.ndarray, Index)):
+        return list(condition)
+    return [condition]
+
+
+def _timestamp(value: Any, dates: DatetimeIndex) -> Timestamp:
+    """
+    `value` as a timestamp that compares with `dates`, in their time zone.
+    """
+    timestamp = Timestamp(value)
+    if dates.tz is not None and timestamp.tz is None:
+        return timestamp.tz_localize(dates.tz)
+    return timestamp
+
+
+def _date_mask(dates: DatetimeIndex, condition: Any) -> np.ndarray:
+    if isinstance(condition, slice):
+        mask = np.ones(len(dates), dtype=bool)
+        if condition.start is not None:
+            mask &= dates >= _timestamp(condition.start, dates)
+        if condition.stop is not None:
+            mask &= dates <= _timestamp(condition.stop, dates)
+        return mask
+    return dates.isin([_timestamp(value, dates) for value in _as_list(condition)])
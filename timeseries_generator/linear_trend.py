@@ -1,7 +1,7 @@
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, Sequence, Tuple, Union
 
-from numpy.ma import arange
-from pandas import DataFrame
+from numpy import array, broadcast_to, ndarray, newaxis
+from pandas import DataFrame, DatetimeIndex
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator.base_factor import BaseFactor
@@ -118,46 +118,69 @@ class LinearTrend(BaseFactor):
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
     ) -> DataFrame:
 
-        dr: DataFrame = self.get_datetime_index(
-            start_date=start_date, end_date=end_date
-        ).to_frame(index=False, name=self._date_col_name)
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        dr: DataFrame = dates.to_frame(index=False, name=self._date_col_name)
 
-        start_date_ts: Timestamp = dr.iloc[0][self._date_col_name]
+        # time in days since the start date, also for sub-daily frequencies
+        days: ndarray = self.get_elapsed_days(dates)
+        period_days: float = self.get_period_days(dates)
 
         if self._feature_values:
-
-            def get_factor_col(row) -> float:
-                days: float = float(
-                    getattr(row[self._date_col_name] - start_date_ts, "days")
-                )  # Only working in days
-                # y = ax + b
-                # the coef is the total slope across the whole time period
-                # in order to calculate the daily delta, we need to divide the length of the date
-                return row["coef"] / len(dr) * days + 1 + row["offset"]
-
             df: DataFrame = DataFrame(
-                {
-                    self._feature: self._feature_values.keys(),
-                    "coef": map(
-                        lambda feat: feat["coef"], self._feature_values.values()
-                    ),
-                    "offset": map(
-                        lambda feat: feat["offset"], self._feature_values.values()
-                    ),
-                }
+                {self._feature: list(self._feature_values.keys())}
+            )
+            coef: ndarray = array(
+                [feat["coef"] for feat in self._feature_values.values()]
+            )
+            offset: ndarray = array(
+                [feat["offset"] for feat in self._feature_values.values()]
             )
 
+            # y = ax + b, for all dates (rows) and feature values (columns) at once
+            # the coef is the total slope across the whole time period
+            # in order to calculate the daily delta, we need to divide by the length of the period in days
+            factors: ndarray = coef / period_days * days[:, newaxis] + 1 + offset
+
             factor_df: DataFrame = get_cartesian_product(dr, df)
-            factor_df[self._col_name] = factor_df.apply(get_factor_col, axis=1)
-            factor_df = factor_df.drop(["coef", "offset"], axis=1)
+            factor_df[self._col_name] = factors.reshape(-1)
 
         else:
             # y = ax + b
             df: DataFrame = DataFrame(
-                (self._coef / len(dr) * arange(start=0, stop=len(dr)) + 1)
-                + self._offset,
+                (self._coef / period_days * days + 1) + self._offset,
                 columns=[self._col_name],
             )
             factor_df: DataFrame = dr.join(df)
 
         return factor_df
+
+    def generate_sweep(
+        self,
+        start_date: Optional[Union[Timestamp, str, int, float]],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+        **parameters: Sequence[float],
+    ) -> Tuple[DataFrame, ndarray]:
+        """
+        Generates the trend for every combination of the swept values of `coef` and `offset`.
+
+        Raises:
+            ValueError: when feature_values is set, or when another parameter is swept.
+        """
+        if self._feature_values:
+            raise ValueError("Cannot sweep coef or offset when feature_values is set.")
+        axes = self.get_sweep_axes(
+            parameters, {"coef": self._coef, "offset": self._offset}
+        )
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        days: ndarray = self.get_elapsed_days(dates)
+        period_days: float = self.get_period_days(dates)
+        values: ndarray = (axes["coef"] / period_days * days + 1) + axes["offset"]
+        shape = tuple(len(values) for values in parameters.values()) + (len(dates),)
+        return (
+            dates.to_frame(index=False, name=self._date_col_name),
+            broadcast_to(values, shape),
+        )
@@ -0,0 +1,159 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from pandas import DataFrame, DatetimeIndex, Index, MultiIndex
+
+from timeseries_generator.grid import FeatureGrid
+
+AXES_FILE = "axes.json"
+
+
+class MemmapPanel:
+    def __init__(self, path: Union[str, Path], mode: str = "r"):
+        """
+        Time series written by `Generator.write_memmap`, as memory-mapped date x series matrices. Opening the panel
+        only reads the sidecar file with the axes; the matrices are mapped from disk and only the parts that are
+        accessed are read.
+
+        Args:
+            path: directory of the dataset.
+            mode: mode of the memory maps, "r" for read-only or "r+" to modify the matrices in place.
+
+        Raises:
+            FileNotFoundError: when the directory holds no complete dataset.
+
+        Examples:
+            Value of all series on the first date:
+            >>> MemmapPanel("panel").value[0]
+        """
+        self._path = Path(path)
+        with open(self._path / AXES_FILE) as f:
+            axes = json.load(f)
+        self._dates = DatetimeIndex(np.array(axes["dates"], dtype="datetime64[ns]"))
+        if axes["tz"] is not None:
+            self._dates = self._dates.tz_localize("UTC").tz_convert(axes["tz"])
+        self._features: Dict[str, List] = axes["features"]
+        self._base_value: float = axes["base_value"]
+        self._matrices: Dict[str, np.memmap] = {
+            col_name: np.load(self._path / f"{col_name}.npy", mmap_mode=mode)
+            for col_name in axes["columns"]
+        }
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def dates(self) -> DatetimeIndex:
+        return self._dates
+
+    @property
+    def features(self) -> Dict[str, List]:
+        return self._features
+
+    @property
+    def base_value(self) -> float:
+        return self._base_value
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._matrices)
+
+    @property
+    def series(self) -> Index:
+        """
+        Feature combinations of the columns of the matrices.
+        """
+        if not self._features:
+            return Index([0])
+        return MultiIndex.from_product(
+            list(self._features.values()), names=list(self._features)
+        )
+
+    @property
+    def value(self) -> np.memmap:
+        return self._matrices["value"]
+
+    def __getitem__(self, col_name: str) -> np.memmap:
+        return self._matrices[col_name]
+
+    def to_frame(
+        self, dates: slice = slice(None), columns: Optional[Sequence[str]] = None
+    ) -> DataFrame:
+        """
+        Reads a window of dates into a DataFrame in the long format of `Generator.generate`.
+
+        Args:
+            dates: positions of the dates to read.
+            columns: columns to read, defaults to all columns.
+
+        Returns:
+            DataFrame with the date and feature columns and the selected columns.
+        """
+        if columns is None:
+            columns = self.columns
+        grid = FeatureGrid(self._dates[dates], self._features)
+        df: DataFrame = grid.to_frame()
+        for col_name in columns:
+            df[col_name] = np.asarray(self._matrices[col_name][dates]).reshape(-1)
+        return df
+
+    @staticmethod
+    def allocate(
+        path: Union[str, Path],
+        grid: FeatureGrid,
+        columns: Sequence[str],
+        dtype: np.dtype,
+    ):
+        """
+        Creates one date x series `.npy` file per column. The files are sparse until they are written. A sidecar file
+        that was left from an earlier dataset is removed, so that a partially written dataset cannot be opened.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        if (path / AXES_FILE).exists():
+            os.remove(path / AXES_FILE)
+        shape = (grid.shape[0], int(np.prod(grid.shape[1:])))
+        for col_name in columns:
+            open_memmap(path / f"{col_name}.npy", mode="w+", dtype=dtype, shape=shape)
+
+    @staticmethod
+    def write(
+        path: Union[str, Path],
+        col_name: str,
+        dates: slice,
+        series: slice,
+        values: np.ndarray,
+    ):
+        """
+        Writes a rectangle of dates x series into the matrix of `col_name` and flushes it. The file is mapped for this
+        write only, so that the written pages do not stay resident in memory.
+        """
+        matrix: np.memmap = np.load(Path(path) / f"{col_name}.npy", mmap_mode="r+")
+        matrix[dates, series] = values
+        matrix.flush()
+        del matrix
+
+    @staticmethod
+    def write_axes(
+        path: Union[str, Path],
+        grid: FeatureGrid,
+        columns: Sequence[str],
+        base_value: float,
+    ):
+        """
+        Writes the sidecar file with the dates, the feature values and the columns of the dataset.
+        """
+        axes = {
+            "dates": grid.dates.asi8.tolist(),
+            "tz": None if grid.dates.tz is None else str(grid.dates.tz),
+            "features": grid.features,
+            "columns": list(columns),
+            "base_value": base_value,
+        }
+        with open(Path(path) / AXES_FILE, "w") as f:
+            json.dump(axes, f)
@@ -0,0 +1,167 @@
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, List, NamedTuple, Optional, TextIO
+
+import numpy as np
+from pandas import DataFrame
+
+from timeseries_generator.grid import FeatureGrid
+
+
+class ProfileEvent(NamedTuple):
+    """
+    One step of a generation.
+
+    Attributes:
+        stage: kind of step: "grid", "generate", "block", "merge", "broadcast", "product", "partitions" or "output".
+        name: column name of the factor of the step, or an empty string.
+        seconds: wall time of the step.
+        rows_in: number of rows the step started from.
+        rows_out: number of rows (or values, for arrays) the step produced.
+        n_bytes: size of the output of the step.
+        peak_bytes: peak memory allocated during the step, when `tracemalloc` is tracing, otherwise None.
+    """
+
+    stage: str
+    name: str
+    seconds: float
+    rows_in: int
+    rows_out: int
+    n_bytes: int
+    peak_bytes: Optional[int]
+
+
+Profiler = Callable[[ProfileEvent], None]
+
+
+def measure(
+    profiler: Optional[Profiler], stage: str, name: str = "", rows_in: int = 0
+) -> "_Measurement":
+    """
+    Context manager that times a step and sends a :obj:`ProfileEvent` to `profiler`. Assign the result of the step to
+    `output` to report its number of rows and size. Without a profiler nothing is measured.
+
+    Examples:
+        >>> with measure(profiler, "generate", f.col_name) as step:
+        ...     step.output = f.generate(start_date, end_date)
+    """
+    return _Measurement(profiler, stage, name, rows_in)
+
+
+class _Measurement:
+    __slots__ = ("profiler", "stage", "name", "rows_in", "output", "_start")
+
+    def __init__(
+        self, profiler: Optional[Profiler], stage: str, name: str, rows_in: int
+    ):
+        self.profiler = profiler
+        self.stage = stage
+        self.name = name
+        self.rows_in = rows_in
+        self.output = None
+        self._start = 0.0
+
+    def __enter__(self) -> "_Measurement":
+        if self.profiler is not None:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.profiler is None or exc_type is not None:
+            return
+        seconds = perf_counter() - self._start
+        peak_bytes = (
+            tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        )
+        self.profiler(
+            ProfileEvent(
+                stage=self.stage,
+                name=self.name,
+                seconds=seconds,
+                rows_in=self.rows_in,
+                rows_out=_n_rows(self.output),
+                n_bytes=_n_bytes(self.output),
+                peak_bytes=peak_bytes,
+            )
+        )
+
+
+def _n_rows(output: Any) -> int:
+    if isinstance(output, FeatureGrid):
+        return output.size
+    if isinstance(output, np.ndarray):
+        return output.size
+    if output is None:
+        return 0
+    return len(output)
+
+
+def _n_bytes(output: Any) -> int:
+    if isinstance(output, DataFrame):
+        return int(output.memory_usage(index=False).sum())
+    if isinstance(output, np.ndarray):
+        return output.nbytes
+    if hasattr(output, "nbytes"):  # e.g. Arrow tables and record batches
+        return int(output.nbytes)
+    return 0
+
+
+class ProfileCollector:
+    def __init__(self):
+        """
+        Profiler that collects the events of generations and summarizes them per step.
+
+        Examples:
+            >>> profiler = ProfileCollector()
+            ... Generator(factors={WeekdayFactor()}, date_range=date_range("01-01-2020", "12-31-2020"),
+            ...           profiler=profiler).generate()
+            ... profiler.print_summary()
+        """
+        self._events: List[ProfileEvent] = []
+
+    @property
+    def events(self) -> List[ProfileEvent]:
+        return self._events
+
+    def __call__(self, event: ProfileEvent):
+        self._events.append(event)
+
+    def clear(self):
+        self._events.clear()
+
+    def summary(self) -> DataFrame:
+        """
+        Calls, total wall time, share of the wall time, rows and bytes per stage and factor, in the order in which the
+        steps first ran.
+        """
+        columns = list(ProfileEvent._fields)
+        df = DataFrame(self._events, columns=columns)
+        summary = df.groupby(["stage", "name"], sort=False).agg(
+            calls=("seconds", "size"),
+            seconds=("seconds", "sum"),
+            rows_in=("rows_in", "sum"),
+            rows_out=("rows_out", "sum"),
+            n_bytes=("n_bytes", "sum"),
+            peak_bytes=("peak_bytes", "max"),
+        )
+        summary.insert(2, "share", summary["seconds"] / summary["seconds"].sum())
+        return summary
+
+    def print_summary(self, file: Optional[TextIO] = None):
+        """
+        Prints the summary as a table.
+        """
+        summary = self.summary()
+        print(
+            summary.to_string(
+                formatters={
+                    "seconds": "{:.4f}".format,
+                    "share": "{:.1%}".format,
+                },
+                na_rep="",
+            ),
+            file=sys.stdout if file is None else file,
+        )
@@ -1,10 +1,11 @@
-from typing import List, Any, Optional, Union
+from typing import List, Any, Optional, Tuple, Union
 
 import numpy as np
-from pandas import DataFrame
+from pandas import DataFrame, Index
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator import BaseFactor
+from timeseries_generator.counter_rng import series_keys, stable_hash, uniform
 from timeseries_generator.utils import get_cartesian_product
 
 
@@ -16,6 +17,7 @@ class RandomFeatureFactor(BaseFactor):
         min_factor_value: float = 1.0,
         max_factor_value: float = 10.0,
         col_name: str = "random_feature_factor",
+        seed: Optional[int] = None,
     ):
         """
         Creates a random factor for every feature value.
@@ -26,6 +28,9 @@ class RandomFeatureFactor(BaseFactor):
             min_factor_value: minimum factor value.
             max_factor_value: maximum factor value.
             col_name:
+            seed: seed of the factors. The factor of a feature value is a counter-based random number keyed by the
+                seed, the column name and the feature value, so it does not depend on the other feature values.
+                Defaults to a seed drawn from the global numpy random state.
 
         Examples:
             Create a factor for every store in our store list: "store_1", "store_2"
@@ -46,6 +51,50 @@ class RandomFeatureFactor(BaseFactor):
             )
         self._min_factor_value = min_factor_value
         self._max_factor_value = max_factor_value
+        if seed is None:
+            seed = int(np.random.randint(2**31 - 1))
+        self._seed = seed
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @seed.setter
+    def seed(self, seed: int):
+        self._seed = seed
+
+    @property
+    def stochastic(self) -> bool:
+        return True
+
+    def _factors(self, stream: np.ndarray = 0) -> np.ndarray:
+        """
+        Factor of every feature value, or one row of factors per stream for a column of streams.
+        """
+        # rand_value = min + ((max - min) * value)
+        keys = series_keys(
+            stable_hash(self._seed, self._col_name),
+            {self._feature: self._feature_values},
+        )
+        return self._min_factor_value + (
+            (self._max_factor_value - self._min_factor_value) * uniform(keys, 0, stream)
+        )
+
+    def generate_realizations(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+        n: int = 1,
+    ) -> Tuple[DataFrame, np.ndarray]:
+        """
+        Generates `n` realizations of the factors in one batch. Realization `i` is drawn from stream `i` of the
+        counter-based random numbers, so realization 0 equals the output of `generate`.
+        """
+        factor_df: DataFrame = self.generate(start_date=start_date, end_date=end_date)
+        positions: np.ndarray = Index(self._feature_values).get_indexer(
+            factor_df[self._feature]
+        )
+        return factor_df, self._factors(np.arange(n)[:, np.newaxis])[:, positions]
 
     def generate(
         self,
@@ -54,15 +103,11 @@ class RandomFeatureFactor(BaseFactor):
     ) -> DataFrame:
 
         dr: DataFrame = self.get_datetime_index(
-            start_date=start_date, end_date=end_date
+            start_date=start_date, end_date=end_date, freq=self._freq
         ).to_frame(index=False, name=self._date_col_name)
 
         # randomly generate factor
-        # rand_value = min + ((max - min) * value)
-        feat_factor = self._min_factor_value + (
-            (self._max_factor_value - self._min_factor_value)
-            * np.random.random(len(self._feature_values))
-        )
+        feat_factor = self._factors()
 
         # generate factor df
         factor_df = DataFrame(
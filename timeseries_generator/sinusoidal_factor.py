@@ -1,8 +1,8 @@
 from math import pi
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, Sequence, Tuple, Union
 
-from numpy import sin, arange
-from pandas import DataFrame
+from numpy import array, broadcast_to, ndarray, newaxis, sin
+from pandas import DataFrame, DatetimeIndex
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator.base_factor import BaseFactor
@@ -141,40 +141,32 @@ class SinusoidalFactor(BaseFactor):
         start_date: Union[Timestamp, str, int, float],
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
     ) -> DataFrame:
-        dr: DataFrame = self.get_datetime_index(
-            start_date=start_date, end_date=end_date
-        ).to_frame(index=False, name=self._date_col_name)
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        dr: DataFrame = dates.to_frame(index=False, name=self._date_col_name)
 
-        start_date_ts: Timestamp = dr.iloc[0][self._date_col_name]
+        # time in days since the start date, also for sub-daily frequencies
+        days: ndarray = self.get_elapsed_days(dates)
 
         if self._feature_values:
-
-            def get_factor_col(row) -> float:
-                t: float = float(
-                    getattr(row[self._date_col_name] - start_date_ts, "days")
-                )  # Only working in days
-                # y(t) A * sin(2 * pi * freq * t + phase) + mean
-                return (
-                    row["amplitude"]
-                    * sin(2 * pi * (t + row["phase"]) / row["wavelength"])
-                    + row["mean"]
-                )
-
             df: DataFrame = DataFrame(
-                dict(
-                    {self._feature: list(self._feature_values.keys())},
-                    **{
-                        var: list(
-                            map(lambda feat: feat[1][var], self._feature_values.items())
-                        )
-                        for var in VARIABLES
-                    },
+                {self._feature: list(self._feature_values.keys())}
+            )
+            wavelength, amplitude, phase, mean = (
+                array(
+                    [feat[var] for feat in self._feature_values.values()], dtype=float
                 )
+                for var in VARIABLES
+            )
+
+            # y(t) A * sin(2 * pi * freq * t + phase) + mean, for all dates (rows) and feature values (columns) at once
+            factors: ndarray = (
+                amplitude * sin(2 * pi * (days[:, newaxis] + phase) / wavelength) + mean
             )
 
             factor_df: DataFrame = get_cartesian_product(dr, df)
-            factor_df[self._col_name] = factor_df.apply(get_factor_col, axis=1)
-            factor_df = factor_df.drop(VARIABLES, axis=1)
+            factor_df[self._col_name] = factors.reshape(-1)
         else:
             # y(t) A * sin(2 * pi * freq * t + phase) + mean
             df: DataFrame = DataFrame(
@@ -182,7 +174,7 @@ class SinusoidalFactor(BaseFactor):
                 * sin(
                     2
                     * pi
-                    * (arange(start=0, stop=len(dr)) + self._phase)
+                    * (days + self._phase)
                     / self._wavelength
                 )
                 + self._mean,
@@ -191,3 +183,42 @@ class SinusoidalFactor(BaseFactor):
             factor_df: DataFrame = dr.join(df)
 
         return factor_df
+
+    def generate_sweep(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Optional[Union[Timestamp, str, int, float]] = None,
+        **parameters: Sequence[float],
+    ) -> Tuple[DataFrame, ndarray]:
+        """
+        Generates the factor for every combination of the swept values of the wavelength, amplitude, phase and mean.
+
+        Raises:
+            ValueError: when feature_values is set, or when another parameter is swept.
+        """
+        if self._feature_values:
+            raise ValueError(f"Cannot sweep {VARIABLES} when feature_values is set.")
+        axes = self.get_sweep_axes(
+            parameters,
+            {
+                "wavelength": self._wavelength,
+                "amplitude": self._amplitude,
+                "phase": self._phase,
+                "mean": self._mean,
+            },
+        )
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        days: ndarray = self.get_elapsed_days(dates)
+        # y(t) A * sin(2 * pi * freq * t + phase) + mean
+        values: ndarray = (
+            axes["amplitude"]
+            * sin(2 * pi * (days + axes["phase"]) / axes["wavelength"])
+            + axes["mean"]
+        )
+        shape = tuple(len(values) for values in parameters.values()) + (len(dates),)
+        return (
+            dates.to_frame(index=False, name=self._date_col_name),
+            broadcast_to(values, shape),
+        )
@@ -1,9 +1,11 @@
+from numpy import arange, tile
 from pandas import DataFrame
 
 
 def get_cartesian_product(df1: DataFrame, df2: DataFrame) -> DataFrame:
     """
-    Utility function that gets cartesian product of two dataframes.
+    Utility function that gets cartesian product of two dataframes. The rows of `df1` vary slowest, every row of `df1`
+    is followed by all rows of `df2`. The rows are taken by position, without a merge.
     Args:
         df1: first dataframe.
         df2: second dataframe.
@@ -12,5 +14,7 @@ def get_cartesian_product(df1: DataFrame, df2: DataFrame) -> DataFrame:
         DataFrame containing the cartesian product of both dataframes
 
     """
-    df = df1.assign(key=1).merge(df2.assign(key=1), on="key").drop("key", axis=1)
+    left: DataFrame = df1.take(arange(len(df1)).repeat(len(df2)))
+    right: DataFrame = df2.take(tile(arange(len(df2)), len(df1)))
+    df = left.reset_index(drop=True).join(right.reset_index(drop=True))
     return df
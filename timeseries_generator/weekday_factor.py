@@ -1,9 +1,11 @@
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, Sequence, Tuple, Union
 
-from pandas import DataFrame
+from numpy import broadcast_to, ndarray
+from pandas import DataFrame, DatetimeIndex
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator.base_factor import BaseFactor
+from timeseries_generator.calendar_factor import get_calendar_codes, get_calendar_table
 
 
 class WeekdayFactor(BaseFactor):
@@ -46,22 +48,33 @@ class WeekdayFactor(BaseFactor):
 
         super().__init__(col_name=col_name)
 
+    @property
+    def intensity_scale(self):
+        return self._intensity_scale
+
+    @intensity_scale.setter
+    def intensity_scale(self, intensity_scale: float):
+        self._intensity_scale = intensity_scale
+
+    def _weekday_factors(self) -> ndarray:
+        """
+        Factor of every day of the week, monday first, before the intensity scale is applied.
+        """
+        return get_calendar_table("weekday", self._factor_values)
+
     def generate(
         self,
         start_date: Union[Timestamp, str, int, float],
         end_date: Union[Timestamp, str, int, float] = None,
     ) -> DataFrame:
-        df: DataFrame = self.get_datetime_index(
-            start_date=start_date, end_date=end_date
-        ).to_frame(index=False, name=self._date_col_name)
-
-        df["weekday"] = df[self._date_col_name].dt.dayofweek
-        df[self._col_name] = df["weekday"].apply(
-            lambda day_number: self._factor_values.get(day_number, 1)
-            * self._intensity_scale
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
         )
+        df: DataFrame = dates.to_frame(index=False, name=self._date_col_name)
 
-        df = df.drop(axis=1, columns="weekday")
+        # look up the factor of the day of the week of every date, for any frequency
+        weekday_factors: ndarray = self._weekday_factors() * self._intensity_scale
+        df[self._col_name] = weekday_factors[get_calendar_codes(dates, "weekday")]
 
         if end_date is None:
             df_sel = df[(df[self._date_col_name] >= start_date)]
@@ -73,3 +86,26 @@ class WeekdayFactor(BaseFactor):
 
         # reindex to rangelist
         return df_sel.reset_index().drop(axis=1, columns="index")
+
+    def generate_sweep(
+        self,
+        start_date: Union[Timestamp, str, int, float],
+        end_date: Union[Timestamp, str, int, float] = None,
+        **parameters: Sequence[float],
+    ) -> Tuple[DataFrame, ndarray]:
+        """
+        Generates the factor for every swept value of `intensity_scale`.
+
+        Raises:
+            ValueError: when another parameter is swept.
+        """
+        axes = self.get_sweep_axes(
+            parameters, {"intensity_scale": self._intensity_scale}
+        )
+        df: DataFrame = self.generate(start_date=start_date, end_date=end_date)
+        weekday_factors: ndarray = self._weekday_factors()[
+            df[self._date_col_name].dt.dayofweek.to_numpy()
+        ]
+        values: ndarray = weekday_factors * axes["intensity_scale"]
+        shape = tuple(len(values) for values in parameters.values()) + (len(df),)
+        return df.drop(columns=self._col_name), broadcast_to(values, shape)
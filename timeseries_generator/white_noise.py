@@ -1,14 +1,20 @@
 import itertools
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple, Union
 
-from numpy.random.mtrand import randn
-from pandas import DataFrame
+from numpy import arange, array, empty, ndarray, newaxis, sqrt, zeros
+from numpy.random import randint
+from pandas import DataFrame, DatetimeIndex
 from pandas._libs.tslibs.timestamps import Timestamp
 
 from timeseries_generator.base_factor import BaseFactor
+from timeseries_generator.counter_rng import (
+    date_counters,
+    series_keys,
+    stable_hash,
+    standard_normal,
+)
 from timeseries_generator.utils import get_cartesian_product
 
-
 FeatureValues = Dict[str, Dict[str, float]]
 
 
@@ -18,6 +24,7 @@ class WhiteNoise(BaseFactor):
         stdev_factor: float = 0.05,
         feature_values: Optional[FeatureValues] = None,
         col_name: str = "white_noise",
+        seed: Optional[int] = None,
     ):
         """
         Add white noise to the timeseries. The noise component will have a bell-shaped distribution, based on the input
@@ -27,12 +34,18 @@ class WhiteNoise(BaseFactor):
             stdev_factor: standard deviation of the factor random noise component. Do not supply when specifying
                 feature_values
             feature_values: dictionary with the feature name as key and a dictionaty as value. This dictionaty contains
-                the feature values as keys and the stdev_factors as values.
+                the feature values as keys and the stdev_factors as values. With several features, the noise of a row
+                is the sum of independent noise per feature, so its standard deviation is the square root of the sum
+                of the squared stdev_factors of its feature values. Feature values that are not in the dictionary
+                add no noise.
             col_name: name of the factor column.
+            seed: seed of the noise. The noise of a row is a counter-based random number keyed by the seed, the column
+                name and the feature values of the row, with the date as counter. Generating any date range or subset
+                of feature values therefore returns exactly the values of the full range. Defaults to a seed drawn
+                from the global numpy random state.
 
         Raises:
-            AttributeError when stdev_factor and feature_values are set, or when more then one feature gets a unique
-            noise factor.
+            AttributeError when stdev_factor and feature_values are set, or when neither is set.
 
         Examples:
             This can either act on all features in the same way:
@@ -50,11 +63,9 @@ class WhiteNoise(BaseFactor):
         if (stdev_factor and feature_values) or not (stdev_factor or feature_values):
             raise AttributeError("Either set `stdev_factor` or `feature_values`")
         if feature_values:
-            if len(feature_values) > 1:
-                raise AttributeError(
-                    f"{self.__class__.__name__}, can only set feature values on one feature"
-                )
-            features = feature_values
+            features = {
+                feature: list(values) for feature, values in feature_values.items()
+            }
             apply_to_all = False
         else:
             features = None
@@ -65,6 +76,9 @@ class WhiteNoise(BaseFactor):
         )
         self._stdev_factor = stdev_factor
         self._feature_values = feature_values
+        if seed is None:
+            seed = int(randint(2**31 - 1))
+        self._seed = seed
 
     @property
     def stdev_factor(self):
@@ -80,47 +94,117 @@ class WhiteNoise(BaseFactor):
 
     @feature_values.setter
     def feature_values(self, feature_values: Optional[FeatureValues]):
-        if len(feature_values) > 1:
-            raise AttributeError(
-                f"{self.__class__.__name__}, can only set feature values on one feature"
-            )
         self._feature_values = feature_values
+        self._features = {
+            feature: list(values) for feature, values in feature_values.items()
+        }
 
-    def generate(self, start_date: Timestamp, end_date: Timestamp = None) -> DataFrame:
-        dr: DataFrame = self.get_datetime_index(
-            start_date=start_date, end_date=end_date
-        ).to_frame(index=False, name=self._date_col_name)
-
-        if self._features:
-            # Using self.features here gets all the features from the generator
-            df: DataFrame = DataFrame(
-                itertools.product(*self._features.values()),
-                columns=list(self._features.keys()),
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @seed.setter
+    def seed(self, seed: int):
+        self._seed = seed
+
+    @property
+    def stochastic(self) -> bool:
+        return True
+
+    def _series(self) -> DataFrame:
+        """
+        One row per combination of the feature values of the noise, in the row order of the generated DataFrame.
+        """
+        # Using self.features here gets all the features from the generator
+        return DataFrame(
+            itertools.product(*self._features.values()),
+            columns=list(self._features.keys()),
+        )
+
+    def _stdevs(self) -> Union[float, ndarray]:
+        """
+        Standard deviation of the noise of every feature combination. With several noise features, the noise of a row
+        is the sum of independent noise per feature, which has the standard deviation
+        sqrt(sum of the squared standard deviations); feature values without a standard deviation add no noise.
+        """
+        if not self._feature_values:
+            return self._stdev_factor
+        sizes: List[int] = [len(values) for values in self._features.values()]
+        stdevs: List[ndarray] = [
+            array(
+                [self._feature_values[feature].get(value, 0.0) for value in values],
+                dtype=float,
             )
-            factor_df = get_cartesian_product(dr, df)
-            if self._feature_values:
-                feature: str = iter(
-                    self._feature_values
-                ).__next__()  # len(self._features is always 1)
-                factor_df["noise_1"] = randn(len(factor_df))
-
-                def get_factor_col(row):
-                    stdev_factor: float = self._feature_values[feature][row[feature]]
-                    return stdev_factor * row["noise1"] + 1
-
-                factor_df[self._col_name] = factor_df.apply(
-                    get_factor_col, axis=1
-                ).drop("noise1", axis=1)
-            else:
-                factor_df[self._col_name] = (
-                    self._stdev_factor * randn(len(factor_df)) + 1
-                )
+            for feature, values in self._features.items()
+        ]
+        if len(stdevs) == 1:
+            return stdevs[0]
+        variance: ndarray = zeros(sizes)
+        for axis, feature_stdevs in enumerate(stdevs):
+            shape: List[int] = [1] * len(sizes)
+            shape[axis] = sizes[axis]
+            variance += (feature_stdevs**2).reshape(shape)
+        return sqrt(variance).reshape(-1)
+
+    def _fill(
+        self,
+        dates: DatetimeIndex,
+        series: DataFrame,
+        out: ndarray,
+        stream: Union[int, ndarray] = 0,
+    ) -> ndarray:
+        """
+        Writes the noise factors of `dates` x `series` into `out`, of shape (dates, series) or, for a column of streams,
+        (streams, dates, series). The noise is drawn into `out` directly and scaled in place, so no other array of
+        the size of `out` is allocated. A series is keyed by its feature values and a date is the counter of its
+        noise.
+        """
+        keys: ndarray = series_keys(
+            stable_hash(self._seed, self._col_name),
+            {feature: series[feature] for feature in self._features},
+        )
+        standard_normal(keys, date_counters(dates)[:, newaxis], stream, out=out)
+        out *= self._stdevs()
+        out += 1
+        return out
 
-        else:
+    def generate_realizations(
+        self,
+        start_date: Timestamp,
+        end_date: Timestamp = None,
+        n: int = 1,
+    ) -> Tuple[DataFrame, ndarray]:
+        """
+        Generates `n` realizations of the noise in one batch. Realization `i` is drawn from stream `i` of the
+        counter-based random numbers, so realization 0 equals the output of `generate`.
+        """
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        series: DataFrame = self._series()
+        values: ndarray = empty((n, len(dates), len(series)))
+        self._fill(dates, series, values, arange(n)[:, newaxis, newaxis])
+        factor_df: DataFrame = self._frame(dates, series)
+        factor_df[self._col_name] = values[0].reshape(-1)
+        return factor_df, values.reshape(n, -1)
+
+    def _frame(self, dates: DatetimeIndex, series: DataFrame) -> DataFrame:
+        dr: DataFrame = dates.to_frame(index=False, name=self._date_col_name)
+        if not self._features:
             # self._features can be none if used outside of generator
-            df: DataFrame = DataFrame(
-                self._stdev_factor * randn(len(dr)) + 1, columns=[self._col_name]
-            )
-            factor_df = dr.join(df)
+            return dr
+        return get_cartesian_product(dr, series)
+
+    def generate(self, start_date: Timestamp, end_date: Timestamp = None) -> DataFrame:
+        dates: DatetimeIndex = self.get_datetime_index(
+            start_date=start_date, end_date=end_date, freq=self._freq
+        )
+        series: DataFrame = self._series()
+
+        # preallocated output buffer, the noise is drawn into it and scaled in place
+        values: ndarray = empty((len(dates), len(series)))
+        self._fill(dates, series, values)
 
+        factor_df: DataFrame = self._frame(dates, series)
+        factor_df[self._col_name] = values.reshape(-1)
         return factor_df